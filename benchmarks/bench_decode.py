@@ -0,0 +1,80 @@
+"""
+Per-sample decode cost of the JSON and binary sdmotion wire formats.
+
+    python benchmarks/bench_decode.py --samples 20000
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+def _raw_samples(count: int) -> list:
+    samples = []
+    for i in range(count):
+        phase = i / 100.0
+        samples.append((i, 1703123456789000 + i * 1000, 0.01, -0.998, 0.09,
+                        10 * math.sin(phase), 5.0, -2.0 * math.cos(phase)))
+    return samples
+
+
+def _json_packets(samples: list) -> list:
+    packets = []
+    for seq, timestamp, ax, ay, az, pitch, yaw, roll in samples:
+        packets.append(json.dumps({
+            "timestamp": timestamp,
+            "accel": {"x": ax, "y": ay, "z": az},
+            "gyro": {"pitch": pitch, "yaw": yaw, "roll": roll},
+            "magnitude": {"accel": math.sqrt(ax * ax + ay * ay + az * az),
+                          "gyro": math.sqrt(pitch * pitch + yaw * yaw + roll * roll)},
+            "frameId": seq
+        }).encode("utf-8"))
+    return packets
+
+
+def _binary_packets(samples: list, per_packet: int) -> list:
+    return [main.encode_binary_packet(samples[i:i + per_packet]) for i in range(0, len(samples), per_packet)]
+
+
+def _time_decode(packets: list, sample_count: int) -> dict:
+    decode = main.decode_motion_packet
+    start = time.perf_counter()
+    decoded = 0
+    for packet in packets:
+        decoded += len(decode(packet))
+    elapsed = time.perf_counter() - start
+    assert decoded == sample_count
+    return {
+        "ns_per_sample": round(elapsed * 1e9 / sample_count),
+        "bytes_per_sample": round(sum(len(p) for p in packets) / sample_count, 1)
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    
+    samples = _raw_samples(args.samples)
+    results = {"json": _time_decode(_json_packets(samples), args.samples)}
+    for per_packet in (1, 8, 28):
+        results[f"binary_x{per_packet}"] = _time_decode(_binary_packets(samples, per_packet), args.samples)
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, result in results.items():
+            print(f"{name:<12} {result['ns_per_sample']:>6} ns/sample  {result['bytes_per_sample']:>6} bytes/sample")
+
+
+if __name__ == "__main__":
+    main_cli()
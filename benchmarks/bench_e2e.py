@@ -0,0 +1,258 @@
+"""
+End-to-end benchmark of MotionServicePlugin against the local sdmotion stub.
+
+Each scenario starts the stub in its own process and points the plugin at it.
+Monitoring then runs through the normal callables, with motion cues enabled so
+the full receive, decode, history and analysis path is exercised. Reported per
+scenario: sustained throughput, drop rate, per-sample latency (send to
+processing), event-loop lag, CPU time and RSS. Results can be written as JSON
+and compared against an earlier run.
+
+Event-loop lag is how late a 1 ms asyncio sleep wakes up while monitoring
+runs. It stands in for how responsive Decky's loop stays for other plugins,
+so compare `--modes thread,process` with JSON packets to see what moving
+decoding and analysis into the worker process buys.
+
+The plugin is loaded through `_main` with the receive mode saved, as Decky
+loads it, so process mode forks its worker launcher at load. Pass
+`--late-launcher` to save no mode instead and have the launcher started from
+the running plugin, as happens when process mode is picked at runtime.
+
+    python benchmarks/bench_e2e.py --rates 60,1000,2000 --output results.json
+    python benchmarks/bench_e2e.py --baseline results.json --tolerance 15
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+import sdmotion_stub  # noqa: E402
+
+# Metric -> True when higher is better; used for baseline comparison
+COMPARED_METRICS = {
+    "throughput_sps": True,
+    "drop_rate": False,
+    "latency_us_p50": False,
+    "latency_us_p99": False,
+    "loop_lag_us_p99": False,
+    "cpu_pct": False,
+    "rss_delta_kb": False
+}
+
+
+def _percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+LOOP_PROBE_INTERVAL = 0.001
+
+
+async def _probe_loop_lag(lags: list, stop: asyncio.Event):
+    """How late each short sleep wakes up, in microseconds"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(LOOP_PROBE_INTERVAL)
+        lags.append((time.perf_counter() - start - LOOP_PROBE_INTERVAL) * 1_000_000)
+
+
+def _rss_kb() -> int:
+    """Current resident set size"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+async def run_scenario(mode: str, wire: str, rate: float, seconds: float, batch: int,
+                       profile: str, replay: str = None, perf: bool = False, late_launcher: bool = False) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    port_queue, result_queue = ctx.Queue(), ctx.Queue()
+    stub = ctx.Process(target=sdmotion_stub.run_stub, daemon=True, kwargs={
+        "port_queue": port_queue, "result_queue": result_queue, "rate": rate, "seconds": seconds,
+        "batch": batch, "binary": wire == "binary", "profile": profile, "replay": replay
+    })
+    stub.start()
+    port = port_queue.get(timeout=10)
+
+    rss_start = _rss_kb()
+    plugin = main.MotionServicePlugin()
+    receive_mode, _, option = mode.partition(":")
+    plugin._save_settings({} if late_launcher else {"receive_mode": receive_mode})
+    await plugin._main()
+    launcher_at_load = plugin.worker_launcher.running
+    plugin.service_addr = ("127.0.0.1", port)
+    plugin.receive_mode = receive_mode
+    plugin.batch_drain = option == "drain"
+    plugin.prefer_binary = wire == "binary"
+    plugin.cues_enabled = True
+    plugin.perf_stats.enabled = perf
+
+    latencies = []
+    first_receive = last_receive = None
+    process_samples = plugin._process_motion_samples
+
+    def timed_process(samples, analyze=True):
+        nonlocal first_receive, last_receive
+        now = time.time()
+        now_us = now * 1_000_000
+        latencies.extend(now_us - motion_data["timestamp"] for motion_data in samples)
+        if first_receive is None:
+            first_receive = now
+        last_receive = now
+        process_samples(samples, analyze)
+
+    plugin._process_motion_samples = timed_process
+    loop_lags = []
+    probe_stop = asyncio.Event()
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    await plugin.start_motion_monitoring()
+    probe = asyncio.create_task(_probe_loop_lag(loop_lags, probe_stop))
+    while result_queue.empty() and stub.is_alive():
+        await asyncio.sleep(0.05)
+    # Let in-flight datagrams land before stopping
+    await asyncio.sleep(0.2)
+    probe_stop.set()
+    await probe
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    rss_end = _rss_kb()
+    await plugin.stop_motion_monitoring()
+    plugin.worker_launcher.stop()
+    plugin.log_pipeline.uninstall()
+
+    sent = result_queue.get(timeout=10)
+    stub.join(timeout=5)
+
+    received = len(latencies)
+    active = (last_receive - first_receive) if received > 1 else 0.0
+    result = {
+        "scenario": f"{mode}/{wire}/{int(rate)}" + ("/late" if late_launcher else ""),
+        "mode": mode,
+        "wire": wire,
+        "rate": rate,
+        "batch": batch,
+        "sent": sent["sent_samples"],
+        "received": received,
+        "throughput_sps": round((received - 1) / active, 1) if active > 0 else 0.0,
+        "drop_rate": round(1 - received / sent["sent_samples"], 4) if sent["sent_samples"] else 0.0,
+        "latency_us_p50": round(_percentile(latencies, 50), 1),
+        "latency_us_p99": round(_percentile(latencies, 99), 1),
+        "latency_us_max": round(max(latencies), 1) if latencies else 0.0,
+        "loop_lag_us_p50": round(_percentile(loop_lags, 50), 1),
+        "loop_lag_us_p99": round(_percentile(loop_lags, 99), 1),
+        "loop_lag_us_max": round(max(loop_lags), 1) if loop_lags else 0.0,
+        "cpu_s": round(cpu, 3),
+        "cpu_pct": round(100 * cpu / wall, 1),
+        "cpu_us_per_sample": round(cpu * 1_000_000 / received, 2) if received else 0.0,
+        "rss_kb": rss_end,
+        "rss_delta_kb": rss_end - rss_start,
+        "rss_peak_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "wire_format": plugin.wire_format,
+        "launcher": ("load" if launcher_at_load else "late") if receive_mode == "process" else None,
+        "mean_packets_per_batch": plugin.batch_stats.as_dict()["mean_packets"]
+    }
+    if perf:
+        result["perf"] = {**plugin.perf_stats.as_dict(), "cue_dispatch": plugin.cue_dispatcher.as_dict()}
+    return result
+
+
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    """Regressions beyond `tolerance` percent against a baseline results file"""
+    previous = {entry["scenario"]: entry for entry in baseline.get("results", [])}
+    regressions = []
+    for entry in results:
+        old = previous.get(entry["scenario"])
+        if not old:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            before, after = old.get(metric), entry.get(metric)
+            if before is None or after is None:
+                continue
+            if metric == "drop_rate":
+                # Absolute: a rise from 0 to 0.1% is not a regression worth failing on
+                worse = after - before > 0.01
+                change = (after - before) * 100
+            else:
+                if not before:
+                    continue
+                change = 100 * (after - before) / abs(before)
+                worse = (-change if higher_is_better else change) > tolerance
+            entry.setdefault("vs_baseline", {})[metric] = round(change, 1)
+            if worse:
+                regressions.append(f"{entry['scenario']} {metric}: {before} -> {after} ({change:+.1f}%)")
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rates", default="60,250,1000,2000", help="comma-separated sample rates (Hz)")
+    parser.add_argument("--modes", default="thread,asyncio",
+                        help="receive modes (thread, asyncio, process); append :drain for batched draining")
+    parser.add_argument("--wire", default="binary,json", help="wire formats to request")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--batch", type=int, default=1, help="samples per binary datagram")
+    parser.add_argument("--profile", choices=sdmotion_stub.PROFILES, default="gameplay")
+    parser.add_argument("--replay", help="JSON-lines recording to replay instead of synthetic data")
+    parser.add_argument("--perf", action="store_true", help="include per-stage timings")
+    parser.add_argument("--late-launcher", action="store_true",
+                        help="start process mode's worker launcher from the running plugin rather than at load")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against a previous --output file")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="allowed regression in percent")
+    args = parser.parse_args()
+
+    results = []
+    for rate in (float(r) for r in args.rates.split(",")):
+        for mode in args.modes.split(","):
+            for wire in args.wire.split(","):
+                result = asyncio.run(run_scenario(mode, wire, rate, args.seconds, args.batch,
+                                                  args.profile, args.replay, args.perf, args.late_launcher))
+                results.append(result)
+                summary = {key: value for key, value in result.items() if key != "perf"}
+                print("  ".join(f"{key}={value}" for key, value in summary.items()), file=sys.stderr)
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "args": vars(args)
+        },
+        "results": results
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main_cli()
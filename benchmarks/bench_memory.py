@@ -0,0 +1,100 @@
+"""
+Memory per retained motion sample, and the cost of publishing snapshots.
+
+Compares a decoded sample dict (what `latest_motion_data` and any list of
+samples used to hold) with a MotionSample record and a MotionHistory slot,
+measured with tracemalloc over many samples. Also times building and
+swapping a MotionSnapshot per receive batch.
+
+    python benchmarks/bench_memory.py --samples 100000
+"""
+
+import argparse
+import gc
+import json
+import math
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+def _packets(count: int) -> list:
+    samples = []
+    for i in range(count):
+        phase = i / 100.0
+        samples.append((i, 1703123456789000 + i * 1000, 0.01 * math.cos(phase), -0.998, 0.09,
+                        10 * math.sin(phase), 5.0 + phase % 1, -2.0 * math.cos(phase)))
+    return [main.encode_binary_packet(samples[i:i + 8]) for i in range(0, count, 8)]
+
+
+def _bytes_per_sample(build, count: int) -> float:
+    """Allocated bytes per sample for whatever build() keeps alive"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return round((after - before) / count, 1)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=100000)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    packets = _packets(args.samples)
+    count = sum(len(main.decode_motion_packet(packet)) for packet in packets)
+
+    def decoded_dicts():
+        return [sample for packet in packets for sample in main.decode_motion_packet(packet)]
+
+    def sample_records():
+        return [main.MotionSample.from_dict(sample) for packet in packets for sample in main.decode_motion_packet(packet)]
+
+    def history_slots():
+        history = main.MotionHistory(count)
+        for packet in packets:
+            for sample in main.decode_motion_packet(packet):
+                record = main.MotionSample.from_dict(sample)
+                history.append(record.timestamp, record.accel_x, record.accel_y, record.accel_z,
+                               record.gyro_pitch, record.gyro_yaw, record.gyro_roll, record.accel, record.gyro)
+        return history
+
+    results = {
+        "dict_bytes_per_sample": _bytes_per_sample(decoded_dicts, count),
+        "record_bytes_per_sample": _bytes_per_sample(sample_records, count),
+        "history_bytes_per_sample": _bytes_per_sample(history_slots, count)
+    }
+
+    # One snapshot swap per receive batch, as _process_motion_samples does
+    lock = threading.Lock()
+    snapshot = main.EMPTY_SNAPSHOT
+    batches = [main.decode_motion_packet(packet) for packet in packets]
+    start = time.perf_counter()
+    for samples in batches:
+        latest = main.MotionSample.from_dict(samples[-1])
+        with lock:
+            snapshot = main.MotionSnapshot(snapshot.sample_seq + len(samples), latest,
+                                           snapshot.alert_seq, snapshot.alerts,
+                                           snapshot.window, snapshot.sway, snapshot.orientation)
+    results["publish_ns_per_batch"] = round((time.perf_counter() - start) * 1e9 / len(batches))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, value in results.items():
+            print(f"{name:<26} {value:>8}")
+
+
+if __name__ == "__main__":
+    main_cli()
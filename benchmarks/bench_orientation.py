@@ -0,0 +1,147 @@
+"""
+CPU cost and accuracy of the orientation (Madgwick) filter stage.
+
+Synthesizes gyro and accelerometer readings for rotations with known angles:
+a static tilt, a 60 degree roll, a 45 degree pitch, a 90 degree turn about
+gravity and a slow sway while driving. Each is fed through OrientationFilter
+at several sensor rates, with gyro noise and bias. Reports CPU time per sample and the angle between
+the estimated and true orientation. Exits non-zero if an error exceeds
+--tolerance degrees.
+
+    python benchmarks/bench_orientation.py --rates 250,1000
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+def _multiply(a, b):
+    a0, a1, a2, a3 = a
+    b0, b1, b2, b3 = b
+    return (a0 * b0 - a1 * b1 - a2 * b2 - a3 * b3,
+            a0 * b1 + a1 * b0 + a2 * b3 - a3 * b2,
+            a0 * b2 - a1 * b3 + a2 * b0 + a3 * b1,
+            a0 * b3 + a1 * b2 - a2 * b1 + a3 * b0)
+
+
+def _axis_angle(axis, degrees):
+    half = math.radians(degrees) / 2
+    x, y, z = axis
+    return (math.cos(half), x * math.sin(half), y * math.sin(half), z * math.sin(half))
+
+
+def _up_in_sensor(q):
+    """Earth "up" in sensor axes, which is what the accelerometer reads at rest"""
+    q0, q1, q2, q3 = q
+    return (2 * (q1 * q3 - q0 * q2), 2 * (q0 * q1 + q2 * q3), q0 * q0 - q1 * q1 - q2 * q2 + q3 * q3)
+
+
+def _angle_between(a, b) -> float:
+    dot = abs(sum(x * y for x, y in zip(a, b)))
+    return math.degrees(2 * math.acos(min(1.0, dot)))
+
+
+# name -> (initial orientation, [(axis, deg/s, seconds)], noise)
+SCENARIOS = {
+    "static_tilt": (_axis_angle((1, 0, 0), 25), [((1, 0, 0), 0.0, 5.0)]),
+    "roll_60": (_axis_angle((1, 0, 0), 0), [((1, 0, 0), 30.0, 2.0), ((1, 0, 0), 0.0, 2.0)]),
+    "pitch_45": (_axis_angle((0, 1, 0), 0), [((0, 1, 0), -45.0, 1.0), ((0, 1, 0), 0.0, 2.0)]),
+    "turn_90": (_axis_angle((1, 0, 0), 10), [((0, 0, 1), 45.0, 2.0), ((0, 0, 1), 0.0, 1.0)]),
+    "sway": (_axis_angle((1, 0, 0), 0), None),
+}
+
+
+def _samples(scenario: str, rate: float, gyro_noise: float, accel_noise: float, gyro_bias: float):
+    """(timestamp, gyro x/y/z deg/s, accel x/y/z g) samples plus the true final orientation"""
+    rng = random.Random(1)
+    q, segments = SCENARIOS[scenario]
+    if segments is None:
+        # 0.25 Hz roll sway of +-8 degrees for 20 s
+        segments = []
+        for k in range(int(20 * rate)):
+            t = k / rate
+            segments.append(((1, 0, 0), 8 * 2 * math.pi * 0.25 * math.cos(2 * math.pi * 0.25 * t), 1 / rate))
+    dt = 1 / rate
+    timestamp = 1703123456789000
+    samples = []
+    for axis, speed, seconds in segments:
+        for _ in range(max(1, round(seconds * rate))):
+            # Body rates are constant about a sensor axis, so the true orientation is exact
+            q = _multiply(q, _axis_angle(axis, speed * dt))
+            ux, uy, uz = _up_in_sensor(q)
+            gx, gy, gz = (speed * c for c in axis)
+            timestamp += int(dt * 1_000_000)
+            samples.append((
+                timestamp,
+                gx + gyro_bias + rng.gauss(0, gyro_noise), gy + gyro_bias + rng.gauss(0, gyro_noise),
+                gz + gyro_bias + rng.gauss(0, gyro_noise),
+                ux + rng.gauss(0, accel_noise), uy + rng.gauss(0, accel_noise), uz + rng.gauss(0, accel_noise)
+            ))
+    return samples, q
+
+
+def _run(scenario: str, rate: float, gyro_noise: float, accel_noise: float, gyro_bias: float) -> dict:
+    samples, truth = _samples(scenario, rate, gyro_noise, accel_noise, gyro_bias)
+    orientation = main.OrientationFilter()
+    # The filter starts from the first sample's gravity, as it does on the Deck
+    first = samples[0]
+    orientation.update(first[0] - int(1_000_000 / rate), *first[1:])
+    update = orientation.update
+    start = time.process_time()
+    for sample in samples:
+        update(*sample)
+    cpu = time.process_time() - start
+    
+    estimate = (orientation.q0, orientation.q1, orientation.q2, orientation.q3)
+    true_up = _up_in_sensor(truth)
+    estimated_up = orientation.gravity()
+    tilt_error = math.degrees(math.acos(max(-1.0, min(1.0, sum(a * b for a, b in zip(true_up, estimated_up))))))
+    return {
+        "scenario": scenario,
+        "rate": rate,
+        "samples": len(samples),
+        "cpu_us_per_sample": round(cpu * 1_000_000 / len(samples), 2),
+        "orientation_error_deg": round(_angle_between(estimate, truth), 2),
+        "tilt_error_deg": round(tilt_error, 2)
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rates", default="250,1000", help="comma-separated sensor rates (Hz)")
+    parser.add_argument("--gyro-noise", type=float, default=0.3, help="gyro noise (deg/s, 1 sigma)")
+    parser.add_argument("--gyro-bias", type=float, default=0.5, help="gyro bias on every axis (deg/s)")
+    parser.add_argument("--accel-noise", type=float, default=0.01, help="accel noise (g, 1 sigma)")
+    parser.add_argument("--tolerance", type=float, default=3.0, help="largest acceptable tilt error (degrees)")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    
+    results = [
+        _run(scenario, float(rate), args.gyro_noise, args.accel_noise, args.gyro_bias)
+        for rate in args.rates.split(",") for scenario in SCENARIOS
+    ]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print("  ".join(f"{key}={value}" for key, value in result.items()))
+    
+    # Yaw about gravity is gyro-only, so only the tilt is held to the tolerance
+    failed = [result for result in results if result["tilt_error_deg"] > args.tolerance]
+    for result in failed:
+        print(f"FAIL {result['scenario']} at {result['rate']} Hz: tilt error {result['tilt_error_deg']} deg", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,148 @@
+"""
+Compare the thread and asyncio motion receivers, with and without batch draining.
+
+A sender process plays the part of sdmotion: it waits for "register" and then
+streams JSON samples stamped with the send time. For each receive mode this
+reports per-sample latency, process CPU time and event-loop lag while the
+receiver is running.
+
+    python benchmarks/bench_receive.py --rate 1000 --seconds 5
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+def _sender(port_queue, rate: float, seconds: float, burst: int = 1):
+    """Stream synthetic samples to whoever registers, like sdmotion does"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    port_queue.put(sock.getsockname()[1])
+    _, client = sock.recvfrom(64)
+    
+    interval = 1.0 / rate
+    deadline = time.perf_counter() + seconds
+    next_send = time.perf_counter()
+    frame = 0
+    while next_send < deadline:
+        phase = frame / rate
+        sample = {
+            "timestamp": int(time.time() * 1_000_000),
+            "accel": {"x": 0.01, "y": -0.998, "z": 0.09},
+            "gyro": {"pitch": 10 * math.sin(phase), "yaw": 5.0, "roll": 0.0},
+            "magnitude": {"accel": 1.003, "gyro": abs(10 * math.sin(phase)) + 5.0},
+            "frameId": frame
+        }
+        sock.sendto(json.dumps(sample).encode("utf-8"), client)
+        frame += 1
+        next_send += interval
+        # With burst > 1, samples are held back and sent back to back like after a stall
+        if frame % burst:
+            continue
+        delay = next_send - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    sock.close()
+
+
+def _percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def _run_mode(mode: str, rate: float, seconds: float, burst: int) -> dict:
+    port_queue = multiprocessing.Queue()
+    sender = multiprocessing.Process(target=_sender, args=(port_queue, rate, seconds, burst), daemon=True)
+    sender.start()
+    port = port_queue.get(timeout=5)
+    
+    plugin = main.MotionServicePlugin()
+    plugin.service_addr = ("127.0.0.1", port)
+    plugin.receive_mode, _, option = mode.partition(":")
+    plugin.batch_drain = option == "drain"
+    
+    latencies = []
+    process_samples = plugin._process_motion_samples
+    
+    def timed_process(samples, analyze=True):
+        now = time.time() * 1_000_000
+        latencies.extend(now - motion_data["timestamp"] for motion_data in samples)
+        process_samples(samples, analyze)
+    
+    plugin._process_motion_samples = timed_process
+    
+    # Event loop lag: how late a 10 ms sleep wakes up while the receiver runs
+    loop_lag = []
+    
+    async def ticker():
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            loop_lag.append((time.perf_counter() - start - 0.01) * 1_000_000)
+    
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    tick_task = asyncio.create_task(ticker())
+    await plugin.start_motion_monitoring()
+    while sender.is_alive():
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(0.1)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    tick_task.cancel()
+    
+    stop_start = time.perf_counter()
+    await plugin.stop_motion_monitoring()
+    stop_ms = (time.perf_counter() - stop_start) * 1000
+    sender.join()
+    
+    expected = int(rate * seconds)
+    return {
+        "mode": mode,
+        "received": len(latencies),
+        "expected": expected,
+        "latency_us_p50": round(_percentile(latencies, 50), 1),
+        "latency_us_p99": round(_percentile(latencies, 99), 1),
+        "cpu_s": round(cpu, 3),
+        "cpu_pct": round(100 * cpu / wall, 1),
+        "loop_lag_us_p50": round(_percentile(loop_lag, 50), 1),
+        "loop_lag_us_p99": round(_percentile(loop_lag, 99), 1),
+        "stop_ms": round(stop_ms, 1),
+        "mean_packets_per_batch": plugin.batch_stats.as_dict()["mean_packets"]
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rate", type=float, default=1000.0, help="samples per second")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--modes", default="thread,asyncio,thread:drain,asyncio:drain",
+                        help="receive modes; append :drain for batched draining")
+    parser.add_argument("--burst", type=int, default=1, help="send samples in bursts of this size")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    
+    results = [asyncio.run(_run_mode(mode, args.rate, args.seconds, args.burst)) for mode in args.modes.split(",")]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print("  ".join(f"{key}={value}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main_cli()
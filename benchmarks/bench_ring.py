@@ -0,0 +1,175 @@
+"""
+Multi-reader throughput of the shared-memory motion ring.
+
+A writer in this process publishes synthetic samples through RingWriter, the
+way the plugin does per receive batch, while 1..N reader processes poll the
+ring with RingReader. Reported per scenario: writer cost per sample, and for
+each reader the records read, records lost to overruns and the publish-to-read
+latency. `--rate 0` publishes as fast as possible to find the ceiling.
+
+    python benchmarks/bench_ring.py --readers 1,4,8 --rate 1000 --seconds 5
+    python benchmarks/bench_ring.py --readers 1,8 --rate 0 --batch 16 --output ring.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "py_modules"))
+
+import sdmotion_stub  # noqa: E402
+from motion_ring import RingReader, RingWriter  # noqa: E402
+
+
+def _percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run_reader(path: str, poll_interval: float, ready, result_queue):
+    """Reader process: poll until the writer closes the ring, then report"""
+    reader = RingReader(path)
+    ready.set()
+    received = 0
+    polls = 0
+    empty_polls = 0
+    latencies = []
+    last_seq = -1
+    out_of_order = 0
+    cpu_start = time.process_time()
+    while True:
+        records = reader.read()
+        polls += 1
+        if records:
+            now_us = time.time() * 1_000_000
+            received += len(records)
+            # Every record's latency is costly to keep at full rate; sample one per poll
+            latencies.append(now_us - records[-1].timestamp)
+            for record in records:
+                if record.seq <= last_seq:
+                    out_of_order += 1
+                last_seq = record.seq
+        else:
+            empty_polls += 1
+            if not reader.live:
+                break
+            time.sleep(poll_interval)
+    result_queue.put({
+        "received": received,
+        "lost": reader.lost,
+        "out_of_order": out_of_order,
+        "polls": polls,
+        "empty_polls": empty_polls,
+        "cpu_s": round(time.process_time() - cpu_start, 3),
+        "latency_us_p50": round(_percentile(latencies, 50), 1),
+        "latency_us_p99": round(_percentile(latencies, 99), 1)
+    })
+    reader.close()
+
+
+def run_scenario(readers: int, rate: float, seconds: float, batch: int, capacity: int,
+                 poll_ms: float, directory: str) -> dict:
+    path = os.path.join(directory, f"bench-{readers}.ring")
+    writer = RingWriter(path, capacity)
+    writer.open()
+
+    ctx = multiprocessing.get_context("spawn")
+    result_queue = ctx.Queue()
+    processes = []
+    for _ in range(readers):
+        ready = ctx.Event()
+        process = ctx.Process(target=run_reader, args=(path, poll_ms / 1000, ready, result_queue), daemon=True)
+        process.start()
+        processes.append((process, ready))
+    for _, ready in processes:
+        ready.wait(10)
+
+    stream = sdmotion_stub.synthetic_stream("gameplay", rate or 1000.0)
+    interval = batch / rate if rate else 0.0
+    published = 0
+    write_ns = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    next_batch = start
+    while True:
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+        if interval:
+            if now < next_batch:
+                time.sleep(next_batch - now)
+            next_batch += interval
+        timestamp = int(time.time() * 1_000_000)
+        samples = []
+        for _ in range(batch):
+            ax, ay, az, pitch, yaw, roll = next(stream)
+            samples.append({
+                "timestamp": timestamp, "frameId": published + len(samples),
+                "accel": {"x": ax, "y": ay, "z": az}, "gyro": {"pitch": pitch, "yaw": yaw, "roll": roll}
+            })
+        write_start = time.perf_counter_ns()
+        writer.write_samples(samples)
+        write_ns += time.perf_counter_ns() - write_start
+        published += batch
+    elapsed = time.perf_counter() - start
+    writer.close()
+
+    results = [result_queue.get(timeout=30) for _ in processes]
+    for process, _ in processes:
+        process.join(timeout=5)
+    os.unlink(path)
+
+    return {
+        "scenario": f"readers={readers}/rate={int(rate)}/batch={batch}",
+        "readers": readers,
+        "rate": rate,
+        "batch": batch,
+        "capacity": capacity,
+        "published": published,
+        "publish_sps": round(published / elapsed, 1),
+        "write_us_per_sample": round(write_ns / 1000 / published, 3) if published else 0.0,
+        "min_received": min(result["received"] for result in results),
+        "total_lost": sum(result["lost"] for result in results),
+        "total_out_of_order": sum(result["out_of_order"] for result in results),
+        "reader_latency_us_p99": max(result["latency_us_p99"] for result in results),
+        "per_reader": results
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--readers", default="1,2,4,8", help="comma-separated reader process counts")
+    parser.add_argument("--rate", type=float, default=1000.0, help="samples per second; 0 for as fast as possible")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--batch", type=int, default=1, help="samples per write, like a receive batch")
+    parser.add_argument("--capacity", type=int, default=16384, help="ring slots (power of two)")
+    parser.add_argument("--poll-ms", type=float, default=1.0, help="reader sleep when the ring is empty")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="motion-ring-") as directory:
+        for readers in (int(count) for count in args.readers.split(",")):
+            result = run_scenario(readers, args.rate, args.seconds, max(1, args.batch), args.capacity,
+                                  args.poll_ms, directory)
+            results.append(result)
+            summary = {key: value for key, value in result.items() if key != "per_reader"}
+            print("  ".join(f"{key}={value}" for key, value in summary.items()), file=sys.stderr)
+
+    report = {"meta": {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "args": vars(args)}, "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main_cli()
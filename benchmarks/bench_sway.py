@@ -0,0 +1,70 @@
+"""
+CPU cost and accuracy of the sway (0.1-0.5 Hz band power) analysis stage.
+
+Feeds synthetic gyro data with a known slow sway through SwayAnalyzer at
+several sensor rates. Reports CPU time per second of input and the
+recovered band RMS and frequency.
+
+    python benchmarks/bench_sway.py --seconds 60
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+def _run(rate: float, seconds: float, sway_hz: float, amplitude: float) -> dict:
+    random.seed(1)
+    count = int(rate * seconds)
+    interval_us = 1_000_000 / rate
+    # Sway on yaw, plus 4 Hz hand tremor and sensor noise outside the band
+    samples = []
+    for i in range(count):
+        t = i / rate
+        yaw = amplitude * math.sin(2 * math.pi * sway_hz * t) + 3 * math.sin(2 * math.pi * 4 * t) + random.gauss(0, 0.5)
+        samples.append((int(1703123456789000 + i * interval_us), random.gauss(0, 0.5), yaw, random.gauss(0, 0.5)))
+    
+    analyzer = main.SwayAnalyzer()
+    add = analyzer.add
+    start = time.process_time()
+    for timestamp, pitch, yaw, roll in samples:
+        add(timestamp, pitch, yaw, roll)
+    cpu = time.process_time() - start
+    
+    return {
+        "rate_hz": rate,
+        "cpu_ms_per_input_second": round(cpu * 1000 / seconds, 3),
+        "cpu_pct": round(100 * cpu / seconds, 3),
+        "band_rms": round(analyzer.band_rms, 3),
+        "expected_band_rms": round(amplitude / math.sqrt(2), 3),
+        "peak_frequency": analyzer.peak_frequency
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--sway-hz", type=float, default=0.25)
+    parser.add_argument("--amplitude", type=float, default=8.0, help="sway amplitude in deg/s")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    
+    results = [_run(rate, args.seconds, args.sway_hz, args.amplitude) for rate in (60, 250, 1000, 2000)]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print("  ".join(f"{key}={value}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main_cli()
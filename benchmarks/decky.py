@@ -0,0 +1,71 @@
+"""
+Stand-in for Decky's `decky` module so the backend can run without a Steam Deck.
+
+Mirrors the names declared in `decky.pyi` and, like the loader, makes the
+plugin's py_modules/ importable. Directories default to a temporary
+tree and can be overridden with the same environment variables Decky sets.
+"""
+
+import logging
+import os
+import sys
+import tempfile
+
+from typing import Any
+
+__version__ = '1.0.0'
+
+_root = tempfile.mkdtemp(prefix="decky-bench-")
+
+HOME: str = os.environ.get("HOME", _root)
+USER: str = os.environ.get("USER", "deck")
+DECKY_VERSION: str = os.environ.get("DECKY_VERSION", "bench")
+DECKY_USER: str = os.environ.get("DECKY_USER", USER)
+DECKY_USER_HOME: str = os.environ.get("DECKY_USER_HOME", HOME)
+DECKY_HOME: str = os.environ.get("DECKY_HOME", os.path.join(_root, "homebrew"))
+DECKY_PLUGIN_SETTINGS_DIR: str = os.environ.get("DECKY_PLUGIN_SETTINGS_DIR", os.path.join(DECKY_HOME, "settings"))
+DECKY_PLUGIN_RUNTIME_DIR: str = os.environ.get("DECKY_PLUGIN_RUNTIME_DIR", os.path.join(DECKY_HOME, "data"))
+DECKY_PLUGIN_LOG_DIR: str = os.environ.get("DECKY_PLUGIN_LOG_DIR", os.path.join(DECKY_HOME, "logs"))
+DECKY_PLUGIN_DIR: str = os.environ.get("DECKY_PLUGIN_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DECKY_PLUGIN_NAME: str = os.environ.get("DECKY_PLUGIN_NAME", "Motion Service")
+DECKY_PLUGIN_VERSION: str = os.environ.get("DECKY_PLUGIN_VERSION", "bench")
+DECKY_PLUGIN_AUTHOR: str = os.environ.get("DECKY_PLUGIN_AUTHOR", "itsOwen")
+DECKY_PLUGIN_LOG: str = os.environ.get("DECKY_PLUGIN_LOG", os.path.join(DECKY_PLUGIN_LOG_DIR, "plugin.log"))
+
+# Decky puts the plugin's py_modules/ on the import path before loading main.py
+_py_modules = os.path.join(DECKY_PLUGIN_DIR, "py_modules")
+if _py_modules not in sys.path:
+    sys.path.append(_py_modules)
+
+for _dir in (DECKY_PLUGIN_SETTINGS_DIR, DECKY_PLUGIN_RUNTIME_DIR, DECKY_PLUGIN_LOG_DIR):
+    os.makedirs(_dir, exist_ok=True)
+
+logger: logging.Logger = logging.getLogger("decky-bench")
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    logger.addHandler(_handler)
+logger.setLevel(os.environ.get("DECKY_BENCH_LOG_LEVEL", "WARNING"))
+
+# Every emitted event as (event, args); benchmarks inspect or clear this
+emitted: list = []
+
+
+def migrate_any(target_dir: str, *files_or_directories: str) -> dict[str, str]:
+    return {}
+
+
+def migrate_settings(*files_or_directories: str) -> dict[str, str]:
+    return {}
+
+
+def migrate_runtime(*files_or_directories: str) -> dict[str, str]:
+    return {}
+
+
+def migrate_logs(*files_or_directories: str) -> dict[str, str]:
+    return {}
+
+
+async def emit(event: str, *args: Any) -> None:
+    emitted.append((event, args))
@@ -0,0 +1,211 @@
+"""
+Local stand-in for the sdmotion UDP service.
+
+Listens like sdmotion (127.0.0.1:27760 by default) and answers "register" with
+JSON datagrams and "register bin1" with binary datagrams. It streams to every
+registered client at a fixed rate. Samples are synthetic, or are replayed from
+a recording of sdmotion JSON packets (one per line). Each sample's timestamp
+is restamped with the send time, so the receiver can measure latency.
+
+    python benchmarks/sdmotion_stub.py --rate 1000
+    python benchmarks/sdmotion_stub.py --replay capture.jsonl --rate 250 --port 0
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import (  # noqa: E402
+    BINARY_SAMPLE, BINARY_HEADER, RECEIVE_BUFFER_SIZE, REGISTER_BINARY, REGISTER_JSON, encode_binary_packet
+)
+
+# Most samples that fit in one binary datagram
+MAX_BINARY_BATCH = (RECEIVE_BUFFER_SIZE - BINARY_HEADER.size) // BINARY_SAMPLE.size
+
+PROFILES = ("idle", "gameplay", "vehicle")
+
+
+def synthetic_stream(profile: str = "gameplay", rate: float = 1000.0, seed: int = 1):
+    """Endless (ax, ay, az, pitch, yaw, roll) tuples for a motion profile
+
+    idle: the Deck resting on a table, sensor noise only
+    gameplay: handheld play with bursts of fast turns
+    vehicle: slow 0.25 Hz sway plus road vibration
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile {profile!r}; expected one of {PROFILES}")
+    rng = random.Random(seed)
+    gauss = rng.gauss
+    frame = 0
+    while True:
+        t = frame / rate
+        ax, ay, az = gauss(0, 0.005), -1.0 + gauss(0, 0.005), gauss(0, 0.005)
+        pitch, yaw, roll = gauss(0, 0.3), gauss(0, 0.3), gauss(0, 0.3)
+        if profile == "gameplay":
+            turn = 60 * math.sin(2 * math.pi * 0.5 * t) if (t % 6) < 2 else 0.0
+            pitch += 8 * math.sin(2 * math.pi * 1.3 * t)
+            yaw += turn
+            ax += 0.1 * math.sin(2 * math.pi * 2.0 * t)
+        elif profile == "vehicle":
+            sway = math.sin(2 * math.pi * 0.25 * t)
+            pitch += 6 * sway
+            roll += 4 * math.cos(2 * math.pi * 0.25 * t)
+            ay += 0.05 * gauss(0, 1)
+            az += 0.15 * sway
+        yield ax, ay, az, pitch, yaw, roll
+        frame += 1
+
+
+def replay_stream(path: str):
+    """Endless (ax, ay, az, pitch, yaw, roll) tuples from a JSON-lines recording, looped"""
+    records = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            accel, gyro = data.get("accel", {}), data.get("gyro", {})
+            records.append((accel.get("x", 0.0), accel.get("y", 0.0), accel.get("z", 0.0),
+                            gyro.get("pitch", 0.0), gyro.get("yaw", 0.0), gyro.get("roll", 0.0)))
+    if not records:
+        raise ValueError(f"No samples in {path}")
+    while True:
+        yield from records
+
+
+def _json_packet(seq: int, timestamp: int, ax, ay, az, pitch, yaw, roll) -> bytes:
+    return json.dumps({
+        "timestamp": timestamp,
+        "accel": {"x": ax, "y": ay, "z": az},
+        "gyro": {"pitch": pitch, "yaw": yaw, "roll": roll},
+        "magnitude": {"accel": math.sqrt(ax * ax + ay * ay + az * az),
+                      "gyro": math.sqrt(pitch * pitch + yaw * yaw + roll * roll)},
+        "frameId": seq
+    }).encode("utf-8")
+
+
+def serve(sock: socket.socket, stream, rate: float, seconds: float, batch: int = 1,
+          binary: bool = True, wait_for_client: float = 10.0) -> dict:
+    """Answer registrations and stream samples until `seconds` after the first client
+
+    Binary clients get up to `batch` samples per datagram. JSON clients get one
+    sample per datagram, as sdmotion sends them. Returns counts of what was sent.
+    """
+    batch = max(1, min(batch, MAX_BINARY_BATCH))
+    clients = {}  # addr -> binary?
+    sock.setblocking(False)
+
+    def poll_registrations():
+        while True:
+            try:
+                message, addr = sock.recvfrom(64)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                # ICMP errors from clients that went away
+                continue
+            message = message.strip()
+            if message == REGISTER_BINARY:
+                clients[addr] = binary
+            elif message == REGISTER_JSON:
+                clients[addr] = False
+
+    give_up = time.perf_counter() + wait_for_client
+    while not clients:
+        poll_registrations()
+        if time.perf_counter() > give_up:
+            return {"sent_samples": 0, "sent_packets": 0, "send_errors": 0, "clients": 0, "seconds": 0.0}
+        time.sleep(0.001)
+
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    deadline = start + seconds
+    next_send = start
+    seq = 0
+    sent_packets = 0
+    send_errors = 0
+    while next_send < deadline:
+        poll_registrations()
+        pending = []
+        # Catch up on every sample that is due, packing them into batches
+        now = time.perf_counter()
+        while next_send <= now and next_send < deadline and len(pending) < batch:
+            pending.append((seq, int(time.time() * 1_000_000)) + next(stream))
+            seq += 1
+            next_send += interval
+        if pending:
+            binary_packet = None
+            for addr, wants_binary in list(clients.items()):
+                if wants_binary:
+                    binary_packet = binary_packet or encode_binary_packet(pending)
+                    packets = (binary_packet,)
+                else:
+                    packets = [_json_packet(*sample) for sample in pending]
+                for packet in packets:
+                    try:
+                        sock.sendto(packet, addr)
+                        sent_packets += 1
+                    except OSError:
+                        send_errors += 1
+        delay = next_send - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    return {
+        "sent_samples": seq,
+        "sent_packets": sent_packets,
+        "send_errors": send_errors,
+        "clients": len(clients),
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+
+
+def run_stub(port_queue, result_queue, host: str = "127.0.0.1", port: int = 0, rate: float = 1000.0,
+             seconds: float = 5.0, batch: int = 1, binary: bool = True, profile: str = "gameplay",
+             replay: str = None):
+    """Process entry point: report the bound port, serve, then report what was sent"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((host, port))
+    port_queue.put(sock.getsockname()[1])
+    stream = replay_stream(replay) if replay else synthetic_stream(profile, rate)
+    try:
+        result_queue.put(serve(sock, stream, rate, seconds, batch, binary))
+    finally:
+        sock.close()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=27760, help="0 picks a free port")
+    parser.add_argument("--rate", type=float, default=1000.0, help="samples per second (60 to 2000)")
+    parser.add_argument("--seconds", type=float, default=60.0, help="how long to stream after the first client")
+    parser.add_argument("--batch", type=int, default=1, help="samples per binary datagram")
+    parser.add_argument("--json-only", action="store_true", help="ignore binary registration, like older sdmotion")
+    parser.add_argument("--profile", choices=PROFILES, default="gameplay")
+    parser.add_argument("--replay", help="JSON-lines recording to loop instead of synthetic data")
+    args = parser.parse_args()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((args.host, args.port))
+    print(f"sdmotion stub on {sock.getsockname()[0]}:{sock.getsockname()[1]}", flush=True)
+    stream = replay_stream(args.replay) if args.replay else synthetic_stream(args.profile, args.rate)
+    try:
+        result = serve(sock, stream, args.rate, args.seconds, args.batch, not args.json_only, wait_for_client=3600)
+    except KeyboardInterrupt:
+        return
+    finally:
+        sock.close()
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main_cli()
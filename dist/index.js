@@ -22,6 +22,8 @@ if (api._version != API_VERSION) {
     console.warn(`[@decky/api] Requested API version ${API_VERSION} but the running loader only supports version ${api._version}. Some features may not work.`);
 }
 const callable = api.callable;
+const addEventListener = api.addEventListener;
+const removeEventListener = api.removeEventListener;
 const definePlugin = (fn) => {
     return (...args) => {
         // TODO: Maybe wrap this
@@ -92,39 +94,221 @@ function GiSoundWaves (props) {
 }
 
 // Define callables
-const checkServiceStatus$3 = callable("check_service_status");
+const subscribeMotionUpdates = callable("subscribe_motion_updates");
+const unsubscribeMotionUpdates = callable("unsubscribe_motion_updates");
+const renewSubscription$1 = callable("renew_subscription");
+const logError$4 = callable("log_error");
+const MAX_ALERTS = 5;
+// The backend drops subscriptions not renewed within 30s
+const RENEW_INTERVAL_MS$1 = 10000;
+/**
+  * Subscribe to backend motion updates at the given rate while enabled.
+  * Replaces interval polling of get_motion_data: the backend only emits when something changed.
+  * Updates are broadcast at the fastest subscriber's rate, so this hook renders at most rateHz
+  * times a second, keeping every alert that arrived in between.
+  */
+function useMotionUpdates(rateHz, enabled = true) {
+    const [state, setState] = SP_REACT.useState(null);
+    SP_REACT.useEffect(() => {
+        if (!enabled) {
+            return () => { };
+        }
+        let cancelled = false;
+        let subscriptionId = null;
+        let current = null;
+        let lastRender = 0;
+        let renderTimer = null;
+        const minInterval = 1000 / rateHz;
+        const render = () => {
+            renderTimer = null;
+            lastRender = Date.now();
+            setState(current);
+        };
+        const listener = addEventListener("motion_update", (update) => {
+            current = {
+                latest_data: update.latest_data,
+                monitoring: update.monitoring,
+                history_count: update.history_count,
+                orientation: update.orientation,
+                alerts: update.alerts_reset
+                    ? update.alerts
+                    : [...(current?.alerts ?? []), ...update.alerts].slice(-MAX_ALERTS)
+            };
+            if (renderTimer === null) {
+                const wait = lastRender + minInterval - Date.now();
+                if (wait <= 0) {
+                    render();
+                }
+                else {
+                    renderTimer = setTimeout(render, wait);
+                }
+            }
+        });
+        const subscribe = () => {
+            subscribeMotionUpdates(rateHz)
+                .then((response) => {
+                    if (response.subscription_id === undefined) {
+                        return;
+                    }
+                    if (cancelled) {
+                        unsubscribeMotionUpdates(response.subscription_id);
+                    }
+                    else {
+                        subscriptionId = response.subscription_id;
+                    }
+                })
+                .catch((error) => logError$4(`Motion update subscription error: ${String(error)}`));
+        };
+        // Keep the lease alive; subscribe again if it lapsed (e.g. the backend restarted)
+        const renewal = setInterval(() => {
+            if (subscriptionId === null) {
+                return;
+            }
+            renewSubscription$1(subscriptionId)
+                .then((response) => {
+                    if (response.renewed === false && !cancelled) {
+                        subscriptionId = null;
+                        subscribe();
+                    }
+                })
+                .catch((error) => logError$4(`Motion update renewal error: ${String(error)}`));
+        }, RENEW_INTERVAL_MS$1);
+        subscribe();
+        return () => {
+            cancelled = true;
+            clearInterval(renewal);
+            if (renderTimer !== null) {
+                clearTimeout(renderTimer);
+            }
+            removeEventListener("motion_update", listener);
+            if (subscriptionId !== null) {
+                unsubscribeMotionUpdates(subscriptionId);
+            }
+        };
+    }, [rateHz, enabled]);
+    return state;
+}
+
+// Define callables
+const subscribeServiceStatus = callable("subscribe_service_status");
+const unsubscribeServiceStatus = callable("unsubscribe_service_status");
+const renewSubscription = callable("renew_subscription");
+const logError$3 = callable("log_error");
+// The backend drops subscriptions not renewed within 30s
+const RENEW_INTERVAL_MS = 10000;
+/**
+  * Current service status, pushed by the backend whenever it changes.
+  * Replaces interval polling of check_service_status.
+  */
+function useServiceStatus() {
+    const [serviceStatus, setServiceStatus] = SP_REACT.useState(null);
+    const [loading, setLoading] = SP_REACT.useState(true);
+    SP_REACT.useEffect(() => {
+        let cancelled = false;
+        let subscriptionId = null;
+        const listener = addEventListener("service_status", (status) => {
+            setServiceStatus(status);
+        });
+        const subscribe = () =>
+            subscribeServiceStatus()
+                .then(({ subscription_id, ...status }) => {
+                    if (subscription_id === undefined) {
+                        return;
+                    }
+                    if (cancelled) {
+                        unsubscribeServiceStatus(subscription_id);
+                        return;
+                    }
+                    subscriptionId = subscription_id;
+                    setServiceStatus(status);
+                })
+                .catch((error) => logError$3(`Service status subscription error: ${String(error)}`));
+        // Keep the lease alive; subscribe again if it lapsed (e.g. the backend restarted)
+        const renewal = setInterval(() => {
+            if (subscriptionId === null) {
+                return;
+            }
+            renewSubscription(subscriptionId)
+                .then((response) => {
+                    if (response.renewed === false && !cancelled) {
+                        subscriptionId = null;
+                        subscribe();
+                    }
+                })
+                .catch((error) => logError$3(`Service status renewal error: ${String(error)}`));
+        }, RENEW_INTERVAL_MS);
+        subscribe().finally(() => setLoading(false));
+        return () => {
+            cancelled = true;
+            clearInterval(renewal);
+            removeEventListener("service_status", listener);
+            if (subscriptionId !== null) {
+                unsubscribeServiceStatus(subscriptionId);
+            }
+        };
+    }, []);
+    return [serviceStatus, setServiceStatus, loading];
+}
+
+// Define callables
 const startMotionService$1 = callable("start_motion_service");
 const stopMotionService$1 = callable("stop_motion_service");
 const startMotionMonitoring$1 = callable("start_motion_monitoring");
 const stopMotionMonitoring = callable("stop_motion_monitoring");
 const getMotionData$2 = callable("get_motion_data");
-const logError$3 = callable("log_error");
+const getStreamHealth = callable("get_stream_health");
+const getDutyCycleStatus = callable("get_duty_cycle_status");
+const setDutyCycling = callable("set_duty_cycling");
+const logError$2 = callable("log_error");
 const MotionServiceSection = () => {
-    const [serviceStatus, setServiceStatus] = SP_REACT.useState(null);
+    const [serviceStatus, , loading] = useServiceStatus();
     const [motionData, setMotionData] = SP_REACT.useState(null);
     const [result, setResult] = SP_REACT.useState('');
-    const [loading, setLoading] = SP_REACT.useState(true);
+    const [streamHealth, setStreamHealth] = SP_REACT.useState(null);
+    const [dutyCycle, setDutyCycle] = SP_REACT.useState(null);
+    // Monitoring state and sample counts are pushed by the backend
+    const motionUpdate = useMotionUpdates(1, !!serviceStatus?.running);
     SP_REACT.useEffect(() => {
-        const checkStatus = async () => {
-            try {
-                const status = await checkServiceStatus$3();
-                setServiceStatus(status);
-                if (status.running) {
-                    const data = await getMotionData$2();
-                    setMotionData(data);
-                }
+        if (motionUpdate) {
+            setMotionData({ status: "success", ...motionUpdate });
+        }
+    }, [motionUpdate]);
+    // Stream health is only meaningful while the receiver is running; the backend pushes
+    // it every 2s alongside motion updates
+    SP_REACT.useEffect(() => {
+        if (!motionData?.monitoring) {
+            setStreamHealth(null);
+            return () => { };
+        }
+        const listener = addEventListener("stream_health", (health) => {
+            if (health.monitoring) {
+                setStreamHealth(health);
             }
-            catch (error) {
-                await logError$3(`MotionServiceSection -> checkStatus: ${String(error)}`);
+        });
+        getStreamHealth()
+            .then((health) => health.status === "success" && setStreamHealth(health))
+            .catch((error) => logError$2(`Stream health error: ${String(error)}`));
+        return () => removeEventListener("stream_health", listener);
+    }, [motionData?.monitoring]);
+    SP_REACT.useEffect(() => {
+        getDutyCycleStatus()
+            .then((status) => status.status === "success" && setDutyCycle(status))
+            .catch((error) => logError$2(`Duty cycle status error: ${String(error)}`));
+    }, [motionData?.monitoring]);
+    const handleDutyCycleToggle = async (enabled) => {
+        try {
+            const response = await setDutyCycling(enabled);
+            if (response.status === "success") {
+                setDutyCycle(await getDutyCycleStatus());
             }
-            finally {
-                setLoading(false);
+            else {
+                setResult(`❌ Failed: ${response.message}`);
             }
-        };
-        checkStatus();
-        const interval = setInterval(checkStatus, 2000);
-        return () => clearInterval(interval);
-    }, []);
+        }
+        catch (error) {
+            await logError$2(`Duty cycle toggle error: ${String(error)}`);
+        }
+    };
     const handleServiceToggle = async () => {
         if (!serviceStatus)
             return;
@@ -135,11 +319,7 @@ const MotionServiceSection = () => {
                 : await startMotionService$1();
             if (response.status === "success") {
                 setResult(`✅ Service ${serviceStatus.running ? 'stopped' : 'started'} successfully`);
-                // Update status after a brief delay
-                setTimeout(async () => {
-                    const newStatus = await checkServiceStatus$3();
-                    setServiceStatus(newStatus);
-                }, 1000);
+                // The new status is pushed by the backend once the change is observed
             }
             else {
                 setResult(`❌ Failed: ${response.message}`);
@@ -147,7 +327,7 @@ const MotionServiceSection = () => {
         }
         catch (error) {
             setResult(`❌ Error: ${String(error)}`);
-            await logError$3(`Service toggle error: ${String(error)}`);
+            await logError$2(`Service toggle error: ${String(error)}`);
         }
     };
     const handleMonitoringToggle = async () => {
@@ -172,7 +352,7 @@ const MotionServiceSection = () => {
         }
         catch (error) {
             setResult(`❌ Error: ${String(error)}`);
-            await logError$3(`Monitoring toggle error: ${String(error)}`);
+            await logError$2(`Monitoring toggle error: ${String(error)}`);
         }
     };
     if (loading) {
@@ -193,6 +373,8 @@ const MotionServiceSection = () => {
                 window.SP_REACT.createElement(DFL.ToggleField, { label: "Motion Data Monitoring", description: motionData?.monitoring ?
                         `Active - ${motionData.history_count} samples collected` :
                         "Start collecting motion data for analysis", checked: motionData?.monitoring || false, onChange: handleMonitoringToggle })),
+            window.SP_REACT.createElement(DFL.PanelSectionRow, null,
+                window.SP_REACT.createElement(DFL.ToggleField, { label: "Battery Saver", description: "Pause the motion stream while cues are off and nothing is reading it", checked: dutyCycle?.enabled || false, onChange: handleDutyCycleToggle })),
             motionData?.monitoring && (window.SP_REACT.createElement(DFL.PanelSectionRow, null,
                 window.SP_REACT.createElement("div", { style: {
                         padding: '12px',
@@ -226,6 +408,20 @@ const MotionServiceSection = () => {
                         "UDP Port 27760: ",
                         serviceStatus.udp_available ?
                             "✅ Responding" : "⚠️ Not responding"),
+                    streamHealth && (window.SP_REACT.createElement("div", { style: { fontSize: '0.8em', opacity: 0.8, marginTop: '4px' } },
+                        window.SP_REACT.createElement("div", null,
+                            "Rate: ",
+                            streamHealth.sample_rate_hz ?? '-',
+                            " Hz",
+                            streamHealth.jitter_ms != null && ` · Jitter: ${streamHealth.jitter_ms} ms`),
+                        window.SP_REACT.createElement("div", null,
+                            "Dropped: ",
+                            (streamHealth.dropped ?? 0) + (streamHealth.gap_samples ?? 0),
+                            streamHealth.lag_ms?.p50 != null && ` · Latency: ${streamHealth.lag_ms.p50} ms`),
+                        !streamHealth.stream_live && streamHealth.since_register_s != null && (window.SP_REACT.createElement("div", null,
+                            "Waiting for data, registered ",
+                            streamHealth.since_register_s.toFixed(1),
+                            "s ago")))),
                     !serviceStatus.udp_available && (window.SP_REACT.createElement("div", { style: { fontSize: '0.8em', opacity: 0.8, marginTop: '4px' } }, "Service may still be starting up")))))),
         result && (window.SP_REACT.createElement(DFL.PanelSectionRow, null,
             window.SP_REACT.createElement("div", { style: {
@@ -240,20 +436,23 @@ const MotionServiceSection = () => {
 };
 
 // Define callables
-const checkServiceStatus$2 = callable("check_service_status");
 const getMotionSettings = callable("get_motion_settings");
 const setMotionCuesEnabled = callable("set_motion_cues_enabled");
 const setMotionSensitivity = callable("set_motion_sensitivity");
 const setCueTypes = callable("set_cue_types");
 const getMotionData$1 = callable("get_motion_data");
 const clearMotionAlerts = callable("clear_motion_alerts");
-const logError$2 = callable("log_error");
+const getCalibration = callable("get_calibration");
+const startCalibration = callable("start_calibration");
+const setAutoCalibration = callable("set_auto_calibration");
+const logError$1 = callable("log_error");
 const MotionCuesSection = () => {
-    const [serviceStatus, setServiceStatus] = SP_REACT.useState(null);
+    const [serviceStatus, , statusLoading] = useServiceStatus();
     const [motionSettings, setMotionSettingsState] = SP_REACT.useState(null);
     const [motionData, setMotionData] = SP_REACT.useState(null);
     const [result, setResult] = SP_REACT.useState('');
     const [loading, setLoading] = SP_REACT.useState(true);
+    const [calibration, setCalibration] = SP_REACT.useState(null);
     const sensitivityOptions = [
         {
             label: 'Low Sensitivity',
@@ -288,29 +487,35 @@ const MotionCuesSection = () => {
             description: 'Sound notifications for motion events'
         }
     ];
+    // Loaded once; changes, including calibration progress, are pushed by the backend
     SP_REACT.useEffect(() => {
+        const listener = addEventListener("motion_settings", ({ calibration, ...settings }) => {
+            setMotionSettingsState(settings);
+            setCalibration(calibration);
+        });
         const loadData = async () => {
             try {
-                const [status, settings, data] = await Promise.all([
-                    checkServiceStatus$2(),
-                    getMotionSettings(),
-                    getMotionData$1()
-                ]);
-                setServiceStatus(status);
+                const settings = await getMotionSettings();
                 setMotionSettingsState(settings);
-                setMotionData(data);
+                setCalibration(await getCalibration());
             }
             catch (error) {
-                await logError$2(`MotionCuesSection -> loadData: ${String(error)}`);
+                await logError$1(`MotionCuesSection -> loadData: ${String(error)}`);
             }
             finally {
                 setLoading(false);
             }
         };
         loadData();
-        const interval = setInterval(loadData, 3000);
-        return () => clearInterval(interval);
+        return () => removeEventListener("motion_settings", listener);
     }, []);
+    // Alerts arrive through pushed motion updates instead of polling get_motion_data
+    const motionUpdate = useMotionUpdates(1, !!serviceStatus?.running);
+    SP_REACT.useEffect(() => {
+        if (motionUpdate) {
+            setMotionData({ status: "success", ...motionUpdate });
+        }
+    }, [motionUpdate]);
     const handleCuesToggle = async () => {
         if (!motionSettings)
             return;
@@ -319,9 +524,6 @@ const MotionCuesSection = () => {
             const response = await setMotionCuesEnabled(!motionSettings.cues_enabled);
             if (response.status === "success") {
                 setResult(`✅ Motion cues ${!motionSettings.cues_enabled ? 'enabled' : 'disabled'}`);
-                // Update settings
-                const newSettings = await getMotionSettings();
-                setMotionSettingsState(newSettings);
             }
             else {
                 setResult(`❌ Failed: ${response.message}`);
@@ -329,7 +531,39 @@ const MotionCuesSection = () => {
         }
         catch (error) {
             setResult(`❌ Error: ${String(error)}`);
-            await logError$2(`Motion cues toggle error: ${String(error)}`);
+            await logError$1(`Motion cues toggle error: ${String(error)}`);
+        }
+    };
+    const handleStartCalibration = async () => {
+        try {
+            const response = await startCalibration(60);
+            if (response.status === "success") {
+                setResult('✅ Calibrating for 60 seconds - hold your Deck as you normally play');
+            }
+            else {
+                setResult(`❌ Failed: ${response.message}`);
+            }
+        }
+        catch (error) {
+            setResult(`❌ Error: ${String(error)}`);
+            await logError$1(`Start calibration error: ${String(error)}`);
+        }
+    };
+    const handleAutoCalibrationToggle = async () => {
+        if (!motionSettings)
+            return;
+        try {
+            const response = await setAutoCalibration(!motionSettings.auto_calibration);
+            if (response.status === "success") {
+                setResult(`✅ Personal thresholds ${!motionSettings.auto_calibration ? 'enabled' : 'disabled'}`);
+            }
+            else {
+                setResult(`❌ Failed: ${response.message}`);
+            }
+        }
+        catch (error) {
+            setResult(`❌ Error: ${String(error)}`);
+            await logError$1(`Auto calibration toggle error: ${String(error)}`);
         }
     };
     const handleSensitivityChange = async (level) => {
@@ -338,9 +572,6 @@ const MotionCuesSection = () => {
             const response = await setMotionSensitivity(level);
             if (response.status === "success") {
                 setResult(`✅ Sensitivity set to ${sensitivityOptions.find(o => o.value === level)?.label}`);
-                // Update settings
-                const newSettings = await getMotionSettings();
-                setMotionSettingsState(newSettings);
             }
             else {
                 setResult(`❌ Failed: ${response.message}`);
@@ -348,7 +579,7 @@ const MotionCuesSection = () => {
         }
         catch (error) {
             setResult(`❌ Error: ${String(error)}`);
-            await logError$2(`Sensitivity change error: ${String(error)}`);
+            await logError$1(`Sensitivity change error: ${String(error)}`);
         }
     };
     const handleCueTypeToggle = async (cueType) => {
@@ -363,9 +594,6 @@ const MotionCuesSection = () => {
             const response = await setCueTypes(newTypes);
             if (response.status === "success") {
                 setResult(`✅ Cue types updated`);
-                // Update settings
-                const newSettings = await getMotionSettings();
-                setMotionSettingsState(newSettings);
             }
             else {
                 setResult(`❌ Failed: ${response.message}`);
@@ -373,7 +601,7 @@ const MotionCuesSection = () => {
         }
         catch (error) {
             setResult(`❌ Error: ${String(error)}`);
-            await logError$2(`Cue type toggle error: ${String(error)}`);
+            await logError$1(`Cue type toggle error: ${String(error)}`);
         }
     };
     const handleClearAlerts = async () => {
@@ -391,7 +619,7 @@ const MotionCuesSection = () => {
         }
         catch (error) {
             setResult(`❌ Error: ${String(error)}`);
-            await logError$2(`Clear alerts error: ${String(error)}`);
+            await logError$1(`Clear alerts error: ${String(error)}`);
         }
     };
     const formatTimestamp = (timestamp) => {
@@ -414,7 +642,7 @@ const MotionCuesSection = () => {
             default: return '⚪';
         }
     };
-    if (loading) {
+    if (loading || statusLoading) {
         return (window.SP_REACT.createElement(DFL.PanelSection, { title: "Motion Cues" },
             window.SP_REACT.createElement(DFL.PanelSectionRow, null,
                 window.SP_REACT.createElement("div", null, "\uD83D\uDD04 Loading motion cues settings..."))));
@@ -451,6 +679,14 @@ const MotionCuesSection = () => {
                         data: option.value,
                         label: option.label
                     })), selectedOption: motionSettings.sensitivity_level, onChange: (option) => handleSensitivityChange(option.data) })),
+            window.SP_REACT.createElement(DFL.PanelSectionRow, null,
+                window.SP_REACT.createElement(DFL.ToggleField, { label: "Personal Thresholds", description: calibration?.phase === "uncalibrated" ?
+                        "Calibrate first to learn thresholds from your own baseline motion" :
+                        "Sensitivity levels become percentiles of your calibrated baseline", checked: motionSettings.auto_calibration || false, disabled: calibration?.phase === "uncalibrated", onChange: handleAutoCalibrationToggle })),
+            window.SP_REACT.createElement(DFL.PanelSectionRow, null,
+                window.SP_REACT.createElement(DFL.ButtonItem, { layout: "below", onClick: handleStartCalibration, disabled: calibration?.phase === "calibrating" }, calibration?.phase === "calibrating" ?
+                    `Calibrating... ${Math.round((calibration.progress || 0) * 100)}%` :
+                    "Calibrate (60s)")),
             window.SP_REACT.createElement(DFL.PanelSectionRow, null,
                 window.SP_REACT.createElement("div", { style: { marginBottom: '8px', fontWeight: 'bold', fontSize: '0.9em' } }, "Cue Types:"),
                 cueTypeOptions.map(cueType => (window.SP_REACT.createElement("div", { key: cueType.value, style: { marginBottom: '8px' } },
@@ -532,51 +768,20 @@ const MotionCuesSection = () => {
 };
 
 // Define callables
-const checkServiceStatus$1 = callable("check_service_status");
 const getMotionData = callable("get_motion_data");
 const startMotionMonitoring = callable("start_motion_monitoring");
-const logError$1 = callable("log_error");
 const MotionDataSection = () => {
-    const [serviceStatus, setServiceStatus] = SP_REACT.useState(null);
+    const [serviceStatus, , loading] = useServiceStatus();
     const [motionData, setMotionData] = SP_REACT.useState(null);
     const [showRawData, setShowRawData] = SP_REACT.useState(false);
     const [autoRefresh, setAutoRefresh] = SP_REACT.useState(true);
-    const [loading, setLoading] = SP_REACT.useState(true);
+    // Pushed updates replace polling; the backend emits only when data changed
+    const motionUpdate = useMotionUpdates(5, !!serviceStatus?.running && autoRefresh);
     SP_REACT.useEffect(() => {
-        const checkStatus = async () => {
-            try {
-                const status = await checkServiceStatus$1();
-                setServiceStatus(status);
-            }
-            catch (error) {
-                await logError$1(`MotionDataSection -> checkStatus: ${String(error)}`);
-            }
-            finally {
-                setLoading(false);
-            }
-        };
-        checkStatus();
-        const interval = setInterval(checkStatus, 5000);
-        return () => clearInterval(interval);
-    }, []);
-    SP_REACT.useEffect(() => {
-        const updateMotionData = async () => {
-            try {
-                if (serviceStatus?.running && autoRefresh) {
-                    const data = await getMotionData();
-                    setMotionData(data);
-                }
-            }
-            catch (error) {
-                await logError$1(`Motion data update error: ${String(error)}`);
-            }
-        };
-        if (serviceStatus?.running && autoRefresh) {
-            const interval = setInterval(updateMotionData, 200); // Update every 200ms for smooth display
-            return () => clearInterval(interval);
+        if (motionUpdate) {
+            setMotionData({ status: "success", ...motionUpdate });
         }
-        return () => { }; // Always return a cleanup function
-    }, [serviceStatus?.running, autoRefresh]);
+    }, [motionUpdate]);
     const formatTimestamp = (timestamp) => {
         const date = new Date(timestamp / 1000); // Convert microseconds to milliseconds
         return date.toLocaleTimeString() + '.' + String(date.getMilliseconds()).padStart(3, '0');
@@ -677,6 +882,20 @@ const MotionDataSection = () => {
                     window.SP_REACT.createElement("div", null,
                         "Roll: ",
                         data.gyro.roll.toFixed(1)))),
+            motionData.orientation?.ready && (window.SP_REACT.createElement("div", { style: { marginTop: '12px', fontSize: '0.8em' } },
+                window.SP_REACT.createElement("div", { style: { fontWeight: 'bold', marginBottom: '6px' } }, "\uD83E\uDDED Orientation"),
+                window.SP_REACT.createElement("div", null,
+                    "Horizon: ",
+                    motionData.orientation.horizon.toFixed(1),
+                    "\u00B0 \u00B7 Tilt: ",
+                    motionData.orientation.pitch.toFixed(1),
+                    "\u00B0"),
+                window.SP_REACT.createElement("div", null,
+                    "Turning: ",
+                    motionData.orientation.vertical_rate.toFixed(1),
+                    "\u00B0/s \u00B7 Tilting: ",
+                    motionData.orientation.tilt_rate.toFixed(1),
+                    "\u00B0/s"))),
             window.SP_REACT.createElement("div", { style: {
                     marginTop: '12px',
                     paddingTop: '8px',
@@ -751,7 +970,7 @@ const MotionDataSection = () => {
                     window.SP_REACT.createElement("div", null,
                         "Recent alerts: ",
                         motionData.alerts.length),
-                    window.SP_REACT.createElement("div", null, "Update rate: ~5 Hz (200ms intervals)"))))) : (window.SP_REACT.createElement(DFL.PanelSectionRow, null,
+                    window.SP_REACT.createElement("div", null, "Update rate: up to 5 Hz (pushed on change)"))))) : (window.SP_REACT.createElement(DFL.PanelSectionRow, null,
             window.SP_REACT.createElement("div", { style: {
                     padding: '12px',
                     backgroundColor: 'rgba(255, 152, 0, 0.1)',
@@ -781,40 +1000,28 @@ const toggleMotionCues = callable("toggle_motion_cues");
 const getDebugInfo = callable("get_debug_info");
 const logError = callable("log_error");
 function MotionServiceMainSection() {
-    const [serviceStatus, setServiceStatus] = SP_REACT.useState(null);
-    const [loading, setLoading] = SP_REACT.useState(true);
+    const [serviceStatus, setServiceStatus, loading] = useServiceStatus();
     const [result, setResult] = SP_REACT.useState('');
     const [installing, setInstalling] = SP_REACT.useState(false);
     const [showDebugInfo, setShowDebugInfo] = SP_REACT.useState(false);
     const [debugInfo, setDebugInfo] = SP_REACT.useState(null);
-    // Check service status periodically
-    SP_REACT.useEffect(() => {
-        const checkStatus = async () => {
-            try {
-                const status = await checkServiceStatus();
-                setServiceStatus(status);
-            }
-            catch (error) {
-                await logError(`Status check error: ${String(error)}`);
-            }
-            finally {
-                setLoading(false);
-            }
-        };
-        checkStatus();
-        const interval = setInterval(checkStatus, 3000);
-        return () => clearInterval(interval);
-    }, []);
     const handleInstall = async () => {
+        let progressListener = null;
         try {
             setInstalling(true);
             setResult('🔄 Installing Motion Service dependencies...');
             // Get debug info first
             const debug = await getDebugInfo();
             setDebugInfo(debug);
+            // Show install steps and script output as they happen
+            progressListener = addEventListener("install_progress", (progress) => {
+                if (progress.stage !== "done" && progress.stage !== "error" && progress.message) {
+                    setResult(`🔄 ${progress.message}`);
+                }
+            });
             const response = await installMotionService();
             if (response.status === "success") {
-                setResult('✅ Motion Service dependencies installed successfully!');
+                setResult(`✅ ${response.message ?? 'Motion Service dependencies installed successfully!'}`);
                 // Refresh status
                 const newStatus = await checkServiceStatus();
                 setServiceStatus(newStatus);
@@ -830,6 +1037,9 @@ function MotionServiceMainSection() {
             await logError(`Install error: ${String(error)}`);
         }
         finally {
+            if (progressListener) {
+                removeEventListener("install_progress", progressListener);
+            }
             setInstalling(false);
         }
     };
@@ -883,7 +1093,7 @@ function MotionServiceMainSection() {
                 return "🔴 Motion Service Dependencies Not Installed";
             }
             if (serviceStatus.running) {
-                if (serviceStatus.udp_available) {
+                if (serviceStatus.ready) {
                     return "🟢 Motion Service Active & Ready";
                 }
                 else {
@@ -1,207 +1,2889 @@
+import time
+_LOAD_STARTED = time.perf_counter()  # Module import time is reported by get_debug_info
+
 import decky
+import asyncio
+import logging
 import os
-import subprocess
-import shutil
-import zipfile
 import threading
 import socket
 import json
-import time
+import select
 import math
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque, namedtuple
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple
-import signal
-from datetime import datetime, timedelta
+
+# py_modules/ is on the plugin's import path
+from motion_ring import RING_FILE_NAME, RingReader, RingWriter
+
+# sdmotion streams JSON samples to every client that sends "register" to this address
+SERVICE_ADDR = ("127.0.0.1", 27760)
+REGISTER_INTERVAL = 2.0  # Re-register after this many seconds without data
+RECEIVE_BUFFER_SIZE = 4096
+
+# Service status is cached and shared by all callers for STATUS_TTL seconds. While the
+# UI is subscribed, a watcher re-probes on lifecycle and stream events, with a slow backstop.
+STATUS_TTL = 1.0
+STATUS_WATCH_INTERVAL = 10.0
+SERVICE_UNIT_FILE = os.path.expanduser("~/.config/systemd/user/sdmotion.service")
+
+# Duty cycling: with no consumer of motion data (cues, UI subscribers, a recorder or a
+# recent poll) the receiver closes its socket after a grace period and resumes on demand
+DUTY_CYCLE_GRACE = 5.0
+POLL_LEASE_SECONDS = 10.0
+# UI subscriptions expire unless renewed, so a frontend that goes away without
+# unsubscribing cannot hold the receiver awake
+SUBSCRIPTION_LEASE_SECONDS = 30.0
+# The motion publisher also pushes stream health this often while monitoring
+STREAM_HEALTH_PUSH_INTERVAL = 2.0
+UNREGISTER_MESSAGE = b"unregister"  # Best effort; sdmotion also drops clients that go silent
+
+# Installs are incremental: the archive's hash and per-member CRCs are kept in this
+# settings file, and only changed members are extracted
+INSTALL_ZIP_NAMES = ("steamdeck_motion_service.zip", "SteamDeckMotionSetup.zip", "steamdeck-motion-service.zip")
+INSTALL_STATE_FILE = "install_state.json"
+INSTALL_SCRIPT_TIMEOUT = 120
+INSTALL_OUTPUT_LINES = 200  # Script output kept for the install result
+
+# The service counts as ready once it sends a valid motion datagram
+SERVICE_READY_TIMEOUT = 10.0
+SERVICE_READY_RETRY = 0.25
+SERVICE_STATUS_PROBE_TIMEOUT = 0.5  # Status checks probe a service started outside the plugin this long
+
+# Drain mode reads every pending datagram per wakeup; a large kernel buffer absorbs
+# bursts after a scheduler stall (the kernel caps this at net.core.rmem_max)
+DRAIN_SOCKET_BUFFER = 1 << 20
+DRAIN_MAX_PACKETS = 512
+
+# Receive mode "process": receive, decode and analysis run in a forked worker
+# that hands samples back through a private ring and results through a pipe.
+# The receive mode is saved in SETTINGS_FILE so the worker launcher can be
+# forked at load, before the plugin has threads, only when it will be needed
+SETTINGS_FILE = "settings.json"
+RECEIVE_MODES = ("thread", "asyncio", "process")
+WORKER_RING_FILE = "worker.ring"
+# Rings go in tmpfs when there is one, so their 1 kHz writes never reach the disk
+RING_SHM_DIR = "/dev/shm"
+RING_SHM_PREFIX = "motioncues-"
+WORKER_POLL_INTERVAL = 0.02  # Parent wakeups to collect worker output
+WORKER_SLICE = 8  # Samples stored per GIL hold while collecting
+WORKER_START_TIMEOUT = 5.0
+WORKER_RESTART_DELAY = 0.5  # Doubles with each consecutive crash
+WORKER_RESTART_MAX_DELAY = 10.0
+WORKER_STABLE_SECONDS = 10.0  # A worker that ran this long resets the crash backoff
+WORKER_HEALTH_INTERVAL = 1.0  # Seconds between the worker's stream health reports
+
+# Binary wire format, requested with REGISTER_BINARY. Services that do not
+# understand it keep sending JSON, and every packet is sniffed by its first bytes.
+#   header: magic, version, sample count, reserved
+#   sample: sequence number, timestamp (microseconds), accel x/y/z, gyro pitch/yaw/roll
+REGISTER_JSON = b"register"
+REGISTER_BINARY = b"register bin1"
+BINARY_MAGIC = b"SDMB"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<4sBBH")
+BINARY_SAMPLE = struct.Struct("<IQ6f")
+
+def encode_binary_packet(samples: list) -> bytes:
+    """Pack (seq, timestamp_us, ax, ay, az, pitch, yaw, roll) tuples into one datagram"""
+    packet = bytearray(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(samples), 0))
+    for sample in samples:
+        packet += BINARY_SAMPLE.pack(*sample)
+    return bytes(packet)
+
+def choose_register_payload(prefer_binary: bool, wire_format: Optional[str], last_register: Optional[bytes]) -> bytes:
+    """Registration message; binary is requested until the service answers with JSON"""
+    if not prefer_binary or wire_format == "json":
+        return REGISTER_JSON
+    if wire_format == "binary" or last_register != REGISTER_BINARY:
+        return REGISTER_BINARY
+    # No reply to the binary request; older services may only know "register"
+    return REGISTER_JSON
+
+def decode_motion_packet(data: bytes) -> list:
+    """Decode one datagram (binary or JSON) into sample dicts
+
+    Raises ValueError for malformed packets.
+    """
+    if data[:4] != BINARY_MAGIC:
+        return [json.loads(data)]
+    
+    try:
+        _, version, count, _ = BINARY_HEADER.unpack_from(data)
+    except struct.error as e:
+        raise ValueError(f"Truncated binary header: {e}")
+    end = BINARY_HEADER.size + count * BINARY_SAMPLE.size
+    if version != BINARY_VERSION or len(data) < end:
+        raise ValueError(f"Bad binary packet (version {version}, {len(data)} bytes for {count} samples)")
+    
+    sqrt = math.sqrt
+    samples = []
+    for seq, timestamp, ax, ay, az, pitch, yaw, roll in BINARY_SAMPLE.iter_unpack(data[BINARY_HEADER.size:end]):
+        samples.append({
+            "timestamp": timestamp,
+            "accel": {"x": ax, "y": ay, "z": az},
+            "gyro": {"pitch": pitch, "yaw": yaw, "roll": roll},
+            "magnitude": {"accel": sqrt(ax * ax + ay * ay + az * az), "gyro": sqrt(pitch * pitch + yaw * yaw + roll * roll)},
+            "frameId": seq
+        })
+    return samples
+
+MOTION_LEVELS = ("none", "mild", "moderate", "severe")
+
+# Auto-calibration: thresholds from streaming quantiles of the user's own baseline
+CALIBRATION_FILE = "calibration.json"
+CALIBRATION_SECONDS = 60.0
+CALIBRATION_RATE = 10.0  # Window observations per second fed to the estimators
+CALIBRATION_REFRESH = 60.0  # Seconds of data between continuous threshold updates
+CALIBRATION_PERCENTILES = {1: 0.99, 2: 0.95, 3: 0.90}  # Sensitivity -> baseline quantile where mild begins
+CALIBRATION_MILD_FRACTION = {"gyro": 0.5, "accel": 0.7, "sway": 0.5}  # Fraction of a threshold classify_motion calls mild
+CALIBRATION_FLOORS = {"gyro": 5.0, "accel": 1.02, "sway": 2.0}  # Lowest mild boundary, so a still Deck is not hair-trigger
+CALIBRATION_MAX_DRIFT = 2.0  # Continuous updates stay within this factor of the calibration result
+
+# Cue dispatch: the receive path queues cues, a dispatcher thread delivers them
+CUE_QUEUE_SIZE = 32
+CUE_DISPATCH_INTERVAL = 0.05  # Cues queued within this many seconds are merged
+CUE_RATE_LIMITS = {  # Cue type -> (cues per second, burst)
+    "visual": (1.0, 1.0),
+    "haptic": (0.5, 1.0),
+    "audio": (0.5, 1.0)
+}
+
+# Logging: records go through a bounded queue to a background writer (see LogPipeline)
+LOG_QUEUE_SIZE = 1000  # Records waiting for the writer before new ones are dropped
+LOG_RATE_WINDOW = 10.0  # Seconds
+LOG_RATE_BURST = 5  # Records per rate key and window; the rest are counted, not written
+
+# History capacity bounds: 100 samples up to five minutes at 1 kHz
+HISTORY_MIN_CAPACITY = 100
+HISTORY_MAX_CAPACITY = 300_000
+HISTORY_DEFAULT_CAPACITY = 6000
+HISTORY_CHART_POINTS = 854  # Quick Access panel width in pixels
+HISTORY_MAX_POINTS = 5000  # Ceiling on points per get_motion_history call
+
+# Orientation fusion (Madgwick IMU filter)
+ORIENTATION_BETA = 0.05  # Accelerometer correction gain; higher trusts gravity more
+ORIENTATION_ACCEL_GATE = 0.25  # Skip correction when |accel| is this far from 1 g (linear acceleration)
+ORIENTATION_MAX_GAP = 0.5  # Seconds without samples after which the filter restarts from gravity
+
+# Rollup tiers: (name, bucket width in seconds, buckets kept)
+ROLLUP_TIERS = (("1s", 1, 3600), ("10s", 10, 2160), ("1m", 60, 1440))
+
+# Session recordings: a header, then chunks of fixed-size records each followed by an
+# index block (record count, first record number, time range) so replay can seek by time
+RECORDING_DIR_NAME = "recordings"
+RECORDING_SUFFIX = ".sdmr"
+RECORDING_MAGIC = b"SDMR"
+RECORDING_VERSION = 1
+RECORDING_HEADER = struct.Struct("<4sHHHHIQ40x")  # magic, version, header/record/index sizes, chunk records, created (us)
+RECORDING_RECORD = struct.Struct("<QI6f")  # timestamp (us), frameId, accel x/y/z, gyro pitch/yaw/roll
+RECORDING_INDEX_MAGIC = b"SDMI"
+RECORDING_INDEX = struct.Struct("<4sIQQQ")  # magic, records, first record number, first/last timestamp
+RECORDING_CHUNK_RECORDS = 4096
+RECORDING_FLUSH_INTERVAL = 0.5  # Seconds between writer wakeups
+RECORDING_TIMESTAMP = struct.Struct("<Q")  # Leading field of a record, read back for the chunk index
+RECORDING_MAX_PENDING_BYTES = 4 * 1024 * 1024  # Packed records queued for the writer before new ones are dropped
+# A recording stops by itself at either limit (about 36 KB/s at 1 kHz, so 130 MB per hour)
+RECORDING_MAX_SECONDS = 3600.0
+RECORDING_MAX_BYTES = 256 * 1024 * 1024
+
+ALERT_HISTORY = 10  # Alerts kept in the snapshot
+
+class MotionSample(namedtuple("MotionSample", "timestamp frame_id accel_x accel_y accel_z "
+                                              "gyro_pitch gyro_yaw gyro_roll accel gyro")):
+    """Immutable decoded sample, under half the memory of the nested dict the decoders produce"""
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, motion_data: Dict[str, Any]) -> "MotionSample":
+        accel = motion_data.get('accel', {})
+        gyro = motion_data.get('gyro', {})
+        magnitude = motion_data.get('magnitude', {})
+        return cls(
+            motion_data.get('timestamp', 0), motion_data.get('frameId', 0),
+            accel.get('x', 0.0), accel.get('y', 0.0), accel.get('z', 0.0),
+            gyro.get('pitch', 0.0), gyro.get('yaw', 0.0), gyro.get('roll', 0.0),
+            magnitude.get('accel', 0.0), magnitude.get('gyro', 0.0)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": self.timestamp,
+            "accel": {"x": self.accel_x, "y": self.accel_y, "z": self.accel_z},
+            "gyro": {"pitch": self.gyro_pitch, "yaw": self.gyro_yaw, "roll": self.gyro_roll},
+            "magnitude": {"accel": self.accel, "gyro": self.gyro},
+            "frameId": self.frame_id
+        }
+
+class MotionAlert(namedtuple("MotionAlert", "timestamp level gyro accel cue_types")):
+    __slots__ = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": self.timestamp,
+            "level": self.level,
+            "gyro": self.gyro,
+            "accel": self.accel,
+            "cue_types": list(self.cue_types)
+        }
+
+class MotionSnapshot(namedtuple("MotionSnapshot", "sample_seq latest alert_seq alerts window sway orientation")):
+    """What the callables and the publisher read: the latest sample, recent alerts and analysis stats
+
+    Writers build a new snapshot and swap the plugin's reference, so readers
+    get a consistent view from one attribute read without locking or copying.
+    `alerts` is a tuple of the last ALERT_HISTORY MotionAlerts; `alert_seq`
+    counts every alert ever delivered. `window`, `sway` and `orientation` are
+    stats dicts copied after each batch (None until available) and are never
+    modified once published.
+    """
+    __slots__ = ()
+
+EMPTY_SNAPSHOT = MotionSnapshot(0, None, 0, (), None, None, None)
+
+class HistoryWindow:
+    """Zero-copy view of a time range in MotionHistory
+
+    A range can wrap around the end of the ring, so each axis is exposed as
+    up to two memoryview segments in chronological order.
+    """
+
+    def __init__(self, history: "MotionHistory", spans: list):
+        self._history = history
+        self.spans = spans
+
+    def __len__(self) -> int:
+        return sum(stop - start for start, stop in self.spans)
+
+    def view(self, axis: str) -> list:
+        """Memoryview segments of one axis (see MotionHistory.AXES)"""
+        buffer = memoryview(self._history.columns[axis])
+        return [buffer[start:stop] for start, stop in self.spans]
+
+    def values(self, axis: str) -> list:
+        """Copy one axis into a list"""
+        result = []
+        for segment in self.view(axis):
+            result.extend(segment.tolist())
+        return result
+
+class MotionHistory:
+    """Fixed-capacity ring buffer of motion samples with one contiguous array per axis
+
+    Writers hold `lock` around each batch of appends; resize and copy_since
+    take it themselves, so readers on other threads see whole batches.
+    """
+
+    AXES = ("accel_x", "accel_y", "accel_z", "gyro_pitch", "gyro_yaw", "gyro_roll", "accel", "gyro")
+
+    def __init__(self, capacity: int = HISTORY_DEFAULT_CAPACITY):
+        self.lock = threading.Lock()
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = array('q', bytes(8 * capacity))  # Sensor timestamps (microseconds)
+        self.columns = {axis: array('f', bytes(4 * capacity)) for axis in self.AXES}
+        self._ax, self._ay, self._az, self._gp, self._gy, self._gr, self._ma, self._mg = (
+            self.columns[axis] for axis in self.AXES
+        )
+        self._head = 0  # Next write position
+        self._count = 0
+        self.total = 0  # Samples appended since creation
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: int, accel_x: float, accel_y: float, accel_z: float,
+               gyro_pitch: float, gyro_yaw: float, gyro_roll: float,
+               accel: float, gyro: float):
+        """Append one sample in O(1), overwriting the oldest when full"""
+        i = self._head
+        self.timestamps[i] = timestamp
+        self._ax[i] = accel_x
+        self._ay[i] = accel_y
+        self._az[i] = accel_z
+        self._gp[i] = gyro_pitch
+        self._gy[i] = gyro_yaw
+        self._gr[i] = gyro_roll
+        self._ma[i] = accel
+        self._mg[i] = gyro
+        i += 1
+        self._head = 0 if i == self.capacity else i
+        if self._count < self.capacity:
+            self._count += 1
+        self.total += 1
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+    def resize(self, capacity: int):
+        """Change capacity, keeping the newest samples"""
+        with self.lock:
+            self._resize(capacity)
+
+    def _resize(self, capacity: int):
+        keep = min(self._count, capacity)
+        spans = self._spans(self._count - keep, self._count)
+        timestamps = array('q')
+        columns = {axis: array('f') for axis in self.AXES}
+        for start, stop in spans:
+            timestamps.extend(self.timestamps[start:stop])
+            for axis in self.AXES:
+                columns[axis].extend(self.columns[axis][start:stop])
+        
+        total = self.total
+        self._allocate(capacity)
+        self.timestamps[:keep] = timestamps
+        for axis in self.AXES:
+            self.columns[axis][:keep] = columns[axis]
+        self._head = keep % capacity
+        self._count = keep
+        self.total = total
+
+    def _spans(self, first: int, last: int) -> list:
+        """Physical index ranges for logical positions [first, last) (0 = oldest)"""
+        if first >= last:
+            return []
+        oldest = (self._head - self._count) % self.capacity
+        start = oldest + first
+        stop = oldest + last
+        if stop <= self.capacity:
+            return [(start, stop)]
+        if start >= self.capacity:
+            return [(start - self.capacity, stop - self.capacity)]
+        return [(start, self.capacity), (0, stop - self.capacity)]
+
+    def _logical_bisect(self, timestamp: int, right: bool) -> int:
+        """Logical position of a timestamp; samples are in arrival order"""
+        oldest = (self._head - self._count) % self.capacity
+        search = bisect_right if right else bisect_left
+        view = memoryview(self.timestamps)
+        if oldest + self._count <= self.capacity:
+            return search(view, timestamp, oldest, oldest + self._count) - oldest
+        
+        # Wrapped: [oldest, capacity) holds the older half, [0, head) the newer
+        older = self.capacity - oldest
+        newer_first = self.timestamps[0]
+        if timestamp > newer_first or (right and timestamp == newer_first):
+            return older + search(view, timestamp, 0, self._head)
+        return search(view, timestamp, oldest, self.capacity) - oldest
+
+    def window(self, start: Optional[int] = None, end: Optional[int] = None) -> HistoryWindow:
+        """Zero-copy view of samples with start <= timestamp <= end (microseconds)"""
+        first = 0 if start is None else self._logical_bisect(start, right=False)
+        last = self._count if end is None else self._logical_bisect(end, right=True)
+        return HistoryWindow(self, self._spans(first, last))
+
+    def latest(self, count: int) -> HistoryWindow:
+        """Zero-copy view of the newest count samples"""
+        count = min(count, self._count)
+        return HistoryWindow(self, self._spans(self._count - count, self._count))
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest retained sample (samples are numbered from 1)"""
+        return self.total - self._count + 1
+
+    def since(self, seq: int) -> HistoryWindow:
+        """Zero-copy view of retained samples numbered after seq"""
+        first = max(0, seq - (self.total - self._count))
+        return HistoryWindow(self, self._spans(min(first, self._count), self._count))
+
+    def copy_since(self, seq: int, axes) -> Tuple[int, int, array, Dict[str, array]]:
+        """Copy retained samples numbered after seq: (total, first retained seq, timestamps, columns)
+
+        Only array slices are copied while holding the lock, so writers wait
+        for a memcpy at most. A seq ahead of the history (it started over, e.g.
+        after a plugin restart) copies everything retained.
+        """
+        with self.lock:
+            window = self.since(seq if seq <= self.total else 0)
+            timestamps = array('q')
+            columns = {axis: array('f') for axis in axes}
+            for start, stop in window.spans:
+                timestamps += self.timestamps[start:stop]
+                for axis, values in columns.items():
+                    values += self.columns[axis][start:stop]
+            return self.total, self.first_seq, timestamps, columns
+
+def lttb_indices(xs: list, ys: list, threshold: int) -> list:
+    """Indices picked by Largest-Triangle-Three-Buckets downsampling
+
+    Keeps the first and last points and, from each bucket in between, the point
+    forming the largest triangle with the previous pick and the next bucket's
+    average, which preserves peaks that plain decimation would drop.
+    """
+    count = len(xs)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+    
+    every = (count - 2) / (threshold - 2)
+    picked = [0]
+    a = 0
+    for bucket in range(threshold - 2):
+        next_start = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, count)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+        
+        ax, ay = xs[a], ys[a]
+        best_area = -1.0
+        best = next_start - 1
+        for j in range(int(bucket * every) + 1, next_start):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+        picked.append(best)
+        a = best
+    picked.append(count - 1)
+    return picked
+
+class WindowedMotionDetector:
+    """Sliding time-window statistics of gyro and accel magnitudes
+
+    Running sums give mean, RMS and variance, and monotonic deques give the
+    window peak, so each new sample costs amortized O(1) however long the
+    window is.
+    """
+
+    # Recompute the running sums from scratch after this many evictions to cap float drift
+    RESUM_INTERVAL = 1 << 16
+
+    def __init__(self, window_seconds: float):
+        self.window_us = int(window_seconds * 1_000_000)
+        self.reset()
+
+    def reset(self):
+        self._samples = deque()  # (timestamp, gyro, accel)
+        self._gyro_peaks = deque()  # (timestamp, gyro), values decreasing
+        self._accel_peaks = deque()
+        self._gyro_sum = 0.0
+        self._gyro_sq_sum = 0.0
+        self._accel_sum = 0.0
+        self._accel_sq_sum = 0.0
+        self._evictions = 0
+
+    def resize(self, window_seconds: float):
+        """Change the window length; a shorter window drops old samples right away"""
+        self.window_us = int(window_seconds * 1_000_000)
+        if self._samples:
+            self._evict(self._samples[-1][0])
+
+    def add(self, timestamp: int, gyro: float, accel: float):
+        """Add one sample (timestamp in microseconds)"""
+        if self._samples and timestamp < self._samples[-1][0]:
+            # The sensor clock went backwards (service restart); start over
+            self.reset()
+        
+        self._samples.append((timestamp, gyro, accel))
+        self._gyro_sum += gyro
+        self._gyro_sq_sum += gyro * gyro
+        self._accel_sum += accel
+        self._accel_sq_sum += accel * accel
+        
+        peaks = self._gyro_peaks
+        while peaks and peaks[-1][1] <= gyro:
+            peaks.pop()
+        peaks.append((timestamp, gyro))
+        peaks = self._accel_peaks
+        while peaks and peaks[-1][1] <= accel:
+            peaks.pop()
+        peaks.append((timestamp, accel))
+        
+        self._evict(timestamp)
+
+    def _evict(self, now: int):
+        cutoff = now - self.window_us
+        samples = self._samples
+        while samples and samples[0][0] < cutoff:
+            _, gyro, accel = samples.popleft()
+            self._gyro_sum -= gyro
+            self._gyro_sq_sum -= gyro * gyro
+            self._accel_sum -= accel
+            self._accel_sq_sum -= accel * accel
+            self._evictions += 1
+        while self._gyro_peaks and self._gyro_peaks[0][0] < cutoff:
+            self._gyro_peaks.popleft()
+        while self._accel_peaks and self._accel_peaks[0][0] < cutoff:
+            self._accel_peaks.popleft()
+        
+        if self._evictions >= self.RESUM_INTERVAL:
+            self._evictions = 0
+            self._gyro_sum = math.fsum(s[1] for s in samples)
+            self._gyro_sq_sum = math.fsum(s[1] * s[1] for s in samples)
+            self._accel_sum = math.fsum(s[2] for s in samples)
+            self._accel_sq_sum = math.fsum(s[2] * s[2] for s in samples)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    @property
+    def span_seconds(self) -> float:
+        """Time covered by the samples in the window"""
+        if not self._samples:
+            return 0.0
+        return (self._samples[-1][0] - self._samples[0][0]) / 1_000_000
+
+    def stats(self) -> Dict[str, Any]:
+        """Mean, RMS, variance and peak of both magnitudes over the window"""
+        n = len(self._samples)
+        if not n:
+            return {"samples": 0, "span": 0.0, "gyro": None, "accel": None}
+        
+        def summarize(total: float, sq_total: float, peaks: deque) -> Dict[str, float]:
+            mean = total / n
+            mean_sq = max(sq_total / n, 0.0)
+            return {
+                "mean": mean,
+                "rms": math.sqrt(mean_sq),
+                "variance": max(mean_sq - mean * mean, 0.0),
+                "peak": peaks[0][1] if peaks else 0.0
+            }
+        
+        return {
+            "samples": n,
+            "span": self.span_seconds,
+            "gyro": summarize(self._gyro_sum, self._gyro_sq_sum, self._gyro_peaks),
+            "accel": summarize(self._accel_sum, self._accel_sq_sum, self._accel_peaks)
+        }
+
+class SwayAnalyzer:
+    """Band power of slow 0.1-0.5 Hz rotational sway, the range linked to motion sickness
+
+    Gyro axes are block-averaged down to DECIMATED_RATE as they arrive, which is
+    cheap enough for the full sensor rate. Every HOP_SECONDS, Goertzel filters
+    evaluate the band's DFT bins over the last WINDOW_SECONDS of decimated data.
+    Memory is fixed at one small ring per axis.
+    """
+
+    DECIMATED_RATE = 10.0  # Hz
+    WINDOW_SECONDS = 20.0  # 0.05 Hz bin spacing
+    HOP_SECONDS = 1.0
+    BAND = (0.1, 0.5)  # Hz
+
+    def __init__(self):
+        self.size = int(self.WINDOW_SECONDS * self.DECIMATED_RATE)
+        self.bucket_us = int(1_000_000 / self.DECIMATED_RATE)
+        self.hop = int(self.HOP_SECONDS * self.DECIMATED_RATE)
+        low, high = self.BAND
+        bins = range(math.ceil(low * self.WINDOW_SECONDS), math.floor(high * self.WINDOW_SECONDS) + 1)
+        # Goertzel coefficients and bin frequencies for the band
+        self.bins = [(2 * math.cos(2 * math.pi * k / self.size), k / self.WINDOW_SECONDS) for k in bins]
+        self.reset()
+
+    def reset(self):
+        self._rings = [array('d', bytes(8 * self.size)) for _ in range(3)]
+        self._head = 0
+        self._filled = 0
+        self._since_hop = 0
+        self._bucket_end = None
+        self._sums = [0.0, 0.0, 0.0]
+        self._count = 0
+        self.band_rms = 0.0  # Band-limited RMS rotation rate (deg/s)
+        self.peak_frequency = 0.0
+        self.ready = False
+
+    def add(self, timestamp: int, pitch: float, yaw: float, roll: float):
+        """Add one raw gyro sample (timestamp in microseconds)"""
+        if (self._bucket_end is None or timestamp < self._bucket_end - self.bucket_us
+                or timestamp - self._bucket_end > self.WINDOW_SECONDS * 1_000_000):
+            # First sample, the sensor clock went backwards, or a gap longer than the window
+            if self._bucket_end is not None:
+                self.reset()
+            self._bucket_end = timestamp + self.bucket_us
+        
+        while timestamp >= self._bucket_end:
+            self._close_bucket()
+        
+        sums = self._sums
+        sums[0] += pitch
+        sums[1] += yaw
+        sums[2] += roll
+        self._count += 1
+
+    def _close_bucket(self):
+        self._bucket_end += self.bucket_us
+        count = self._count
+        head = self._head
+        for axis in range(3):
+            # An empty bucket (dropped packets) repeats the previous value
+            if count:
+                self._rings[axis][head] = self._sums[axis] / count
+                self._sums[axis] = 0.0
+            else:
+                self._rings[axis][head] = self._rings[axis][head - 1]
+        self._count = 0
+        self._head = (head + 1) % self.size
+        if self._filled < self.size:
+            self._filled += 1
+        
+        self._since_hop += 1
+        if self._since_hop >= self.hop and self._filled >= self.size // 2:
+            self._since_hop = 0
+            self._update_band_power()
+
+    def _update_band_power(self):
+        n = self._filled
+        start = (self._head - n) % self.size
+        power_by_bin = [0.0] * len(self.bins)
+        for ring in self._rings:
+            # Chronological copy of the filled part, mean removed
+            values = (ring[start:] + ring[:self._head]) if start + n > self.size else ring[start:start + n]
+            mean = sum(values) / n
+            for b, (coefficient, _) in enumerate(self.bins):
+                s1 = s2 = 0.0
+                for value in values:
+                    s0 = value - mean + coefficient * s1 - s2
+                    s2 = s1
+                    s1 = s0
+                power_by_bin[b] += s1 * s1 + s2 * s2 - coefficient * s1 * s2
+        
+        # Parseval: a real signal's RMS^2 is 2/N^2 times the sum of its one-sided bin powers
+        self.band_rms = math.sqrt(max(2 * sum(power_by_bin), 0.0)) / n
+        self.peak_frequency = self.bins[max(range(len(self.bins)), key=power_by_bin.__getitem__)][1]
+        self.ready = True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "band_hz": list(self.BAND),
+            "band_rms": self.band_rms,
+            "peak_frequency": self.peak_frequency
+        }
+
+class OrientationFilter:
+    """Madgwick gradient-descent orientation filter over gyro and accelerometer axes
+
+    Keeps a unit quaternion (sensor to earth) in slots and updates it per sample
+    without building any containers. Gyro pitch/yaw/roll are taken as rotation
+    about the sensor x/y/z axes in degrees per second, accel in g. The yaw
+    about gravity is gyro-only and drifts; tilt relative to the horizon does not.
+    """
+
+    __slots__ = ("beta", "q0", "q1", "q2", "q3", "last_timestamp", "updates",
+                 "vertical_rate", "tilt_rate")
+
+    def __init__(self, beta: float = ORIENTATION_BETA):
+        self.beta = beta
+        self.reset()
+
+    def reset(self):
+        self.q0, self.q1, self.q2, self.q3 = 1.0, 0.0, 0.0, 0.0
+        self.last_timestamp = None
+        self.updates = 0
+        self.vertical_rate = 0.0  # deg/s about the gravity axis (turning)
+        self.tilt_rate = 0.0  # deg/s about horizontal axes (pitching and rolling)
+
+    def _align(self, ax: float, ay: float, az: float):
+        """Start from the tilt the accelerometer reports, with zero yaw"""
+        if not (ax or ay or az):
+            return
+        roll = math.atan2(ay, az) / 2
+        pitch = math.atan2(-ax, math.sqrt(ay * ay + az * az)) / 2
+        cr, sr, cp, sp = math.cos(roll), math.sin(roll), math.cos(pitch), math.sin(pitch)
+        self.q0, self.q1, self.q2, self.q3 = cr * cp, sr * cp, cr * sp, -sr * sp
+
+    def update(self, timestamp: int, gx: float, gy: float, gz: float, ax: float, ay: float, az: float):
+        """Advance to a sample (timestamp in microseconds)"""
+        last = self.last_timestamp
+        self.last_timestamp = timestamp
+        if last is None or timestamp <= last or timestamp - last > ORIENTATION_MAX_GAP * 1_000_000:
+            self._align(ax, ay, az)
+            return
+        dt = (timestamp - last) / 1_000_000
+        self.updates += 1
+        
+        q0, q1, q2, q3 = self.q0, self.q1, self.q2, self.q3
+        # Degrees to radians
+        gx *= 0.017453292519943295
+        gy *= 0.017453292519943295
+        gz *= 0.017453292519943295
+        
+        # Rate of change of the quaternion from the gyroscope
+        d0 = 0.5 * (-q1 * gx - q2 * gy - q3 * gz)
+        d1 = 0.5 * (q0 * gx + q2 * gz - q3 * gy)
+        d2 = 0.5 * (q0 * gy - q1 * gz + q3 * gx)
+        d3 = 0.5 * (q0 * gz + q1 * gy - q2 * gx)
+        
+        # Gradient descent step toward the measured gravity direction
+        norm = math.sqrt(ax * ax + ay * ay + az * az)
+        if norm and abs(norm - 1.0) < ORIENTATION_ACCEL_GATE:
+            ax /= norm
+            ay /= norm
+            az /= norm
+            s0 = 4 * q0 * q2 * q2 + 2 * q2 * ax + 4 * q0 * q1 * q1 - 2 * q1 * ay
+            s1 = (4 * q1 * q3 * q3 - 2 * q3 * ax + 4 * q0 * q0 * q1 - 2 * q0 * ay - 4 * q1
+                  + 8 * q1 * q1 * q1 + 8 * q1 * q2 * q2 + 4 * q1 * az)
+            s2 = (4 * q0 * q0 * q2 + 2 * q0 * ax + 4 * q2 * q3 * q3 - 2 * q3 * ay - 4 * q2
+                  + 8 * q2 * q1 * q1 + 8 * q2 * q2 * q2 + 4 * q2 * az)
+            s3 = 4 * q1 * q1 * q3 - 2 * q1 * ax + 4 * q2 * q2 * q3 - 2 * q2 * ay
+            norm = math.sqrt(s0 * s0 + s1 * s1 + s2 * s2 + s3 * s3)
+            if norm:
+                beta = self.beta / norm
+                d0 -= beta * s0
+                d1 -= beta * s1
+                d2 -= beta * s2
+                d3 -= beta * s3
+        
+        q0 += d0 * dt
+        q1 += d1 * dt
+        q2 += d2 * dt
+        q3 += d3 * dt
+        norm = 1.0 / math.sqrt(q0 * q0 + q1 * q1 + q2 * q2 + q3 * q3)
+        q0 *= norm
+        q1 *= norm
+        q2 *= norm
+        q3 *= norm
+        self.q0, self.q1, self.q2, self.q3 = q0, q1, q2, q3
+        
+        # Split the rotation rate into turning about gravity and tilting against it
+        ux = 2 * (q1 * q3 - q0 * q2)
+        uy = 2 * (q0 * q1 + q2 * q3)
+        uz = q0 * q0 - q1 * q1 - q2 * q2 + q3 * q3
+        vertical = gx * ux + gy * uy + gz * uz
+        self.vertical_rate = vertical * 57.29577951308232
+        self.tilt_rate = math.sqrt(max(0.0, gx * gx + gy * gy + gz * gz - vertical * vertical)) * 57.29577951308232
+
+    def gravity(self) -> Tuple[float, float, float]:
+        """Unit "up" direction in sensor axes, as the accelerometer reads it at rest"""
+        q0, q1, q2, q3 = self.q0, self.q1, self.q2, self.q3
+        return (2 * (q1 * q3 - q0 * q2), 2 * (q0 * q1 + q2 * q3), q0 * q0 - q1 * q1 - q2 * q2 + q3 * q3)
+
+    def euler(self) -> Tuple[float, float, float]:
+        """Roll, pitch and yaw in degrees (rotations about sensor x, y and z)"""
+        q0, q1, q2, q3 = self.q0, self.q1, self.q2, self.q3
+        roll = math.atan2(2 * (q0 * q1 + q2 * q3), 1 - 2 * (q1 * q1 + q2 * q2))
+        pitch = math.asin(max(-1.0, min(1.0, 2 * (q0 * q2 - q3 * q1))))
+        yaw = math.atan2(2 * (q0 * q3 + q1 * q2), 1 - 2 * (q2 * q2 + q3 * q3))
+        return math.degrees(roll), math.degrees(pitch), math.degrees(yaw)
+
+    def as_dict(self) -> Dict[str, Any]:
+        roll, pitch, yaw = self.euler()
+        gx, gy, gz = self.gravity()
+        return {
+            "ready": self.updates > 0,
+            "quaternion": [round(self.q0, 5), round(self.q1, 5), round(self.q2, 5), round(self.q3, 5)],
+            "gravity": [round(gx, 4), round(gy, 4), round(gz, 4)],
+            # Angle of the horizon in the x/y (screen) plane, 0 when the accelerometer reads gravity along -y
+            "horizon": round(math.degrees(math.atan2(gx, -gy)), 2),
+            "roll": round(roll, 2),
+            "pitch": round(pitch, 2),
+            "yaw": round(yaw, 2),
+            "vertical_rate": round(self.vertical_rate, 2),
+            "tilt_rate": round(self.tilt_rate, 2)
+        }
+
+class RollupTier:
+    """Fixed-size ring of aggregate buckets at one time resolution
+
+    Each bucket holds len(FIELDS) doubles: sample count, gyro min/max/sum/sum of
+    squares, the same for accel, then samples classified at each motion level.
+    Buckets merge exactly, so coarser tiers are built from finer ones.
+    """
+
+    FIELDS = ("count", "gyro_min", "gyro_max", "gyro_sum", "gyro_sq_sum",
+              "accel_min", "accel_max", "accel_sum", "accel_sq_sum") + MOTION_LEVELS
+
+    def __init__(self, name: str, width_seconds: int, capacity: int):
+        self.name = name
+        self.width_us = width_seconds * 1_000_000
+        self.capacity = capacity
+        self.reset()
+
+    def reset(self):
+        width = len(self.FIELDS)
+        self.starts = array('q', bytes(8 * self.capacity))  # Bucket start (microseconds)
+        self.buckets = array('d', bytes(8 * width * self.capacity))
+        self._head = 0
+        self._count = 0
+        self.open_start = None
+        self.open = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def merge(self, start_us: int, bucket: list):
+        """Fold a finer bucket into this tier, closing the open bucket when time moves on"""
+        start = start_us - start_us % self.width_us
+        if self.open is not None and start > self.open_start:
+            self._store()
+        if self.open is None:
+            self.open_start = start
+            self.open = list(bucket)
+            return
+        # A bucket from the past (clock stepped back) is folded into the open one
+        merge_buckets(self.open, bucket)
+
+    def _store(self):
+        width = len(self.FIELDS)
+        i = self._head
+        self.starts[i] = self.open_start
+        self.buckets[i * width:(i + 1) * width] = array('d', self.open)
+        self._head = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+        self.open = None
+
+    def rows(self, since_us: int = 0, include_open: bool = True) -> list:
+        """(start, bucket) pairs in time order, oldest first"""
+        width = len(self.FIELDS)
+        oldest = (self._head - self._count) % self.capacity
+        rows = []
+        for k in range(self._count):
+            i = (oldest + k) % self.capacity
+            if self.starts[i] >= since_us:
+                rows.append((self.starts[i], self.buckets[i * width:(i + 1) * width].tolist()))
+        if include_open and self.open is not None and self.open_start >= since_us:
+            rows.append((self.open_start, list(self.open)))
+        return rows
+
+def merge_buckets(target: list, bucket: list):
+    """Fold one rollup bucket into another in place"""
+    if not bucket[0]:
+        target[9:] = [a + b for a, b in zip(target[9:], bucket[9:])]
+        return
+    if not target[0]:
+        target[:9] = bucket[:9]
+        target[9:] = [a + b for a, b in zip(target[9:], bucket[9:])]
+        return
+    target[0] += bucket[0]
+    target[1] = min(target[1], bucket[1])
+    target[2] = max(target[2], bucket[2])
+    target[3] += bucket[3]
+    target[4] += bucket[4]
+    target[5] = min(target[5], bucket[5])
+    target[6] = max(target[6], bucket[6])
+    target[7] += bucket[7]
+    target[8] += bucket[8]
+    for k in range(9, len(target)):
+        target[k] += bucket[k]
+
+class MotionRollups:
+    """Incremental 1 s / 10 s / 1 min summaries of a whole session in constant memory
+
+    Samples accumulate into the current second with a handful of scalar updates.
+    When the second changes it is merged into every tier, so the per-sample cost
+    does not depend on the number of tiers.
+    """
+
+    def __init__(self, tiers: tuple = ROLLUP_TIERS):
+        self.tiers = {name: RollupTier(name, width, capacity) for name, width, capacity in tiers}
+        self.reset()
+
+    def reset(self):
+        for tier in self.tiers.values():
+            tier.reset()
+        self._second = None
+        self._bucket = None
+        self.samples = 0
+        self.level_samples = dict.fromkeys(MOTION_LEVELS, 0)
+        self.clock_resets = 0
+
+    def add(self, timestamp: int, gyro: float, accel: float):
+        """Add one sample (timestamp in microseconds)"""
+        second = timestamp // 1_000_000
+        bucket = self._bucket
+        if bucket is not None and second < self._second:
+            # The sensor clock went backwards (service restart); buckets on the old
+            # timeline cannot be ordered against new ones, so the tiers start over
+            for tier in self.tiers.values():
+                tier.reset()
+            self._bucket = bucket = None
+            self.clock_resets += 1
+        if bucket is None or second > self._second:
+            if bucket is not None:
+                self._close()
+            self._second = second
+            self._bucket = [1, gyro, gyro, gyro, gyro * gyro, accel, accel, accel, accel * accel, 0, 0, 0, 0]
+        else:
+            bucket[0] += 1
+            if gyro < bucket[1]:
+                bucket[1] = gyro
+            elif gyro > bucket[2]:
+                bucket[2] = gyro
+            bucket[3] += gyro
+            bucket[4] += gyro * gyro
+            if accel < bucket[5]:
+                bucket[5] = accel
+            elif accel > bucket[6]:
+                bucket[6] = accel
+            bucket[7] += accel
+            bucket[8] += accel * accel
+        self.samples += 1
+
+    def add_level(self, level: str, samples: int):
+        """Count samples the analysis classified at a motion level"""
+        self.level_samples[level] += samples
+        if self._bucket is not None:
+            self._bucket[9 + MOTION_LEVELS.index(level)] += samples
+
+    def _close(self):
+        start = self._second * 1_000_000
+        for tier in self.tiers.values():
+            tier.merge(start, self._bucket)
+
+    def query(self, tier: str, since_us: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Buckets of one tier as parallel arrays, including the second in progress"""
+        rollup = self.tiers[tier]
+        rows = rollup.rows(since_us)
+        # The current second has not been merged into the tiers yet
+        if self._bucket is not None and self._second * 1_000_000 >= since_us:
+            start = self._second * 1_000_000
+            start -= start % rollup.width_us
+            if rows and rows[-1][0] == start:
+                merge_buckets(rows[-1][1], self._bucket)
+            else:
+                rows.append((start, list(self._bucket)))
+        if limit:
+            rows = rows[-limit:]
+        
+        result = {
+            "tier": tier,
+            "width_s": rollup.width_us // 1_000_000,
+            "capacity": rollup.capacity,
+            "start": [start / 1_000_000 for start, _ in rows],
+            "count": [int(bucket[0]) for _, bucket in rows]
+        }
+        for offset, name in ((1, "gyro"), (5, "accel")):
+            result[f"{name}_min"] = [round(bucket[offset], 4) for _, bucket in rows]
+            result[f"{name}_max"] = [round(bucket[offset + 1], 4) for _, bucket in rows]
+            result[f"{name}_mean"] = [
+                round(bucket[offset + 2] / bucket[0], 4) if bucket[0] else 0.0 for _, bucket in rows
+            ]
+            result[f"{name}_rms"] = [
+                round(math.sqrt(bucket[offset + 3] / bucket[0]), 4) if bucket[0] else 0.0 for _, bucket in rows
+            ]
+        result["levels"] = {
+            level: [int(bucket[9 + k]) for _, bucket in rows] for k, level in enumerate(MOTION_LEVELS)
+        }
+        return result
+
+def classify_motion(stats: Dict[str, Any], sway: "SwayAnalyzer", threshold: Dict[str, float]) -> Dict[str, Any]:
+    """Motion event for window stats and sway against one sensitivity level's thresholds"""
+    gyro_magnitude = stats['gyro']['rms']
+    accel_magnitude = stats['accel']['rms']
+    
+    motion_event = {
+        'gyro': gyro_magnitude,
+        'accel': accel_magnitude,
+        'gyro_peak': stats['gyro']['peak'],
+        'accel_peak': stats['accel']['peak'],
+        'level': 'none'
+    }
+    
+    # Determine motion intensity from window RMS
+    if gyro_magnitude > threshold['gyro'] * 2 or accel_magnitude > threshold['accel'] * 1.5:
+        motion_event['level'] = 'severe'
+    elif gyro_magnitude > threshold['gyro'] or accel_magnitude > threshold['accel']:
+        motion_event['level'] = 'moderate'
+    elif gyro_magnitude > threshold['gyro'] * 0.5 or accel_magnitude > threshold['accel'] * 0.7:
+        motion_event['level'] = 'mild'
+    
+    # Slow sway can be nauseating below the magnitude thresholds; it raises the level
+    if sway.ready:
+        motion_event['sway'] = sway.band_rms
+        motion_event['sway_frequency'] = sway.peak_frequency
+        if sway.band_rms > threshold['sway'] * 2:
+            sway_level = 'severe'
+        elif sway.band_rms > threshold['sway']:
+            sway_level = 'moderate'
+        elif sway.band_rms > threshold['sway'] * 0.5:
+            sway_level = 'mild'
+        else:
+            sway_level = 'none'
+        if MOTION_LEVELS.index(sway_level) > MOTION_LEVELS.index(motion_event['level']):
+            motion_event['level'] = sway_level
+    
+    return motion_event
+
+class P2Quantile:
+    """Streaming estimate of one quantile in O(1) memory (the P\u00b2 algorithm, Jain & Chlamtac 1985)
+
+    Five markers track the minimum, the quantile, the maximum and the two
+    midpoints between them. Each observation moves marker positions, and
+    heights are corrected with a piecewise-parabolic fit.
+    """
+
+    __slots__ = ("p", "count", "_heights", "_positions", "_desired", "_increments")
+
+    def __init__(self, p: float):
+        self.p = p
+        self.count = 0
+        self._heights = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x: float):
+        heights = self._heights
+        self.count += 1
+        if self.count <= 5:
+            heights.append(x)
+            if self.count == 5:
+                heights.sort()
+            return
+        
+        positions = self._positions
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= heights[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        desired = self._desired
+        for i in range(5):
+            desired[i] += self._increments[i]
+        
+        for i in (1, 2, 3):
+            d = desired[i] - positions[i]
+            if (d >= 1 and positions[i + 1] - positions[i] > 1) or (d <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if d > 0 else -1
+                n_prev, n_i, n_next = positions[i - 1], positions[i], positions[i + 1]
+                q_prev, q_i, q_next = heights[i - 1], heights[i], heights[i + 1]
+                parabolic = q_i + step / (n_next - n_prev) * (
+                    (n_i - n_prev + step) * (q_next - q_i) / (n_next - n_i)
+                    + (n_next - n_i - step) * (q_i - q_prev) / (n_i - n_prev)
+                )
+                if q_prev < parabolic < q_next:
+                    heights[i] = parabolic
+                else:
+                    neighbour = i + step
+                    heights[i] = q_i + step * (heights[neighbour] - q_i) / (positions[neighbour] - n_i)
+                positions[i] += step
+
+    @property
+    def value(self) -> Optional[float]:
+        if not self.count:
+            return None
+        if self.count < 5:
+            ordered = sorted(self._heights)
+            return ordered[min(len(ordered) - 1, int(len(ordered) * self.p))]
+        return self._heights[2]
+
+    def state(self) -> list:
+        return [self.p, self.count, self._heights, self._positions, self._desired]
+
+    @classmethod
+    def from_state(cls, state: list) -> "P2Quantile":
+        estimator = cls(state[0])
+        estimator.count = state[1]
+        estimator._heights = list(state[2])
+        estimator._positions = list(state[3])
+        estimator._desired = list(state[4])
+        return estimator
+
+class MotionCalibrator:
+    """Per-device thresholds from streaming quantiles of the user's own baseline
+
+    Observations are the window RMS of gyro and accel magnitude and the sway
+    band RMS, taken at most CALIBRATION_RATE times per second. During
+    calibration each one feeds a P2Quantile per signal and sensitivity level.
+    A level's baseline quantile becomes the point where classify_motion starts
+    reporting mild. Afterwards, observations below a level's moderate boundary
+    keep refining it, so sustained real motion does not become the new
+    baseline. Refreshed thresholds stay within CALIBRATION_MAX_DRIFT of the
+    calibration result.
+    """
+
+    SIGNALS = ("gyro", "accel", "sway")
+
+    def __init__(self, fixed: Dict[int, Dict[str, float]]):
+        self.fixed = fixed  # The fixed table; time windows and missing signals come from it
+        self.phase = "uncalibrated"  # uncalibrated, calibrating, calibrated
+        self.duration = CALIBRATION_SECONDS
+        self.elapsed = 0.0  # Seconds of motion data seen, excluding gaps
+        self.observations = 0
+        self.thresholds = {}  # Sensitivity level -> threshold dict
+        self.baseline = {}  # Thresholds at the end of calibration
+        self.calibrated_at = None
+        self._estimators = {}
+        self._last_timestamp = None
+        self._next_observation = 0.0
+        self._next_refresh = 0.0
+
+    @property
+    def calibrating(self) -> bool:
+        return self.phase == "calibrating"
+
+    def start(self, seconds: float = CALIBRATION_SECONDS):
+        self.phase = "calibrating"
+        self.duration = seconds
+        self.elapsed = 0.0
+        self.observations = 0
+        self._estimators = {
+            level: {signal: P2Quantile(quantile) for signal in self.SIGNALS}
+            for level, quantile in CALIBRATION_PERCENTILES.items()
+        }
+        self._last_timestamp = None
+        self._next_observation = 0.0
+
+    def observe(self, timestamp: float, gyro: float, accel: float, sway: Optional[float]) -> bool:
+        """Feed one observation (timestamp in seconds); True when the thresholds changed"""
+        if self.phase == "uncalibrated":
+            return False
+        last = self._last_timestamp
+        self._last_timestamp = timestamp
+        if last is not None:
+            if timestamp > last:
+                # Gaps, such as a service restart, do not count as baseline time
+                self.elapsed += min(timestamp - last, 1.0)
+            else:
+                self._next_observation = timestamp
+        if timestamp < self._next_observation:
+            return False
+        self._next_observation = timestamp + 1.0 / CALIBRATION_RATE
+        self.observations += 1
+        
+        calibrating = self.phase == "calibrating"
+        values = {"gyro": gyro, "accel": accel, "sway": sway}
+        for level, estimators in self._estimators.items():
+            # Refinement only learns from motion below the moderate boundary
+            limit = None if calibrating else self.thresholds.get(level)
+            for signal, estimator in estimators.items():
+                value = values[signal]
+                if value is None or (limit is not None and value >= limit[signal]):
+                    continue
+                estimator.add(value)
+        
+        if calibrating:
+            if self.elapsed < self.duration:
+                return False
+            self.thresholds = self._compute()
+            self.baseline = self.thresholds
+            self.phase = "calibrated"
+            self.calibrated_at = time.time()
+            self._next_refresh = self.elapsed + CALIBRATION_REFRESH
+            return True
+        
+        if self.elapsed < self._next_refresh:
+            return False
+        self._next_refresh = self.elapsed + CALIBRATION_REFRESH
+        thresholds = self._compute(self.baseline)
+        changed = thresholds != self.thresholds
+        self.thresholds = thresholds
+        return changed
+
+    def _compute(self, bounds: Optional[Dict[int, Dict[str, float]]] = None) -> Dict[int, Dict[str, float]]:
+        result = {}
+        for level, estimators in self._estimators.items():
+            threshold = dict(self.fixed[level])
+            for signal, estimator in estimators.items():
+                quantile = estimator.value
+                if quantile is None:
+                    continue
+                value = max(quantile, CALIBRATION_FLOORS[signal]) / CALIBRATION_MILD_FRACTION[signal]
+                if bounds:
+                    base = bounds[level][signal]
+                    value = min(max(value, base / CALIBRATION_MAX_DRIFT), base * CALIBRATION_MAX_DRIFT)
+                threshold[signal] = round(value, 4)
+            result[level] = threshold
+        return result
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "phase": self.phase,
+            "progress": round(min(self.elapsed / self.duration, 1.0), 3) if self.calibrating else None,
+            "seconds": round(self.elapsed, 1),
+            "observations": self.observations,
+            "calibrated_at": self.calibrated_at,
+            "thresholds": self.thresholds,
+            "baseline_quantiles": {
+                level: {signal: estimator.value for signal, estimator in estimators.items()}
+                for level, estimators in self._estimators.items()
+            }
+        }
+
+    def state(self) -> Dict[str, Any]:
+        """Persistable state; a calibration in progress is not saved"""
+        if self.phase != "calibrated":
+            return {}
+        return {
+            "calibrated_at": self.calibrated_at,
+            "thresholds": self.thresholds,
+            "baseline": self.baseline,
+            "estimators": {level: {signal: estimator.state() for signal, estimator in estimators.items()}
+                           for level, estimators in self._estimators.items()}
+        }
+
+    def load_state(self, state: Dict[str, Any]):
+        if not state.get("thresholds"):
+            return
+        # JSON object keys are strings
+        self.thresholds = {int(level): threshold for level, threshold in state["thresholds"].items()}
+        self.baseline = {int(level): threshold for level, threshold in state["baseline"].items()}
+        self._estimators = {
+            int(level): {signal: P2Quantile.from_state(estimator) for signal, estimator in estimators.items()}
+            for level, estimators in state["estimators"].items()
+        }
+        self.calibrated_at = state.get("calibrated_at")
+        self.phase = "calibrated"
+        self._next_refresh = CALIBRATION_REFRESH
+
+class TokenBucket:
+    """Allows `rate` events per second with bursts of up to `burst`"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = None
+
+    def take(self, now: float, borrow: bool = False) -> bool:
+        """Spend a token at time `now`; with borrow the bucket may go one token into debt"""
+        if self.updated is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= (0.0 if borrow else 1.0):
+            self.tokens -= 1.0
+            return True
+        return False
+
+class CueRateLimiter:
+    """Per cue type token buckets; a cue more severe than the last one delivered may preempt
+
+    Clock agnostic, so replay can run it in sensor time.
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[float, float]] = CUE_RATE_LIMITS):
+        self._buckets = {cue_type: TokenBucket(*limit) for cue_type, limit in limits.items()}
+        self._last_level = {}
+
+    def admit(self, level: str, cue_types: list, now: float) -> list:
+        """Cue types the event may be delivered on"""
+        severity = MOTION_LEVELS.index(level)
+        admitted = []
+        for cue_type in cue_types:
+            bucket = self._buckets.get(cue_type)
+            if bucket is None:
+                continue
+            escalation = severity > self._last_level.get(cue_type, 0)
+            if bucket.take(now, borrow=escalation):
+                self._last_level[cue_type] = severity
+                admitted.append(cue_type)
+        return admitted
+
+class CueDispatcher:
+    """Delivers motion cues from a background thread
+
+    `submit` only appends to a bounded deque, so the receive path never waits
+    on haptics, audio or logging. The dispatcher wakes at most every
+    CUE_DISPATCH_INTERVAL seconds, merges everything queued into its most
+    severe event, rate limits it per cue type and hands it to `deliver`.
+    """
+
+    def __init__(self, deliver, size: int = CUE_QUEUE_SIZE):
+        self._deliver = deliver  # deliver(motion_event, cue_types)
+        self.size = size
+        self.limiter = CueRateLimiter()
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._running = False
+        self.reset()
+
+    def reset(self):
+        self.submitted = 0
+        self.coalesced = 0
+        self.delivered = 0
+        self.limited = 0
+        self.errors = 0
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._dispatch, name="motion-cues", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        self._running = False
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, motion_event: Dict[str, Any], cue_types: list):
+        """Queue a cue; a full queue folds it into the newest entry instead of blocking"""
+        with self._lock:
+            self.submitted += 1
+            queue = self._queue
+            if len(queue) >= self.size:
+                self.coalesced += 1
+                if MOTION_LEVELS.index(motion_event['level']) >= MOTION_LEVELS.index(queue[-1][0]['level']):
+                    queue[-1] = (motion_event, cue_types)
+                return
+            queue.append((motion_event, cue_types))
+            if len(queue) > 1:
+                # The dispatcher was already woken for the first entry
+                return
+        self._wake.set()
+
+    def _take_burst(self) -> Optional[Tuple[Dict[str, Any], list]]:
+        """Everything queued, merged into the most severe (then newest) event"""
+        with self._lock:
+            queue = self._queue
+            if not queue:
+                return None
+            self.coalesced += len(queue) - 1
+            merged = queue.popleft()
+            while queue:
+                entry = queue.popleft()
+                if MOTION_LEVELS.index(entry[0]['level']) >= MOTION_LEVELS.index(merged[0]['level']):
+                    merged = entry
+            return merged
+
+    def _dispatch(self):
+        while self._running:
+            self._wake.wait()
+            self._wake.clear()
+            burst = self._take_burst()
+            if burst is None:
+                continue
+            motion_event, cue_types = burst
+            admitted = self.limiter.admit(motion_event['level'], cue_types, time.monotonic())
+            if admitted:
+                try:
+                    self._deliver(motion_event, admitted)
+                    self.delivered += 1
+                except Exception as e:
+                    self.errors += 1
+                    decky.logger.error(f"Motion cue error: {str(e)}")
+            else:
+                self.limited += 1
+            # Let the next burst gather so it can be merged
+            time.sleep(CUE_DISPATCH_INTERVAL)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "running": self._running,
+            "queued": len(self._queue),
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "delivered": self.delivered,
+            "limited": self.limited,
+            "errors": self.errors
+        }
+
+class MotionRecorder:
+    """Appends motion samples to a recording file from a background writer thread
+
+    The receive path packs each batch into fixed-size records and queues the
+    bytes; file I/O happens on the writer thread, which wakes every
+    RECORDING_FLUSH_INTERVAL seconds. If the disk falls behind, new samples are
+    dropped and counted rather than blocking. If the writer fails, the error is
+    kept and further samples are refused so the owner can end the recording.
+    Samples are refused the same way once the recording reaches `max_seconds`
+    or `max_bytes`; `limit` then names the limit that ended it.
+    """
+
+    def __init__(self, path: str, chunk_records: int = RECORDING_CHUNK_RECORDS,
+                 max_seconds: float = RECORDING_MAX_SECONDS, max_bytes: int = RECORDING_MAX_BYTES):
+        self.path = path
+        self.chunk_records = chunk_records
+        self.max_seconds = max_seconds
+        self.max_bytes = max_bytes
+        self.records = 0
+        self.dropped = 0
+        self.bytes_written = 0
+        self.started = None
+        self.error = None
+        self.limit = None  # "max_seconds" or "max_bytes" once reached
+        self._pending = deque()
+        # Each counter has a single writer thread, so their difference is the queued size
+        self._queued_bytes = 0
+        self._flushed_bytes = 0
+        self._file = None
+        self._thread = None
+        self._running = False
+        self._wake = threading.Event()
+        # Current chunk: record count and time range for its index block
+        self._chunk_count = 0
+        self._chunk_first = 0
+        self._chunk_start_ts = 0
+        self._chunk_last_ts = 0
+
+    def start(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, "wb")
+        self.bytes_written = self._file.write(RECORDING_HEADER.pack(
+            RECORDING_MAGIC, RECORDING_VERSION, RECORDING_HEADER.size, RECORDING_RECORD.size,
+            RECORDING_INDEX.size, self.chunk_records, int(time.time() * 1_000_000)
+        ))
+        self.started = time.time()
+        self._running = True
+        self._thread = threading.Thread(target=self._writer, name="motion-recorder", daemon=True)
+        self._thread.start()
+
+    @property
+    def failed(self) -> bool:
+        """True once the writer thread has stopped without being asked to"""
+        thread = self._thread
+        return self.error is not None or (self._running and thread is not None and not thread.is_alive())
+
+    def append(self, samples: list) -> bool:
+        """Pack and queue decoded samples; safe to call from the receive thread
+
+        Returns False if the writer has failed or a limit was reached, and the
+        recording should be stopped.
+        """
+        if self.error is not None or self.limit is not None:
+            return False
+        if time.time() - self.started >= self.max_seconds:
+            self.limit = "max_seconds"
+            return False
+        if RECORDING_HEADER.size + self._queued_bytes + len(samples) * RECORDING_RECORD.size > self.max_bytes:
+            self.limit = "max_bytes"
+            return False
+        if self._queued_bytes - self._flushed_bytes >= RECORDING_MAX_PENDING_BYTES:
+            self.dropped += len(samples)
+            return not self.failed
+        pack = RECORDING_RECORD.pack
+        packed = []
+        for motion_data in samples:
+            accel = motion_data.get('accel', {})
+            gyro = motion_data.get('gyro', {})
+            packed.append(pack(
+                motion_data.get('timestamp', 0), motion_data.get('frameId', 0) & 0xFFFFFFFF,
+                accel.get('x', 0.0), accel.get('y', 0.0), accel.get('z', 0.0),
+                gyro.get('pitch', 0.0), gyro.get('yaw', 0.0), gyro.get('roll', 0.0)
+            ))
+        records = b"".join(packed)
+        self._queued_bytes += len(records)
+        self._pending.append(records)
+        return True
+
+    def stop(self):
+        """Write everything queued, close the last chunk and the file"""
+        self._running = False
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _writer(self):
+        try:
+            while self._running:
+                self._wake.wait(RECORDING_FLUSH_INTERVAL)
+                self._wake.clear()
+                self._flush()
+            self._flush()
+            if self._chunk_count:
+                self.bytes_written += self._file.write(self._index_block())
+        except Exception as e:
+            self.error = str(e)
+            decky.logger.error(f"Recording write error: {str(e)}")
+        finally:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._pending.clear()
+
+    def _index_block(self) -> bytes:
+        block = RECORDING_INDEX.pack(RECORDING_INDEX_MAGIC, self._chunk_count, self._chunk_first,
+                                     self._chunk_start_ts, self._chunk_last_ts)
+        self._chunk_first += self._chunk_count
+        self._chunk_count = 0
+        return block
+
+    def _flush(self):
+        pending = self._pending
+        if not pending:
+            return
+        buffer = bytearray()
+        size = RECORDING_RECORD.size
+        timestamp_at = RECORDING_TIMESTAMP.unpack_from
+        chunk_records = self.chunk_records
+        written = 0
+        while pending:
+            records = pending.popleft()
+            self._flushed_bytes += len(records)
+            count = len(records) // size
+            offset = 0
+            # Copy whole runs of records up to the next chunk boundary
+            while offset < count:
+                take = min(count - offset, chunk_records - self._chunk_count)
+                if not self._chunk_count:
+                    self._chunk_start_ts = timestamp_at(records, offset * size)[0]
+                self._chunk_last_ts = timestamp_at(records, (offset + take - 1) * size)[0]
+                buffer += records[offset * size:(offset + take) * size]
+                self._chunk_count += take
+                offset += take
+                if self._chunk_count == chunk_records:
+                    buffer += self._index_block()
+            written += count
+        self.bytes_written += self._file.write(buffer)
+        self._file.flush()
+        self.records += written
+
+    def as_dict(self) -> Dict[str, Any]:
+        pending_bytes = max(0, self._queued_bytes - self._flushed_bytes)
+        return {
+            "file": os.path.basename(self.path),
+            "records": self.records,
+            "pending": pending_bytes // RECORDING_RECORD.size,
+            "pending_bytes": pending_bytes,
+            "dropped": self.dropped,
+            "bytes": self.bytes_written,
+            "seconds": round(time.time() - self.started, 1) if self.started else 0.0,
+            "limit": self.limit,
+            "error": self.error
+        }
+
+class MotionRecording:
+    """Read-only, memory-mapped view of a recording file
+
+    Chunks are located arithmetically and described by their index blocks. A
+    recording cut short (no final index block) is still readable up to its
+    last complete record.
+    """
+
+    def __init__(self, path: str):
+        import mmap
+        
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Empty recording: {path}")
+        
+        try:
+            magic, version, header_size, record_size, index_size, chunk_records, created = \
+                RECORDING_HEADER.unpack_from(self._mm)
+        except struct.error:
+            self.close()
+            raise ValueError(f"Truncated recording header: {path}")
+        if magic != RECORDING_MAGIC or version != RECORDING_VERSION or record_size != RECORDING_RECORD.size:
+            self.close()
+            raise ValueError(f"Unsupported recording {path} (version {version}, {record_size}-byte records)")
+        self.created = created / 1_000_000
+        self.chunk_records = chunk_records
+        
+        # (offset, records, first timestamp, last timestamp) per chunk
+        self.chunks = []
+        chunk_size = chunk_records * record_size + index_size
+        offset = header_size
+        size = len(self._mm)
+        while offset < size:
+            remaining = size - offset
+            if remaining >= chunk_size:
+                _, count, _, first_ts, last_ts = RECORDING_INDEX.unpack_from(self._mm, offset + chunk_records * record_size)
+            else:
+                # Last chunk: closed recordings end it with an index block, interrupted ones do not
+                index_at = size - index_size
+                count = (remaining - index_size) // record_size if remaining >= index_size else 0
+                closed = (
+                    count * record_size + index_size == remaining
+                    and self._mm[index_at:index_at + 4] == RECORDING_INDEX_MAGIC
+                )
+                if closed:
+                    _, count, _, first_ts, last_ts = RECORDING_INDEX.unpack_from(self._mm, index_at)
+                else:
+                    count = remaining // record_size
+                    if not count:
+                        break
+                    first_ts = RECORDING_RECORD.unpack_from(self._mm, offset)[0]
+                    last_ts = RECORDING_RECORD.unpack_from(self._mm, offset + (count - 1) * record_size)[0]
+            self.chunks.append((offset, count, first_ts, last_ts))
+            offset += chunk_size
+        self.records = sum(chunk[1] for chunk in self.chunks)
+
+    def __len__(self) -> int:
+        return self.records
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    @property
+    def duration(self) -> float:
+        """Seconds of sensor time covered"""
+        if not self.chunks:
+            return 0.0
+        return (self.chunks[-1][3] - self.chunks[0][2]) / 1_000_000
+
+    def iter_records(self, start_ts: int = 0):
+        """Yield (timestamp, frameId, ax, ay, az, pitch, yaw, roll) from `start_ts` on"""
+        record_size = RECORDING_RECORD.size
+        iter_unpack = RECORDING_RECORD.iter_unpack
+        # Chunks are unpacked in place through views of the map; finish or close
+        # the iterator before closing the recording
+        with memoryview(self._mm) as view:
+            for offset, count, first_ts, last_ts in self.chunks:
+                if last_ts < start_ts:
+                    continue
+                with view[offset:offset + count * record_size] as chunk:
+                    if first_ts >= start_ts:
+                        yield from iter_unpack(chunk)
+                        continue
+                    for record in iter_unpack(chunk):
+                        if record[0] >= start_ts:
+                            yield record
+
+class StreamHealth:
+    """Live health of the sdmotion stream, updated as batches are processed
+
+    Rings of recent packet inter-arrival times and sensor-to-receive lags give
+    percentiles on demand. Sequence numbers (frameId) and sensor timestamps
+    reveal dropped samples.
+    """
+
+    RING_SIZE = 1024
+    GAP_FACTOR = 2.5  # A sensor interval this many times the median counts as a gap
+    MAX_CLOCK_SKEW_US = 3600 * 1_000_000  # Larger lags mean the sensor clock is not wall time
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._arrivals = array('d', bytes(8 * self.RING_SIZE))  # Monotonic receive times
+        self._lags = array('d', bytes(8 * self.RING_SIZE))  # Receive wall time - sensor time (us)
+        self._sensor_intervals = array('d', bytes(8 * self.RING_SIZE))
+        self._arrival_head = 0
+        self._arrival_count = 0
+        self._lag_head = 0
+        self._lag_count = 0
+        self._interval_head = 0
+        self._interval_count = 0
+        self._median_interval = 0.0
+        self._last_sequence = None
+        self._last_timestamp = None
+        self.samples = 0
+        self.packets = 0
+        self.dropped = 0  # Missing sequence numbers
+        self.gaps = 0  # Sensor timestamp jumps, for streams without sequence numbers
+        self.gap_samples = 0  # Estimated samples lost in those jumps
+        self.sequence_resets = 0
+        self.clock_synchronized = True
+
+    def record(self, samples: list, receive_wall: float, receive_mono: float):
+        """Record one processed batch"""
+        ring = self.RING_SIZE
+        self.packets += 1
+        self.samples += len(samples)
+        self._arrivals[self._arrival_head] = receive_mono
+        self._arrival_head = (self._arrival_head + 1) % ring
+        if self._arrival_count < ring:
+            self._arrival_count += 1
+        
+        receive_us = receive_wall * 1_000_000
+        for motion_data in samples:
+            timestamp = motion_data.get('timestamp', 0)
+            sequence = motion_data.get('frameId')
+            
+            if sequence is not None:
+                last = self._last_sequence
+                if last is not None:
+                    if sequence > last + 1:
+                        self.dropped += sequence - last - 1
+                    elif sequence <= last:
+                        self.sequence_resets += 1
+                self._last_sequence = sequence
+            
+            last = self._last_timestamp
+            if last is not None and timestamp > last:
+                interval = timestamp - last
+                median = self._median_interval
+                if sequence is None and median and interval > median * self.GAP_FACTOR:
+                    self.gaps += 1
+                    self.gap_samples += round(interval / median) - 1
+                else:
+                    self._sensor_intervals[self._interval_head] = interval
+                    self._interval_head = (self._interval_head + 1) % ring
+                    if self._interval_count < ring:
+                        self._interval_count += 1
+                    if self._interval_head % 64 == 0 or not median:
+                        self._median_interval = self._percentile(self._sensor_intervals, self._interval_count, 50)
+            self._last_timestamp = timestamp
+            
+            lag = receive_us - timestamp
+            self.clock_synchronized = abs(lag) < self.MAX_CLOCK_SKEW_US
+            self._lags[self._lag_head] = lag
+            self._lag_head = (self._lag_head + 1) % ring
+            if self._lag_count < ring:
+                self._lag_count += 1
+
+    @staticmethod
+    def _percentile(values: array, count: int, pct: float) -> float:
+        if not count:
+            return 0.0
+        ordered = sorted(values[:count])
+        return ordered[min(count - 1, int(count * pct / 100))]
+
+    @property
+    def last_arrival(self) -> Optional[float]:
+        """Monotonic time of the last batch (the clock is shared with other processes)"""
+        if not self._arrival_count:
+            return None
+        return self._arrivals[self._arrival_head - 1]
+
+    def _ordered_arrivals(self) -> list:
+        head, count = self._arrival_head, self._arrival_count
+        if count < self.RING_SIZE:
+            return self._arrivals[:count].tolist()
+        return self._arrivals[head:].tolist() + self._arrivals[:head].tolist()
+
+    def as_dict(self, now_mono: float) -> Dict[str, Any]:
+        arrivals = self._ordered_arrivals()
+        intervals = [(b - a) * 1000 for a, b in zip(arrivals, arrivals[1:])]
+        intervals.sort()
+        
+        def pick(pct: float) -> Optional[float]:
+            if not intervals:
+                return None
+            return round(intervals[min(len(intervals) - 1, int(len(intervals) * pct / 100))], 3)
+        
+        packet_rate = None
+        if len(arrivals) >= 2 and arrivals[-1] > arrivals[0]:
+            packet_rate = round((len(arrivals) - 1) / (arrivals[-1] - arrivals[0]), 2)
+        sample_rate = round(1_000_000 / self._median_interval, 2) if self._median_interval else None
+        
+        lag_p50 = lag_p99 = None
+        if self._lag_count and self.clock_synchronized:
+            lag_p50 = round(self._percentile(self._lags, self._lag_count, 50) / 1000, 3)
+            lag_p99 = round(self._percentile(self._lags, self._lag_count, 99) / 1000, 3)
+        
+        return {
+            "samples": self.samples,
+            "packets": self.packets,
+            "sample_rate_hz": sample_rate,
+            "packet_rate_hz": packet_rate,
+            "interarrival_ms": {"p50": pick(50), "p90": pick(90), "p99": pick(99), "max": round(intervals[-1], 3) if intervals else None},
+            "jitter_ms": round(pick(99) - pick(50), 3) if intervals else None,
+            "dropped": self.dropped,
+            "gaps": self.gaps,
+            "gap_samples": self.gap_samples,
+            "sequence_resets": self.sequence_resets,
+            "clock_synchronized": self.clock_synchronized,
+            "lag_ms": {"p50": lag_p50, "p99": lag_p99},
+            "last_packet_age_s": round(now_mono - arrivals[-1], 3) if arrivals else None
+        }
+
+class BatchStats:
+    """Counts how many datagrams each receive batch coalesced"""
+
+    # Histogram bucket upper bounds (packets per batch)
+    BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, DRAIN_MAX_PACKETS)
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.batches = 0
+        self.packets = 0
+        self.max_packets = 0
+        self.last_packets = 0
+        self.histogram = [0] * len(self.BUCKETS)
+
+    def record(self, packets: int):
+        self.batches += 1
+        self.packets += packets
+        self.last_packets = packets
+        if packets > self.max_packets:
+            self.max_packets = packets
+        for i, bound in enumerate(self.BUCKETS):
+            if packets <= bound:
+                self.histogram[i] += 1
+                break
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "packets": self.packets,
+            "mean_packets": round(self.packets / self.batches, 2) if self.batches else 0,
+            "max_packets": self.max_packets,
+            "last_packets": self.last_packets,
+            "histogram": {f"<={bound}": count for bound, count in zip(self.BUCKETS, self.histogram)}
+        }
+
+class LogPipeline:
+    """Moves decky.logger's I/O off the calling threads
+
+    install() hands the logger's handlers, including inherited ones, to a
+    QueueListener thread and leaves a QueueHandler in their place, so a log
+    call only formats the record and puts it on a bounded queue. When the
+    writer falls behind, new records are dropped and counted instead of
+    blocking. Records logged with extra={"rate_key": ...} are limited to
+    LOG_RATE_BURST per key every LOG_RATE_WINDOW seconds; the next one let
+    through says how many were suppressed. Callers check `debug` before
+    building debug messages, like PerfStats.enabled.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self.debug = False
+        self.dropped = 0
+        self.suppressed = {}  # Rate key -> records suppressed since install
+        self._windows = {}  # Rate key -> [window start, records let through, suppressed since the last one]
+        self._lock = threading.Lock()
+        self._queue = None
+        self._listener = None
+        self._saved = None  # Handlers and propagate flag to restore
+        self._level = logger.level  # Level to return to when debug is switched off
+
+    @property
+    def installed(self) -> bool:
+        return self._listener is not None
+
+    def install(self):
+        if self._listener is not None:
+            return
+        from logging.handlers import QueueHandler, QueueListener
+        import queue
+        
+        handlers = []
+        logger = self.logger
+        while logger is not None:
+            handlers.extend(logger.handlers)
+            if not logger.propagate:
+                break
+            logger = logger.parent
+        if not handlers:
+            # Nothing to move off the calling threads
+            return
+        
+        self._saved = (list(self.logger.handlers), self.logger.propagate)
+        self._queue = queue.SimpleQueue()
+        handler = QueueHandler(self._queue)
+        # Bounded by hand: SimpleQueue is lock-free on the put side, unlike a sized queue.Queue
+        handler.enqueue = self._enqueue
+        handler.addFilter(self._admit)
+        self._listener = QueueListener(self._queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+        self.logger.handlers = [handler]
+        self.logger.propagate = False
+
+    def restore(self):
+        """Put the original handlers back"""
+        if self._saved is None:
+            return
+        handlers, propagate = self._saved
+        self.logger.handlers = handlers
+        self.logger.propagate = propagate
+        self._saved = None
+
+    def uninstall(self):
+        """Restore the handlers and write out everything queued (blocks until the writer is done)"""
+        listener, self._listener = self._listener, None
+        self.restore()
+        if listener is not None:
+            listener.stop()
+
+    def set_debug(self, enabled: bool):
+        self.debug = enabled
+        self.logger.setLevel(logging.DEBUG if enabled else self._level)
+
+    def _enqueue(self, record: logging.LogRecord):
+        if self._queue.qsize() >= LOG_QUEUE_SIZE:
+            self.dropped += 1
+            return
+        self._queue.put_nowait(record)
+
+    def _admit(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "rate_key", None)
+        if key is None:
+            return True
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None:
+                window = self._windows[key] = [record.created, 0, 0]
+            elif record.created - window[0] >= LOG_RATE_WINDOW:
+                window[0] = record.created
+                window[1] = 0
+            if window[1] >= LOG_RATE_BURST:
+                window[2] += 1
+                self.suppressed[key] = self.suppressed.get(key, 0) + 1
+                return False
+            window[1] += 1
+            suppressed, window[2] = window[2], 0
+        if suppressed:
+            record.msg = f"{record.getMessage()} ({suppressed} similar messages suppressed)"
+            record.args = None
+        return True
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "async": self.installed,
+            "debug": self.debug,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "dropped": self.dropped,
+            "suppressed": dict(self.suppressed)
+        }
+
+class PerfStats:
+    """Per-stage timings of the receive hot path
+
+    Each stage keeps a fixed-bucket latency histogram. Callers check `enabled`
+    before reading the clock, so a disabled instance costs one attribute test
+    per stage. Counters are always maintained.
+    """
+
+    STAGES = ("receive", "decode", "history", "analyze", "cue", "log")
+    # Histogram bucket upper bounds (microseconds); the last bucket is unbounded
+    BUCKETS_US = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 50000)
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        self._bounds_ns = tuple(bound * 1000 for bound in self.BUCKETS_US)
+        self._histograms = {stage: array('Q', bytes(8 * (len(self.BUCKETS_US) + 1))) for stage in self.STAGES}
+        self._total_ns = dict.fromkeys(self.STAGES, 0)
+        self._max_ns = dict.fromkeys(self.STAGES, 0)
+        self.samples = 0
+        self.cues = 0
+        self.decode_errors = 0
+        self.timeouts = 0
+        self.started = time.monotonic()
+
+    def record(self, stage: str, elapsed_ns: int):
+        self._histograms[stage][bisect_left(self._bounds_ns, elapsed_ns)] += 1
+        self._total_ns[stage] += elapsed_ns
+        if elapsed_ns > self._max_ns[stage]:
+            self._max_ns[stage] = elapsed_ns
+
+    def _percentile_us(self, histogram: array, count: int, pct: float) -> Optional[float]:
+        """Upper bound of the bucket holding the percentile"""
+        if not count:
+            return None
+        target = count * pct / 100
+        seen = 0
+        for i, bucket in enumerate(histogram):
+            seen += bucket
+            if seen >= target:
+                return self.BUCKETS_US[i] if i < len(self.BUCKETS_US) else None
+        return None
+
+    def as_dict(self) -> Dict[str, Any]:
+        stages = {}
+        for stage in self.STAGES:
+            histogram = self._histograms[stage]
+            count = sum(histogram)
+            stages[stage] = {
+                "count": count,
+                "total_ms": round(self._total_ns[stage] / 1e6, 3),
+                "mean_us": round(self._total_ns[stage] / count / 1000, 2) if count else None,
+                "p50_us": self._percentile_us(histogram, count, 50),
+                "p99_us": self._percentile_us(histogram, count, 99),
+                "max_us": round(self._max_ns[stage] / 1000, 2),
+                "histogram": {
+                    **{f"<={bound}us": n for bound, n in zip(self.BUCKETS_US, histogram)},
+                    f">{self.BUCKETS_US[-1]}us": histogram[-1]
+                }
+            }
+        return {
+            "enabled": self.enabled,
+            "elapsed_s": round(time.monotonic() - self.started, 3),
+            "samples": self.samples,
+            "cues": self.cues,
+            "decode_errors": self.decode_errors,
+            "timeouts": self.timeouts,
+            "stages": stages
+        }
+
+def ring_samples(records: list) -> list:
+    """Sample dicts, with magnitudes, from motion ring records"""
+    sqrt = math.sqrt
+    samples = []
+    for record in records:
+        ax, ay, az, pitch, yaw, roll = record.values
+        samples.append({
+            "timestamp": record.timestamp,
+            "accel": {"x": ax, "y": ay, "z": az},
+            "gyro": {"pitch": pitch, "yaw": yaw, "roll": roll},
+            "magnitude": {"accel": sqrt(ax * ax + ay * ay + az * az),
+                          "gyro": sqrt(pitch * pitch + yaw * yaw + roll * roll)},
+            "frameId": record.frame_id
+        })
+    return samples
+
+class MotionWorker:
+    """Receive, decode and analysis loop for receive mode "process"
+
+    Runs in a child forked by the WorkerLauncher so JSON decoding,
+    classification and orientation fusion do not compete for the GIL with the
+    host process. Decoded samples go into a RingWriter the parent polls. Over
+    the pipe, the child sends the most severe motion event, per-level sample
+    counts, datagrams per receive batch and the current window, sway and
+    orientation stats at most every CUE_DISPATCH_INTERVAL, its StreamHealth
+    (measured at the socket) every WORKER_HEALTH_INTERVAL, plus stream state
+    changes, and calibration observations taken at most CALIBRATION_RATE
+    times per second. The parent sends ("config", threshold, analyze,
+    orientation) and ("stop", unregister).
+    """
+
+    def __init__(self, conn, service_addr: Tuple[str, int], prefer_binary: bool, ring_path: str,
+                 threshold: Dict[str, float], analyze: bool, orientation: bool):
+        self.conn = conn
+        self.service_addr = service_addr
+        self.prefer_binary = prefer_binary
+        self.ring = RingWriter(ring_path)
+        self.threshold = threshold
+        self.analyze = analyze
+        self.detector = WindowedMotionDetector(threshold['time_window'])
+        self.sway = SwayAnalyzer()
+        self.orientation = OrientationFilter() if orientation else None
+        self.health = StreamHealth()
+        self.wire_format = None
+        self.last_register = None
+        self.running = True
+        self.unregister = False
+        self._pending_event = None
+        self._level_counts = dict.fromkeys(MOTION_LEVELS, 0)
+        self._decode_errors = 0
+        self._batches = []
+        self._observations = []
+        self._next_observation = 0.0
+        self._next_report = 0.0
+        self._next_health = 0.0
+
+    def run(self):
+        sock = None
+        try:
+            self.ring.open()
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.bind(('', 0))
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, DRAIN_SOCKET_BUFFER)
+            sock.setblocking(False)
+            self.conn.send(("ready", self.ring.path, os.getpid()))
+            self._register(sock)
+            last_receive = time.monotonic()
+            while self.running:
+                # Wake up in time to send held results even if the stream stops
+                timeout = CUE_DISPATCH_INTERVAL if self._has_results() else REGISTER_INTERVAL
+                ready, _, _ = select.select([sock, self.conn], [], [], timeout)
+                if self.conn in ready:
+                    self._handle_messages()
+                if sock in ready:
+                    self._receive(sock)
+                    last_receive = time.monotonic()
+                elif time.monotonic() - last_receive >= REGISTER_INTERVAL:
+                    self.conn.send(("timeout",))
+                    self._register(sock)
+                    last_receive = time.monotonic()
+                self._report()
+        except (EOFError, BrokenPipeError):
+            # The parent went away
+            pass
+        finally:
+            if sock:
+                if self.unregister:
+                    try:
+                        sock.sendto(UNREGISTER_MESSAGE, self.service_addr)
+                    except OSError:
+                        pass
+                sock.close()
+            self.ring.close()
+
+    def _register(self, sock: socket.socket):
+        self.last_register = choose_register_payload(self.prefer_binary, self.wire_format, self.last_register)
+        try:
+            sock.sendto(self.last_register, self.service_addr)
+        except OSError:
+            pass
+
+    def _handle_messages(self):
+        while self.conn.poll():
+            message = self.conn.recv()
+            if message[0] == "config":
+                _, threshold, self.analyze, orientation = message
+                if threshold['time_window'] != self.threshold['time_window']:
+                    self.detector.resize(threshold['time_window'])
+                self.threshold = threshold
+                if not orientation:
+                    self.orientation = None
+                elif self.orientation is None:
+                    # Start again from the accelerometer rather than a stale quaternion
+                    self.orientation = OrientationFilter()
+            elif message[0] == "stop":
+                self.running = False
+                self.unregister = message[1]
+
+    def _receive(self, sock: socket.socket):
+        receive_wall, receive_mono = time.time(), time.monotonic()
+        packets = []
+        while len(packets) < DRAIN_MAX_PACKETS:
+            try:
+                packets.append(sock.recv(RECEIVE_BUFFER_SIZE))
+            except BlockingIOError:
+                break
+            except OSError:
+                # ICMP port unreachable while sdmotion restarts
+                break
+        samples = []
+        for data in packets:
+            try:
+                samples.extend(decode_motion_packet(data))
+            except ValueError:
+                self._decode_errors += 1
+        if not samples:
+            return
+        self._batches.append(len(packets))
+        self.health.record(samples, receive_wall, receive_mono)
+        
+        wire_format = "binary" if packets[-1][:4] == BINARY_MAGIC else "json"
+        if wire_format != self.wire_format:
+            self.wire_format = wire_format
+            self.conn.send(("stream", wire_format))
+        self.ring.write_samples(samples)
+        
+        orientation = self.orientation
+        if orientation is not None:
+            for motion_data in samples:
+                accel = motion_data.get('accel', {})
+                gyro = motion_data.get('gyro', {})
+                orientation.update(motion_data.get('timestamp', 0),
+                                   gyro.get('pitch', 0.0), gyro.get('yaw', 0.0), gyro.get('roll', 0.0),
+                                   accel.get('x', 0.0), accel.get('y', 0.0), accel.get('z', 0.0))
+        
+        if not self.analyze:
+            return
+        detector = self.detector
+        sway = self.sway
+        for motion_data in samples:
+            gyro = motion_data.get('gyro', {})
+            magnitude = motion_data.get('magnitude', {})
+            timestamp = motion_data.get('timestamp', 0)
+            detector.add(timestamp, magnitude.get('gyro', 0.0), magnitude.get('accel', 0.0))
+            sway.add(timestamp, gyro.get('pitch', 0.0), gyro.get('yaw', 0.0), gyro.get('roll', 0.0))
+        if detector.span_seconds < self.threshold['time_window'] / 2:
+            return
+        motion_event = classify_motion(detector.stats(), sway, self.threshold)
+        motion_event['timestamp'] = samples[-1].get('timestamp', 0) / 1_000_000
+        if motion_event['timestamp'] >= self._next_observation:
+            self._next_observation = motion_event['timestamp'] + 1.0 / CALIBRATION_RATE
+            self._observations.append((motion_event['timestamp'], motion_event['gyro'],
+                                       motion_event['accel'], motion_event.get('sway')))
+        level = motion_event['level']
+        self._level_counts[level] += len(samples)
+        pending = self._pending_event
+        if level != 'none' and (pending is None or
+                                MOTION_LEVELS.index(level) >= MOTION_LEVELS.index(pending['level'])):
+            self._pending_event = motion_event
+
+    def _has_results(self) -> bool:
+        return (self._pending_event is not None or self._decode_errors > 0 or bool(self._observations)
+                or bool(self._batches) or any(self._level_counts.values()))
+
+    def _report(self):
+        """Send the batched analysis results, at most every CUE_DISPATCH_INTERVAL"""
+        now = time.monotonic()
+        if now < self._next_report or not self._has_results():
+            return
+        counts = {level: n for level, n in self._level_counts.items() if n}
+        stats = {
+            "window": self.detector.stats(),
+            "sway": self.sway.stats(),
+            "orientation": self.orientation.as_dict() if self.orientation is not None else None
+        }
+        health = None
+        if now >= self._next_health:
+            health = self.health.as_dict(now)
+            self._next_health = now + WORKER_HEALTH_INTERVAL
+        self.conn.send(("analysis", self._pending_event, counts, self._decode_errors, self._observations,
+                        self._batches, stats, health, self.health.last_arrival))
+        self._pending_event = None
+        self._observations = []
+        self._batches = []
+        self._level_counts = dict.fromkeys(MOTION_LEVELS, 0)
+        self._decode_errors = 0
+        self._next_report = now + CUE_DISPATCH_INTERVAL
+
+class WorkerLauncher:
+    """Single-threaded fork server for MotionWorker processes
+
+    Forking the plugin process once its threads run can leave a lock (logging,
+    queues, the allocator) held forever in the child. The launcher is forked in
+    _main when process mode is configured, before the plugin starts any
+    threads, and forks each worker from its own single thread. Switching to
+    process mode later starts it from the running, threaded plugin: logging
+    handler locks are reinitialized after fork and the launcher touches no
+    other plugin state, but a lock held by a thread outside the plugin could
+    still be inherited held. The plugin sends ("start", worker args) followed by the
+    worker's end of its pipe over SCM_RIGHTS, and ("kill", pid); the launcher
+    answers ("started", pid) and, once the worker is reaped, ("exited", pid,
+    how). It exits when the plugin closes its end.
+    """
+
+    def __init__(self):
+        self.pid = None
+        self._conn = None
+
+    @property
+    def running(self) -> bool:
+        return self.pid is not None
+
+    def start(self, after_fork=None):
+        """Fork the launcher; after_fork runs first in the child (e.g. to undo a log queue)"""
+        from multiprocessing import Pipe
+        # Duplex pipes are socket pairs, which can carry file descriptors
+        parent_conn, child_conn = Pipe()
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                parent_conn.close()
+                if after_fork is not None:
+                    after_fork()
+                self._serve(child_conn)
+            except Exception as e:
+                decky.logger.error(f"Motion worker launcher error: {str(e)}")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        child_conn.close()
+        self.pid = pid
+        self._conn = parent_conn
+
+    def stop(self, timeout: float = 1.0):
+        """Close the launcher's pipe and reap it; it kills a worker it still has"""
+        pid, self.pid = self.pid, None
+        if pid is None:
+            return
+        self._conn.close()
+        self._conn = None
+        deadline = time.monotonic() + timeout
+        while not os.waitpid(pid, os.WNOHANG)[0]:
+            if time.monotonic() > deadline:
+                import signal
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                break
+            time.sleep(0.01)
+
+    def spawn(self, worker_conn, *args) -> int:
+        """Start a MotionWorker(worker_conn, *args) and return its pid"""
+        from multiprocessing.reduction import send_handle
+        if self._conn is None:
+            raise RuntimeError("Motion worker launcher is not running")
+        try:
+            self._conn.send(("start", *args))
+            send_handle(self._conn, worker_conn.fileno(), self.pid)
+            if not self._conn.poll(WORKER_START_TIMEOUT):
+                raise TimeoutError("Motion worker launcher did not answer")
+            return self._conn.recv()[1]
+        except (EOFError, OSError) as e:
+            self.stop()
+            raise RuntimeError(f"Motion worker launcher exited: {str(e)}")
+
+    def reap(self, pid: int, timeout: float = 1.0) -> str:
+        """Wait for the worker to exit, killing it after timeout, and describe how it exited"""
+        try:
+            if not self._conn.poll(timeout):
+                self._conn.send(("kill", pid))
+                if not self._conn.poll(timeout):
+                    return "unknown"
+            message = self._conn.recv()
+            return message[2]
+        except (EOFError, OSError, AttributeError):
+            # The launcher itself went away and took the worker with it
+            self.stop()
+            return "launcher exited"
+
+    @staticmethod
+    def _serve(conn):
+        import signal
+        from multiprocessing.connection import Connection
+        from multiprocessing.reduction import recv_handle
+        try:
+            # The wakeup fd belongs to the plugin's event loop
+            signal.set_wakeup_fd(-1)
+        except ValueError:
+            pass
+        worker_pid = None
+        try:
+            while True:
+                # Block while idle; poll for the worker's exit while one runs
+                if worker_pid is None or conn.poll(WORKER_POLL_INTERVAL):
+                    message = conn.recv()  # EOFError once the plugin closes its end
+                    if message[0] == "start":
+                        fd = recv_handle(conn)
+                        pid = os.fork()
+                        if pid == 0:
+                            exit_code = 0
+                            try:
+                                conn.close()
+                                MotionWorker(Connection(fd), *message[1:]).run()
+                            except Exception as e:
+                                decky.logger.error(f"Motion worker error: {str(e)}")
+                                exit_code = 1
+                            finally:
+                                os._exit(exit_code)
+                        os.close(fd)
+                        worker_pid = pid
+                        conn.send(("started", pid))
+                    elif message[0] == "kill" and message[1] == worker_pid:
+                        os.kill(worker_pid, signal.SIGKILL)
+                if worker_pid is not None:
+                    done, status = os.waitpid(worker_pid, os.WNOHANG)
+                    if done:
+                        conn.send(("exited", worker_pid, WorkerLauncher.describe_exit(status)))
+                        worker_pid = None
+        except (EOFError, BrokenPipeError):
+            pass
+        finally:
+            if worker_pid is not None:
+                os.kill(worker_pid, signal.SIGKILL)
+                os.waitpid(worker_pid, 0)
+
+    @staticmethod
+    def describe_exit(status: int) -> str:
+        if os.WIFSIGNALED(status):
+            return f"signal {os.WTERMSIG(status)}"
+        return f"exit code {os.WEXITSTATUS(status)}"
+
+class ServiceReadinessProbe(asyncio.DatagramProtocol):
+    """Resolves once the first valid motion datagram arrives"""
+
+    def __init__(self):
+        self.ready = asyncio.get_running_loop().create_future()
+
+    def datagram_received(self, data: bytes, addr):
+        try:
+            decode_motion_packet(data)
+        except ValueError:
+            return
+        if not self.ready.done():
+            self.ready.set_result(None)
+
+    def error_received(self, exc):
+        # Port unreachable until the service binds; keep retrying
+        pass
+
+class MotionDatagramProtocol(asyncio.DatagramProtocol):
+    """Receives sdmotion datagrams on Decky's event loop"""
+
+    def __init__(self, plugin: "MotionServicePlugin", drain_sock: Optional[socket.socket] = None):
+        self.plugin = plugin
+        self.transport = None
+        self.last_receive_time = 0.0
+        self._sock = drain_sock  # Set in drain mode
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        self.last_receive_time = time.monotonic()
+        perf = self.plugin.perf_stats
+        timed = perf.enabled
+        if timed:
+            start = time.perf_counter_ns()
+        packets = [data]
+        if self._sock is not None:
+            # The transport hands over one datagram per loop iteration; drain the rest
+            # of the (non-blocking) socket here so a burst is processed as one batch
+            while len(packets) < DRAIN_MAX_PACKETS:
+                try:
+                    packets.append(self._sock.recv(RECEIVE_BUFFER_SIZE))
+                except (BlockingIOError, InterruptedError):
+                    break
+                except OSError:
+                    break
+        if timed:
+            perf.record("receive", time.perf_counter_ns() - start)
+        
+        samples = self.plugin._decode_packets(packets)
+        if not samples:
+            return
+        self.plugin._note_packet(packets[-1])
+        self.plugin.batch_stats.record(len(packets))
+        self.plugin._process_motion_samples(samples)
+
+    def error_received(self, exc):
+        # ICMP port unreachable while sdmotion restarts; the register timer recovers
+        pass
+
+    def register(self):
+        if self.transport:
+            self.transport.sendto(self.plugin._register_payload(), self.plugin.service_addr)
 
 class MotionServicePlugin:
     def __init__(self):
         self.service_path = os.path.expanduser("~/sdmotion")
         self.binary_path = os.path.join(self.service_path, "sdmotion")
         self.motion_data_thread = None
+        self.motion_data_task = None
         self.motion_data_running = False
-        self.latest_motion_data = {}
-        self.motion_history = []
-        self.motion_alerts = []
+        self.receive_mode = "thread"  # thread, asyncio, process
+        self.service_addr = SERVICE_ADDR
+        self.prefer_binary = True
+        self.batch_drain = False
+        self.batch_stats = BatchStats()
+        self.stream_health = StreamHealth()
+        self.perf_stats = PerfStats()
+        self.log_pipeline = LogPipeline(decky.logger)
+        self._last_register_time = None
+        self._register_count = 0
+        self.wire_format = None  # binary or json once the first packet arrives
+        self._last_register = None
+        self._stream_live = False
+        # Latest sample and recent alerts, replaced as a whole (see MotionSnapshot)
+        self.motion_snapshot = EMPTY_SNAPSHOT
+        self._snapshot_lock = threading.Lock()  # Serializes writers only; readers never take it
+        self.motion_history = MotionHistory(HISTORY_DEFAULT_CAPACITY)
+        self.recorder = None  # MotionRecorder while a session is being recorded
+        self.last_recording = None  # Summary of the last finished recording, including any write error
+        
+        # Receive mode "process" (see MotionWorker); the worker's last stream health report and
+        # when it last received a batch
+        self.worker_launcher = WorkerLauncher()
+        self._worker_health = None
+        self._worker_last_arrival = None
+        self._worker_config_seq = 0
+        self.worker_stats = {"starts": 0, "restarts": 0, "last_exit": None, "pid": None}
+        
+        # Samples and cues republished to local readers through a shared-memory ring (see motion_ring)
+        # Off until a reader asks for it (set_shared_stream_enabled, saved in SETTINGS_FILE)
+        self.shared_stream_enabled = False
+        self.motion_ring = None
+        
+        # Demand-driven duty cycling of the receiver (opt-in)
+        self.duty_cycling = False
+        self._duty_idle = False  # Monitoring is on but the receiver is parked
+        self._duty_task = None
+        self._demand_changed = None
+        self._demand_lost_at = None
+        self._poll_lease_until = 0.0
+        self._unregister_on_stop = False
+        self.duty_stats = {"idle_transitions": 0, "resumes": 0, "idle_seconds": 0.0}
+        self._idle_since = None
         self.cues_enabled = False
         self.sensitivity_level = 2  # 1=Low, 2=Medium, 3=High
         self.cue_types = ["visual", "haptic"]  # visual, haptic, audio
+        self.cue_dispatcher = CueDispatcher(self._deliver_motion_cue)
+        
+        # Frontend push subscriptions (subscription id -> update rate in Hz), and when
+        # each motion or status subscription lapses unless renewed
+        self.motion_subscribers: Dict[int, float] = {}
+        self._subscription_expiry: Dict[int, float] = {}
+        self._next_subscription_id = 1
+        self._publisher_task = None
+        self._publisher_resync = False
+        
+        # Cached service status and its UI subscriptions
+        self.status_subscribers = set()
+        self._status_cache = None
+        self._status_time = 0.0
+        self._status_probe = None
+        self._status_watch_task = None
+        self._service_ready = False
+        self._probed_activation = None  # Unit activation (ActiveEnterTimestampMonotonic) already probed
+        self._status_wakeup = None
+        self._loop = None
+        
+        # Change counter used with the snapshot's sequence numbers to skip pushes when nothing changed
+        self._state_seq = 0
         
         # Motion sickness detection parameters
         self.motion_thresholds = {
-            1: {"gyro": 50, "accel": 1.5, "time_window": 3},    # Low sensitivity
-            2: {"gyro": 30, "accel": 1.3, "time_window": 2},    # Medium sensitivity  
-            3: {"gyro": 20, "accel": 1.1, "time_window": 1.5}   # High sensitivity
+            1: {"gyro": 50, "accel": 1.5, "time_window": 3, "sway": 10},    # Low sensitivity
+            2: {"gyro": 30, "accel": 1.3, "time_window": 2, "sway": 6},     # Medium sensitivity  
+            3: {"gyro": 20, "accel": 1.1, "time_window": 1.5, "sway": 4}    # High sensitivity
         }
+        self.motion_detector = WindowedMotionDetector(self.motion_thresholds[self.sensitivity_level]["time_window"])
+        # Per-device thresholds learned from the user's baseline; used instead of the table when enabled
+        self.calibrator = MotionCalibrator(self.motion_thresholds)
+        self.auto_calibration = False
+        self._calibration_loaded = False
+        self._calibration_pushed = -1  # Whole seconds of calibration progress last pushed to the UI
+        self.sway_analyzer = SwayAnalyzer()
+        # Held while the detector, sway analyzer, orientation filter or rollups change or are
+        # read; their stats reach the callables through the snapshot, not this lock
+        self._analysis_lock = threading.Lock()
+        self.motion_rollups = MotionRollups()
+        self.orientation = OrientationFilter()
+        self.orientation_enabled = True
         
-        # Create service directory
-        os.makedirs(self.service_path, exist_ok=True)
+        # Bin directory and service archive, resolved on first use (see _resolve_bin)
+        self._bin_cache = None
+        
+        # Startup timings (ms) reported by get_debug_info
+        self.load_times = {"import": round((time.perf_counter() - _LOAD_STARTED) * 1000, 2)}
 
-    def _get_bin_dir(self) -> Path:
-        """Get the bin directory path with detailed logging"""
+    def _resolve_bin(self) -> Tuple[Path, Optional[Path]]:
+        """Bin directory and service archive, cached until the plugin or bin directory changes
+
+        Store installs ship bin/, development builds defaults/bin/. Updating the
+        plugin or its archive changes one of the two directory mtimes.
+        """
         plugin_dir = Path(decky.DECKY_PLUGIN_DIR)
-        decky.logger.info(f"Plugin directory: {plugin_dir}")
-        
-        # Check for bin directory (decky store installation)
-        bin_dir = plugin_dir / "bin"
-        decky.logger.info(f"Checking bin directory: {bin_dir}")
-        decky.logger.info(f"Bin directory exists: {bin_dir.exists()}")
-        
-        if bin_dir.exists():
-            # List contents for debugging
-            try:
-                contents = list(bin_dir.iterdir())
-                decky.logger.info(f"Bin directory contents: {[str(f.name) for f in contents]}")
-            except Exception as e:
-                decky.logger.error(f"Error listing bin contents: {e}")
-            return bin_dir
-            
-        # Check defaults/bin (development)
-        defaults_bin = plugin_dir / "defaults" / "bin"
-        decky.logger.info(f"Checking defaults/bin directory: {defaults_bin}")
-        decky.logger.info(f"Defaults/bin directory exists: {defaults_bin.exists()}")
-        
-        if defaults_bin.exists():
+        key = []
+        for directory in (plugin_dir, plugin_dir / "bin", plugin_dir / "defaults" / "bin"):
             try:
-                contents = list(defaults_bin.iterdir())
-                decky.logger.info(f"Defaults/bin directory contents: {[str(f.name) for f in contents]}")
-            except Exception as e:
-                decky.logger.error(f"Error listing defaults/bin contents: {e}")
-            return defaults_bin
+                key.append(directory.stat().st_mtime_ns)
+            except OSError:
+                key.append(None)
+        key = tuple(key)
+        if self._bin_cache and self._bin_cache[0] == key:
+            return self._bin_cache[1], self._bin_cache[2]
         
-        # Fallback to bin (even if it doesn't exist, for error reporting)
-        decky.logger.warning(f"Neither {bin_dir} nor {defaults_bin} exists, defaulting to {bin_dir}")
-        return bin_dir
+        bin_dir = plugin_dir / "bin"
+        if key[1] is None and key[2] is not None:
+            bin_dir = plugin_dir / "defaults" / "bin"
+        elif key[1] is None:
+            # Neither exists; keep bin for error reporting
+            decky.logger.warning(f"Neither {bin_dir} nor {plugin_dir / 'defaults' / 'bin'} exists, defaulting to {bin_dir}")
+        zip_path = self._find_install_zip(bin_dir)
+        decky.logger.info(f"Bin directory: {bin_dir}, service archive: {zip_path.name if zip_path else None}")
+        self._bin_cache = (key, bin_dir, zip_path)
+        return bin_dir, zip_path
+
+    def _get_bin_dir(self) -> Path:
+        """Get the bin directory path"""
+        return self._resolve_bin()[0]
 
     async def _main(self):
         """Plugin initialization"""
-        bin_dir = self._get_bin_dir()
-        decky.logger.info(f"Motion Service plugin loaded. Bin directory: {bin_dir}")
+        self._loop = asyncio.get_running_loop()
+        settings = self._load_settings()
+        mode = settings.get("receive_mode")
+        if mode in RECEIVE_MODES:
+            self.receive_mode = mode
+        self.shared_stream_enabled = settings.get("shared_stream") is True
+        if self.receive_mode == "process":
+            # Fork the worker launcher while this process has no threads of its own
+            self.worker_launcher.start(self.log_pipeline.restore)
+        self.log_pipeline.install()
+        # Everything else (bin directory, service files, sockets) waits until first use
+        self.load_times["main"] = round((time.perf_counter() - _LOAD_STARTED) * 1000, 2)
+        decky.logger.info(f"Motion Service plugin loaded in {self.load_times['main']} ms")
 
     async def _unload(self):
         """Plugin cleanup"""
+        self.motion_subscribers.clear()
+        self._subscription_expiry.clear()
+        if self._publisher_task:
+            self._publisher_task.cancel()
+        self.status_subscribers.clear()
+        if self._status_watch_task:
+            self._status_watch_task.cancel()
+        await self._end_duty_cycle()
+        await self._stop_recording()
         await self.stop_motion_service()
+        await asyncio.get_running_loop().run_in_executor(None, self.cue_dispatcher.stop)
+        await asyncio.get_running_loop().run_in_executor(None, self.worker_launcher.stop)
+        self._close_motion_ring()
         decky.logger.info("Motion Service plugin unloaded")
+        await asyncio.get_running_loop().run_in_executor(None, self.log_pipeline.uninstall)
 
-    async def install_motion_service(self) -> Dict[str, Any]:
-        """Install the motion service from downloaded binary"""
+    def _find_install_zip(self, bin_dir: Path) -> Optional[Path]:
+        """The service archive shipped in the bin directory"""
+        for zip_name in INSTALL_ZIP_NAMES:
+            zip_path = bin_dir / zip_name
+            if zip_path.is_file():
+                return zip_path
+        # Fall back to any zip file
+        if bin_dir.is_dir():
+            for zip_path in sorted(bin_dir.glob("*.zip")):
+                return zip_path
+        return None
+
+    def _install_state_path(self) -> str:
+        return os.path.join(decky.DECKY_PLUGIN_SETTINGS_DIR, INSTALL_STATE_FILE)
+
+    def _load_install_state(self) -> Dict[str, Any]:
         try:
-            bin_dir = self._get_bin_dir()
-            decky.logger.info(f"Starting installation from bin directory: {bin_dir}")
-            
-            # Try different possible zip file names
-            possible_zip_names = [
-                "steamdeck_motion_service.zip",
-                "SteamDeckMotionSetup.zip",
-                "steamdeck-motion-service.zip"
-            ]
-            
-            zip_path = None
-            for zip_name in possible_zip_names:
-                test_path = bin_dir / zip_name
-                decky.logger.info(f"Checking for zip file: {test_path}")
-                if test_path.exists():
-                    zip_path = test_path
-                    decky.logger.info(f"Found zip file: {zip_path}")
-                    break
-            
-            # If no specific zip found, try to find any zip file in the directory
-            if not zip_path and bin_dir.exists():
-                decky.logger.info("No specific zip found, searching for any .zip files...")
-                try:
-                    zip_files = list(bin_dir.glob("*.zip"))
-                    decky.logger.info(f"Found zip files: {[str(f.name) for f in zip_files]}")
-                    if zip_files:
-                        zip_path = zip_files[0]  # Use the first zip file found
-                        decky.logger.info(f"Using first zip file: {zip_path}")
-                except Exception as e:
-                    decky.logger.error(f"Error searching for zip files: {e}")
+            with open(self._install_state_path(), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_install_state(self, state: Dict[str, Any]):
+        path = self._install_state_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(state, f)
+        os.replace(f"{path}.tmp", path)
+
+    def _settings_path(self) -> str:
+        return os.path.join(decky.DECKY_PLUGIN_SETTINGS_DIR, SETTINGS_FILE)
+
+    def _load_settings(self) -> Dict[str, Any]:
+        try:
+            with open(self._settings_path(), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_settings(self, settings: Dict[str, Any]):
+        """Update the given keys of SETTINGS_FILE, keeping the others"""
+        try:
+            path = self._settings_path()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            settings = {**self._load_settings(), **settings}
+            with open(f"{path}.tmp", "w") as f:
+                json.dump(settings, f)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            decky.logger.error(f"Failed to save settings: {str(e)}")
+
+    def _calibration_path(self) -> str:
+        return os.path.join(decky.DECKY_PLUGIN_SETTINGS_DIR, CALIBRATION_FILE)
+
+    def _load_calibration(self):
+        """Restore the saved calibration once"""
+        if self._calibration_loaded:
+            return
+        self._calibration_loaded = True
+        try:
+            with open(self._calibration_path(), "r") as f:
+                state = json.load(f)
+            self.calibrator.load_state(state)
+            self.auto_calibration = bool(state.get("auto", False))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, IndexError, TypeError) as e:
+            decky.logger.error(f"Ignoring saved calibration: {str(e)}")
+
+    def _save_calibration(self):
+        try:
+            path = self._calibration_path()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(f"{path}.tmp", "w") as f:
+                json.dump({"auto": self.auto_calibration, **self.calibrator.state()}, f)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            decky.logger.error(f"Failed to save calibration: {str(e)}")
+
+    def _plan_install(self, zip_path: Path, force: bool) -> Dict[str, Any]:
+        """Compare the archive and installed files with the last install
+
+        The archive is only re-hashed and its member list only re-read when its
+        size or mtime changed. A member is changed when its CRC differs from the
+        installed one, or when the installed copy is missing or was modified.
+        """
+        state = {} if force else self._load_install_state()
+        stat = zip_path.stat()
+        archive = state.get("archive", {})
+        files = state.get("files", {})
+        archive_unchanged = (
+            archive.get("path") == str(zip_path)
+            and archive.get("size") == stat.st_size
+            and archive.get("mtime_ns") == stat.st_mtime_ns
+        )
+        
+        if archive_unchanged:
+            digest = archive["sha256"]
+            manifest = {name: {"crc": entry["crc"], "size": entry["size"]} for name, entry in files.items()}
+        else:
+            import hashlib
+            import zipfile
             
-            if not zip_path or not zip_path.exists():
-                error_msg = f"Motion service binary not found in {bin_dir}. Checked: {possible_zip_names}"
+            sha256 = hashlib.sha256()
+            with open(zip_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    sha256.update(block)
+            digest = sha256.hexdigest()
+            with zipfile.ZipFile(zip_path, "r") as zip_ref:
+                manifest = {
+                    info.filename: {"crc": info.CRC, "size": info.file_size}
+                    for info in zip_ref.infolist() if not info.is_dir()
+                }
+        
+        changed = []
+        for name, entry in manifest.items():
+            previous = files.get(name)
+            if not previous or previous["crc"] != entry["crc"]:
+                changed.append(name)
+                continue
+            try:
+                installed = os.stat(os.path.join(self.service_path, name))
+            except OSError:
+                changed.append(name)
+                continue
+            if installed.st_size != previous["installed_size"] or installed.st_mtime_ns != previous["mtime_ns"]:
+                changed.append(name)
+        
+        scripts = sorted((name for name in manifest if os.path.basename(name) == "install.sh"), key=len)
+        return {
+            "archive": {"path": str(zip_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest},
+            "manifest": manifest,
+            "changed": changed,
+            "install_script": scripts[0] if scripts else None,
+            # The script must also run again if it never completed or its results are gone
+            "script_needed": bool(changed) or not state.get("script_ok") or not os.path.exists(self.binary_path)
+                             or not os.path.exists(SERVICE_UNIT_FILE)
+        }
+
+    def _extract_members(self, zip_path: Path, names: list):
+        """Extract only the given archive members, keeping their permission bits"""
+        import zipfile
+        
+        os.makedirs(self.service_path, exist_ok=True)
+        with zipfile.ZipFile(zip_path, "r") as zip_ref:
+            for name in names:
+                info = zip_ref.getinfo(name)
+                target = zip_ref.extract(info, self.service_path)
+                mode = (info.external_attr >> 16) & 0o777
+                if mode:
+                    os.chmod(target, mode)
+
+    def _record_install(self, plan: Dict[str, Any], script_ok: bool):
+        """Store the archive hash and installed member stats for the next install"""
+        files = {}
+        for name, entry in plan["manifest"].items():
+            try:
+                installed = os.stat(os.path.join(self.service_path, name))
+            except OSError:
+                continue
+            files[name] = {**entry, "installed_size": installed.st_size, "mtime_ns": installed.st_mtime_ns}
+        self._save_install_state({
+            "archive": plan["archive"],
+            "files": files,
+            "script_ok": script_ok,
+            "installed_at": time.time()
+        })
+
+    async def _emit_install_progress(self, stage: str, message: str, **extra):
+        decky.logger.info(f"Install [{stage}]: {message}")
+        await decky.emit("install_progress", {"stage": stage, "message": message, **extra})
+
+    async def _run_install_script(self, install_script: str) -> Tuple[int, str]:
+        """Run install.sh, streaming each output line to the UI as progress"""
+        os.chmod(install_script, 0o755)
+        process = await asyncio.create_subprocess_exec(
+            "/bin/bash", install_script,
+            cwd=os.path.dirname(install_script),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT
+        )
+        output = deque(maxlen=INSTALL_OUTPUT_LINES)
+        
+        async def stream_output():
+            async for raw_line in process.stdout:
+                line = raw_line.decode("utf-8", errors="replace").rstrip()
+                output.append(line)
+                await self._emit_install_progress("script", line)
+            return await process.wait()
+        
+        try:
+            returncode = await asyncio.wait_for(stream_output(), timeout=INSTALL_SCRIPT_TIMEOUT)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            output.append(f"Install script timed out after {INSTALL_SCRIPT_TIMEOUT}s")
+            returncode = -1
+        return returncode, "\n".join(output)
+
+    async def install_motion_service(self, force: bool = False) -> Dict[str, Any]:
+        """Install the motion service from downloaded binary, skipping unchanged files"""
+        try:
+            started = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            bin_dir, zip_path = self._resolve_bin()
+            if not zip_path or not zip_path.is_file():
+                error_msg = f"Motion service binary not found in {bin_dir}. Checked: {list(INSTALL_ZIP_NAMES)}"
                 decky.logger.error(error_msg)
+                await self._emit_install_progress("error", error_msg)
                 return {"status": "error", "message": error_msg}
             
-            decky.logger.info(f"Installing motion service from {zip_path}")
-            decky.logger.info(f"Zip file size: {zip_path.stat().st_size} bytes")
-            
-            # Create service directory
-            decky.logger.info(f"Creating service directory: {self.service_path}")
-            os.makedirs(self.service_path, exist_ok=True)
-            
-            # Extract the zip file
-            decky.logger.info("Extracting zip file...")
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(self.service_path)
-            
-            decky.logger.info("Zip extraction completed")
-            
-            # Find the install script
-            install_script = None
-            decky.logger.info(f"Searching for install script in {self.service_path}")
+            await self._emit_install_progress("check", f"Checking {zip_path.name}")
+            plan = await loop.run_in_executor(None, self._plan_install, zip_path, force)
+            changed = plan["changed"]
             
-            for root, dirs, files in os.walk(self.service_path):
-                decky.logger.info(f"Checking directory: {root}, files: {files}")
-                if "install.sh" in files:
-                    install_script = os.path.join(root, "install.sh")
-                    decky.logger.info(f"Found install script: {install_script}")
-                    break
-            
-            if not install_script:
-                error_msg = f"Install script not found in extracted files. Service path: {self.service_path}"
+            if not plan["install_script"]:
+                error_msg = f"Install script not found in {zip_path.name}"
                 decky.logger.error(error_msg)
-                # List all extracted files for debugging
-                try:
-                    all_files = []
-                    for root, dirs, files in os.walk(self.service_path):
-                        for file in files:
-                            all_files.append(os.path.join(root, file))
-                    decky.logger.info(f"All extracted files: {all_files}")
-                except Exception as e:
-                    decky.logger.error(f"Error listing extracted files: {e}")
+                await self._emit_install_progress("error", error_msg)
                 return {"status": "error", "message": error_msg}
             
-            # Make install script executable
-            decky.logger.info(f"Making install script executable: {install_script}")
-            os.chmod(install_script, 0o755)
-            
-            # Run the install script
-            decky.logger.info("Running install script...")
-            result = subprocess.run(
-                ["/bin/bash", install_script],
-                cwd=os.path.dirname(install_script),
-                capture_output=True,
-                text=True,
-                timeout=120  # Increased timeout to 2 minutes
-            )
+            if changed:
+                await self._emit_install_progress(
+                    "extract", f"Extracting {len(changed)} of {len(plan['manifest'])} files",
+                    changed=len(changed), total=len(plan["manifest"])
+                )
+                await loop.run_in_executor(None, self._extract_members, zip_path, changed)
             
-            decky.logger.info(f"Install script exit code: {result.returncode}")
-            decky.logger.info(f"Install script stdout: {result.stdout}")
-            decky.logger.info(f"Install script stderr: {result.stderr}")
+            output = ""
+            if plan["script_needed"]:
+                await self._emit_install_progress("script", "Running install script...")
+                install_script = os.path.join(self.service_path, plan["install_script"])
+                returncode, output = await self._run_install_script(install_script)
+                decky.logger.info(f"Install script exit code: {returncode}")
+                await loop.run_in_executor(None, self._record_install, plan, returncode == 0)
+                if returncode != 0:
+                    error_msg = f"Installation failed with exit code {returncode}: {output[-500:]}"
+                    decky.logger.error(error_msg)
+                    await self._emit_install_progress("error", error_msg)
+                    return {"status": "error", "message": error_msg, "output": output}
+            elif changed:
+                await loop.run_in_executor(None, self._record_install, plan, True)
             
-            if result.returncode == 0:
-                decky.logger.info("Motion service installed successfully")
-                return {
-                    "status": "success", 
-                    "message": "Motion service installed successfully",
-                    "output": result.stdout
-                }
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+            if plan["script_needed"]:
+                message = f"Motion service installed successfully ({len(changed)} files updated)"
             else:
-                error_msg = f"Installation failed with exit code {result.returncode}: {result.stderr}"
-                decky.logger.error(error_msg)
-                return {
-                    "status": "error", 
-                    "message": error_msg
-                }
+                message = "Motion service is already up to date"
+            await self._emit_install_progress("done", message, elapsed_ms=elapsed_ms)
+            self._request_status_refresh()
+            return {
+                "status": "success",
+                "message": message,
+                "output": output,
+                "changed": changed,
+                "script_ran": plan["script_needed"],
+                "elapsed_ms": elapsed_ms
+            }
                 
         except Exception as e:
             error_msg = f"Installation error: {str(e)}"
             decky.logger.error(error_msg)
             import traceback
             decky.logger.error(f"Full traceback: {traceback.format_exc()}")
+            await self._emit_install_progress("error", error_msg)
             return {"status": "error", "message": error_msg}
 
     async def check_service_status(self) -> Dict[str, Any]:
         """Check if the motion service is installed and running"""
+        return await self._get_service_status()
+
+    async def _get_service_status(self, force: bool = False) -> Dict[str, Any]:
+        """Cached service status; concurrent callers share a single probe"""
+        if not force and self._status_cache is not None and time.monotonic() - self._status_time < STATUS_TTL:
+            return self._status_cache
+        if self._status_probe is None or self._status_probe.done():
+            self._status_probe = asyncio.ensure_future(self._probe_service_status())
+        # Shield so a cancelled caller does not cancel the probe other callers wait on
+        return await asyncio.shield(self._status_probe)
+
+    async def _probe_service_status(self) -> Dict[str, Any]:
+        """Probe systemd for the service state and push it to the UI if it changed"""
+        status = await self._query_service_status()
+        self._status_time = time.monotonic()
+        changed = status != self._status_cache
+        self._status_cache = status
+        if changed:
+            await decky.emit("service_status", status)
+        return status
+
+    async def _query_service_status(self) -> Dict[str, Any]:
+        """Query systemd for whether the motion service is installed and running"""
         try:
             # Check if binary exists
             if not os.path.exists(self.binary_path):
@@ -214,30 +2896,30 @@ class MotionServicePlugin:
             
             # Check if service is running via systemd
             try:
-                result = subprocess.run(
-                    ["systemctl", "--user", "is-active", "sdmotion"],
-                    capture_output=True,
-                    text=True
+                process = await asyncio.create_subprocess_exec(
+                    "systemctl", "--user", "show", "sdmotion",
+                    "--property=ActiveState,ActiveEnterTimestampMonotonic",
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL
                 )
+                stdout, _ = await process.communicate()
                 
-                is_running = result.returncode == 0 and result.stdout.strip() == "active"
-                
-                # Check if UDP port is open
-                udp_open = False
-                try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                    sock.settimeout(1)
-                    sock.sendto(b"test", ("127.0.0.1", 27760))
-                    sock.close()
-                    udp_open = True
-                except:
-                    pass
+                properties = dict(line.partition("=")[::2] for line in stdout.decode().splitlines())
+                is_running = process.returncode == 0 and properties.get("ActiveState") == "active"
+                activation = properties.get("ActiveEnterTimestampMonotonic")
+                if is_running and not self._service_ready and activation != self._probed_activation:
+                    # Started at boot or outside the plugin: nothing else has proven the stream yet.
+                    # Probe once per activation; a miss is kept until the stream shows up or the unit restarts
+                    self._probed_activation = activation
+                    self._service_ready = await self._wait_for_service_ready(SERVICE_STATUS_PROBE_TIMEOUT)
                 
                 return {
                     "status": "success",
                     "installed": True,
                     "running": is_running,
-                    "udp_available": udp_open,
+                    "ready": is_running and self._service_ready,
+                    # Only a received datagram proves the port works; a UDP send always succeeds
+                    "udp_available": is_running and self._service_ready,
                     "message": "Service running" if is_running else "Service stopped"
                 }
                 
@@ -253,27 +2935,140 @@ class MotionServicePlugin:
             decky.logger.error(f"Status check error: {str(e)}")
             return {"status": "error", "message": str(e)}
 
+    def _request_status_refresh(self):
+        """Invalidate the cached status and wake the watcher; safe to call from any thread"""
+        self._status_time = 0.0
+        if self._loop is None or self._status_wakeup is None:
+            return
+        self._loop.call_soon_threadsafe(self._status_wakeup.set)
+
+    async def _watch_service_status(self):
+        """Re-probe on lifecycle and stream events while the UI is subscribed"""
+        unit_file_mtime = None
+        try:
+            while self.status_subscribers:
+                try:
+                    await asyncio.wait_for(self._status_wakeup.wait(), timeout=STATUS_WATCH_INTERVAL)
+                    woken = True
+                except asyncio.TimeoutError:
+                    woken = False
+                self._status_wakeup.clear()
+                self._expire_subscriptions()
+                if not self.status_subscribers:
+                    break
+                
+                # Installs and uninstalls show up as unit file changes; a stat is cheap
+                try:
+                    mtime = os.stat(SERVICE_UNIT_FILE).st_mtime_ns
+                except OSError:
+                    mtime = None
+                unit_file_changed = mtime != unit_file_mtime
+                unit_file_mtime = mtime
+                
+                await self._get_service_status(force=woken or unit_file_changed)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            decky.logger.error(f"Status watcher error: {str(e)}")
+
+    async def subscribe_service_status(self) -> Dict[str, Any]:
+        """Subscribe to pushed service status changes; returns the current status"""
+        try:
+            if self._loop is None:
+                self._loop = asyncio.get_running_loop()
+            if self._status_wakeup is None:
+                self._status_wakeup = asyncio.Event()
+            
+            subscription_id = self._new_subscription()
+            self.status_subscribers.add(subscription_id)
+            if self._status_watch_task is None or self._status_watch_task.done():
+                self._status_watch_task = asyncio.create_task(self._watch_service_status())
+            
+            status = await self._get_service_status()
+            return {**status, "subscription_id": subscription_id}
+        except Exception as e:
+            decky.logger.error(f"Status subscribe error: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+    async def unsubscribe_service_status(self, subscription_id: int) -> Dict[str, Any]:
+        """Remove a service status subscription"""
+        try:
+            self.status_subscribers.discard(subscription_id)
+            self._subscription_expiry.pop(subscription_id, None)
+            if not self.status_subscribers and self._status_wakeup is not None:
+                # Let the watcher notice there is nobody left
+                self._status_wakeup.set()
+            return {"status": "success", "subscribers": len(self.status_subscribers)}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    async def _run_command(self, *args: str, timeout: Optional[float] = None) -> Tuple[int, str, str]:
+        """Run a command without blocking the event loop; returns (returncode, stdout, stderr)"""
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        return process.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+
+    async def _wait_for_service_ready(self, timeout: float = SERVICE_READY_TIMEOUT) -> bool:
+        """Register with the service until it sends a valid motion datagram"""
+        loop = asyncio.get_running_loop()
+        transport, probe = await loop.create_datagram_endpoint(
+            ServiceReadinessProbe,
+            local_addr=('127.0.0.1', 0)
+        )
+        try:
+            deadline = loop.time() + timeout
+            while loop.time() < deadline:
+                transport.sendto(REGISTER_JSON, self.service_addr)
+                try:
+                    await asyncio.wait_for(asyncio.shield(probe.ready), timeout=min(SERVICE_READY_RETRY, deadline - loop.time()))
+                    return True
+                except asyncio.TimeoutError:
+                    continue
+            return False
+        finally:
+            # Otherwise sdmotion keeps streaming to the closed port until its client timeout
+            transport.sendto(UNREGISTER_MESSAGE, self.service_addr)
+            transport.close()
+
     async def start_motion_service(self) -> Dict[str, Any]:
-        """Start the motion service"""
+        """Start the motion service and wait until it streams motion data"""
         try:
             if not os.path.exists(self.binary_path):
                 return {"status": "error", "message": "Motion service not installed"}
             
             # Start via systemd
-            result = subprocess.run(
-                ["systemctl", "--user", "start", "sdmotion"],
-                capture_output=True,
-                text=True
-            )
+            returncode, _, stderr = await self._run_command("systemctl", "--user", "start", "sdmotion", timeout=30)
             
-            if result.returncode == 0:
-                # Wait a moment for service to fully start
-                time.sleep(2)
-                decky.logger.info("Motion service started")
-                return {"status": "success", "message": "Motion service started"}
-            else:
-                decky.logger.error(f"Failed to start service: {result.stderr}")
-                return {"status": "error", "message": f"Failed to start: {result.stderr}"}
+            if returncode != 0:
+                decky.logger.error(f"Failed to start service: {stderr}")
+                return {"status": "error", "message": f"Failed to start: {stderr}"}
+            
+            # Ready means the first valid datagram arrived, not that systemd reports active
+            started = time.monotonic()
+            ready = await self._wait_for_service_ready()
+            ready_ms = round((time.monotonic() - started) * 1000)
+            self._service_ready = ready
+            self._request_status_refresh()
+            
+            if ready:
+                decky.logger.info(f"Motion service started, first motion data after {ready_ms} ms")
+                return {"status": "success", "message": "Motion service started", "ready": True, "ready_ms": ready_ms}
+            
+            decky.logger.warning(f"Motion service started but sent no motion data within {SERVICE_READY_TIMEOUT}s")
+            return {
+                "status": "success",
+                "message": "Motion service started but is not sending motion data yet",
+                "ready": False
+            }
                 
         except Exception as e:
             decky.logger.error(f"Start service error: {str(e)}")
@@ -282,19 +3077,16 @@ class MotionServicePlugin:
     async def stop_motion_service(self) -> Dict[str, Any]:
         """Stop the motion service"""
         try:
-            # Stop motion data monitoring
-            self.motion_data_running = False
-            if self.motion_data_thread and self.motion_data_thread.is_alive():
-                self.motion_data_thread.join(timeout=2)
+            # Stop motion data monitoring, including a receiver parked by duty cycling
+            await self._end_duty_cycle()
+            await self._stop_monitor(timeout=2)
             
             # Stop via systemd
-            result = subprocess.run(
-                ["systemctl", "--user", "stop", "sdmotion"],
-                capture_output=True,
-                text=True
-            )
+            await self._run_command("systemctl", "--user", "stop", "sdmotion", timeout=30)
             
+            self._service_ready = False
             decky.logger.info("Motion service stopped")
+            self._request_status_refresh()
             return {"status": "success", "message": "Motion service stopped"}
                 
         except Exception as e:
@@ -309,142 +3101,707 @@ class MotionServicePlugin:
             
             # Remove systemd service
             try:
-                subprocess.run(
-                    ["systemctl", "--user", "disable", "sdmotion"],
-                    capture_output=True
-                )
+                await self._run_command("systemctl", "--user", "disable", "sdmotion", timeout=30)
             except:
                 pass
-            
-            # Remove service files
-            if os.path.exists(self.service_path):
-                shutil.rmtree(self.service_path)
-            
-            # Remove systemd service file
-            service_file = os.path.expanduser("~/.config/systemd/user/sdmotion.service")
-            if os.path.exists(service_file):
-                os.remove(service_file)
-            
-            decky.logger.info("Motion service uninstalled")
-            return {"status": "success", "message": "Motion service uninstalled"}
-            
-        except Exception as e:
-            decky.logger.error(f"Uninstall error: {str(e)}")
-            return {"status": "error", "message": str(e)}
+            
+            # Remove service files off the event loop
+            if os.path.exists(self.service_path):
+                import shutil
+                
+                await asyncio.get_running_loop().run_in_executor(None, shutil.rmtree, self.service_path)
+            
+            # Remove systemd service file
+            if os.path.exists(SERVICE_UNIT_FILE):
+                os.remove(SERVICE_UNIT_FILE)
+            
+            # The next install starts from scratch
+            if os.path.exists(self._install_state_path()):
+                os.remove(self._install_state_path())
+            
+            decky.logger.info("Motion service uninstalled")
+            self._request_status_refresh()
+            return {"status": "success", "message": "Motion service uninstalled"}
+            
+        except Exception as e:
+            decky.logger.error(f"Uninstall error: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+    def _monitor_motion_data(self):
+        """Background thread to monitor motion data and detect motion sickness patterns"""
+        sock = None
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.bind(('', 0))  # Bind to any available port
+            
+            # Register with motion service
+            sock.sendto(self._register_payload(), self.service_addr)
+            
+            decky.logger.info(f"Motion monitoring started on port {sock.getsockname()[1]}")
+            
+            if self.batch_drain:
+                self._receive_drained(sock)
+            else:
+                self._receive_blocking(sock)
+                    
+        except Exception as e:
+            decky.logger.error(f"Motion monitoring error: {str(e)}")
+        finally:
+            if sock:
+                if self._unregister_on_stop:
+                    try:
+                        sock.sendto(UNREGISTER_MESSAGE, self.service_addr)
+                    except OSError:
+                        pass
+                sock.close()
+            decky.logger.info("Motion monitoring stopped")
+
+    def _receive_blocking(self, sock: socket.socket):
+        """Receive and process one datagram at a time"""
+        sock.settimeout(REGISTER_INTERVAL)
+        while self.motion_data_running:
+            try:
+                # Not timed as "receive": the read includes waiting for the packet
+                data, addr = sock.recvfrom(RECEIVE_BUFFER_SIZE)
+                samples = self._decode_packets([data])
+                if not samples:
+                    continue
+                self._note_packet(data)
+                self._process_motion_samples(samples)
+                self.batch_stats.record(1)
+                    
+            except socket.timeout:
+                # Re-register periodically
+                self._note_stream_timeout()
+                sock.sendto(self._register_payload(), self.service_addr)
+                continue
+            except Exception as e:
+                decky.logger.error(f"Motion data error: {str(e)}", extra={"rate_key": "receive"})
+                break
+
+    def _receive_drained(self, sock: socket.socket):
+        """Wait for data, then read every pending datagram and process them as one batch"""
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, DRAIN_SOCKET_BUFFER)
+        sock.setblocking(False)
+        while self.motion_data_running:
+            try:
+                ready, _, _ = select.select([sock], [], [], REGISTER_INTERVAL)
+                if not ready:
+                    # Re-register periodically
+                    self._note_stream_timeout()
+                    sock.sendto(self._register_payload(), self.service_addr)
+                    continue
+                
+                perf = self.perf_stats
+                timed = perf.enabled
+                if timed:
+                    start = time.perf_counter_ns()
+                packets = []
+                while len(packets) < DRAIN_MAX_PACKETS:
+                    try:
+                        packets.append(sock.recv(RECEIVE_BUFFER_SIZE))
+                    except BlockingIOError:
+                        break
+                if timed:
+                    perf.record("receive", time.perf_counter_ns() - start)
+                
+                samples = self._decode_packets(packets)
+                if not samples:
+                    continue
+                self._note_packet(packets[-1])
+                self.batch_stats.record(len(packets))
+                self._process_motion_samples(samples)
+                
+            except Exception as e:
+                decky.logger.error(f"Motion data error: {str(e)}", extra={"rate_key": "receive"})
+                break
+
+    def _worker_config(self) -> tuple:
+        return ("config", dict(self._thresholds()), self.cues_enabled or self.calibrator.calibrating,
+                self.orientation_enabled)
+
+    def _monitor_motion_process(self):
+        """Run the receiver in a MotionWorker and restart it whenever it dies"""
+        from multiprocessing import Pipe
+        ring_path = self._ring_path(WORKER_RING_FILE)
+        launcher = self.worker_launcher
+        crashes = 0
+        while self.motion_data_running:
+            started = time.monotonic()
+            parent_conn = None
+            try:
+                if not launcher.running:
+                    # Forked in _main when process mode was saved; otherwise it starts now (see WorkerLauncher)
+                    decky.logger.info("Starting the motion worker launcher from the running plugin")
+                    launcher.start(self.log_pipeline.restore)
+                parent_conn, child_conn = Pipe()
+                # Read before the config so a change made while the worker starts is still sent to it
+                config_seq = self._worker_config_seq
+                _, threshold, analyze, orientation = self._worker_config()
+                try:
+                    pid = launcher.spawn(child_conn, self.service_addr, self.prefer_binary, ring_path,
+                                         threshold, analyze, orientation)
+                finally:
+                    child_conn.close()
+            except Exception as e:
+                pid = None
+                exit_status = str(e)
+                if parent_conn is not None:
+                    parent_conn.close()
+                decky.logger.error(f"Motion worker start error: {str(e)}")
+            
+            if pid is not None:
+                self.worker_stats["starts"] += 1
+                self.worker_stats["pid"] = pid
+                decky.logger.info(f"Motion worker started (pid {pid})")
+                try:
+                    self._supervise_worker(parent_conn, config_seq)
+                except Exception as e:
+                    decky.logger.error(f"Motion worker supervision error: {str(e)}")
+                finally:
+                    try:
+                        parent_conn.send(("stop", self._unregister_on_stop))
+                    except OSError:
+                        pass
+                    exit_status = launcher.reap(pid)
+                    parent_conn.close()
+                    self.worker_stats["pid"] = None
+                    self.worker_stats["last_exit"] = exit_status
+            
+            if not self.motion_data_running:
+                break
+            crashes = crashes + 1 if time.monotonic() - started < WORKER_STABLE_SECONDS else 1
+            self.worker_stats["restarts"] += 1
+            delay = min(WORKER_RESTART_DELAY * 2 ** (crashes - 1), WORKER_RESTART_MAX_DELAY)
+            decky.logger.error(f"Motion worker exited ({exit_status}); restarting in {delay:.1f}s")
+            restart_at = time.monotonic() + delay
+            while self.motion_data_running and time.monotonic() < restart_at:
+                time.sleep(WORKER_POLL_INTERVAL)
+        decky.logger.info("Motion monitoring stopped")
+
+    def _supervise_worker(self, conn, config_seq):
+        """Store the worker's samples and relay its results until monitoring stops or it exits"""
+        reader = None
+        ready_by = time.monotonic() + WORKER_START_TIMEOUT
+        # The worker's stats replace the plugin's own, which it does not update; unavailable until its first report
+        self._publish_stats(None, None, None)
+        self._worker_health = None
+        self._worker_last_arrival = None
+        try:
+            while self.motion_data_running:
+                if config_seq != self._worker_config_seq:
+                    config_seq = self._worker_config_seq
+                    conn.send(self._worker_config())
+                
+                # Waiting here rather than per packet lets samples arrive in batches
+                has_messages = conn.poll(WORKER_POLL_INTERVAL)
+                if reader is not None:
+                    while True:
+                        records = reader.read(WORKER_SLICE)
+                        if records:
+                            self._process_motion_samples(ring_samples(records), analyze=False)
+                        if len(records) < WORKER_SLICE:
+                            break
+                        # Hand the GIL to the event loop between slices
+                        time.sleep(0)
+                elif time.monotonic() > ready_by:
+                    raise TimeoutError("Motion worker did not start")
+                
+                while has_messages and conn.poll():
+                    message = conn.recv()  # EOFError once the worker exits
+                    kind = message[0]
+                    if kind == "analysis":
+                        (_, motion_event, level_counts, decode_errors, observations, batches, stats,
+                         health, self._worker_last_arrival) = message
+                        if health is not None:
+                            self._worker_health = health
+                        self._publish_stats(stats["window"], stats["sway"], stats["orientation"])
+                        self.perf_stats.decode_errors += decode_errors
+                        for packets in batches:
+                            self.batch_stats.record(packets)
+                        with self._analysis_lock:
+                            for level, count in level_counts.items():
+                                self.motion_rollups.add_level(level, count)
+                        for observation in observations:
+                            self._observe_calibration(*observation)
+                        if motion_event is not None and self.cues_enabled:
+                            self._trigger_motion_cue(motion_event)
+                    elif kind == "stream":
+                        self._note_wire_format(message[1])
+                    elif kind == "timeout":
+                        self._note_stream_timeout()
+                    elif kind == "ready":
+                        reader = RingReader(message[1], start="oldest")
+                        decky.logger.info(f"Motion worker {message[2]} ready")
+        except EOFError:
+            pass
+        finally:
+            if reader is not None:
+                reader.close()
+
+    async def _monitor_motion_data_async(self):
+        """Receive motion data with a datagram endpoint on the event loop instead of a thread"""
+        loop = asyncio.get_running_loop()
+        transport = None
+        sock = None
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setblocking(False)
+            sock.bind(('', 0))
+            if self.batch_drain:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, DRAIN_SOCKET_BUFFER)
+            transport, protocol = await loop.create_datagram_endpoint(
+                lambda: MotionDatagramProtocol(self, sock if self.batch_drain else None),
+                sock=sock
+            )
+            protocol.register()
+            decky.logger.info(f"Motion monitoring (asyncio) started on port {transport.get_extra_info('sockname')[1]}")
+            
+            while self.motion_data_running:
+                await asyncio.sleep(REGISTER_INTERVAL)
+                # Re-register when the service has gone quiet
+                if time.monotonic() - protocol.last_receive_time >= REGISTER_INTERVAL:
+                    self._note_stream_timeout()
+                    protocol.register()
+                    
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            decky.logger.error(f"Motion monitoring error: {str(e)}")
+        finally:
+            if transport:
+                if self._unregister_on_stop:
+                    transport.sendto(UNREGISTER_MESSAGE, self.service_addr)
+                transport.close()
+            elif sock:
+                sock.close()
+            decky.logger.info("Motion monitoring stopped")
+
+    def _register_payload(self) -> bytes:
+        """Registration message for the next (re-)register"""
+        payload = choose_register_payload(self.prefer_binary, self.wire_format, self._last_register)
+        self._last_register = payload
+        self._last_register_time = time.monotonic()
+        self._register_count += 1
+        return payload
+
+    def _note_packet(self, data: bytes):
+        """Record which format the service answered with and that the stream is live"""
+        self._note_wire_format("binary" if data[:4] == BINARY_MAGIC else "json")
+
+    def _note_wire_format(self, wire_format: str):
+        if wire_format != self.wire_format:
+            self.wire_format = wire_format
+            decky.logger.info(f"Motion service is sending {wire_format} packets")
+        if not self._stream_live:
+            self._stream_live = True
+            self._service_ready = True
+            self._request_status_refresh()
+
+    def _note_stream_timeout(self):
+        """No data for a register interval; the service may have stopped"""
+        self.perf_stats.timeouts += 1
+        if self._stream_live:
+            self._stream_live = False
+            self._service_ready = False
+            self._request_status_refresh()
+
+    def _decode_packets(self, packets: list) -> list:
+        """Decode a batch of datagrams, skipping malformed ones"""
+        perf = self.perf_stats
+        timed = perf.enabled
+        if timed:
+            start = time.perf_counter_ns()
+        samples = []
+        for data in packets:
+            try:
+                samples.extend(decode_motion_packet(data))
+            except ValueError:
+                perf.decode_errors += 1
+        if timed:
+            perf.record("decode", time.perf_counter_ns() - start)
+        return samples
+
+    def _process_motion_samples(self, samples: list, analyze: bool = True):
+        """Store decoded samples, feed them to the detectors and classify the batch once
+
+        With analyze False (receive mode "process") the worker has already
+        analyzed them and keeps the orientation filter and stream health.
+        """
+        if not samples:
+            return
+        
+        perf = self.perf_stats
+        perf.samples += len(samples)
+        timed = perf.enabled
+        if timed:
+            start = time.perf_counter_ns()
+        
+        if analyze:
+            self.stream_health.record(samples, time.time(), time.monotonic())
+        
+        # Add to history ring buffer (oldest samples are overwritten)
+        history = self.motion_history
+        rollups = self.motion_rollups
+        orientation = self.orientation if self.orientation_enabled and analyze else None
+        orientation_stats = None
+        with history.lock, self._analysis_lock:
+            for motion_data in samples:
+                accel = motion_data.get('accel', {})
+                gyro = motion_data.get('gyro', {})
+                magnitude = motion_data.get('magnitude', {})
+                timestamp = motion_data.get('timestamp', 0)
+                accel_magnitude = magnitude.get('accel', 0.0)
+                gyro_magnitude = magnitude.get('gyro', 0.0)
+                ax, ay, az = accel.get('x', 0.0), accel.get('y', 0.0), accel.get('z', 0.0)
+                pitch, yaw, roll = gyro.get('pitch', 0.0), gyro.get('yaw', 0.0), gyro.get('roll', 0.0)
+                history.append(timestamp, ax, ay, az, pitch, yaw, roll, accel_magnitude, gyro_magnitude)
+                rollups.add(timestamp, gyro_magnitude, accel_magnitude)
+                if orientation:
+                    orientation.update(timestamp, pitch, yaw, roll, ax, ay, az)
+            if orientation:
+                orientation_stats = orientation.as_dict()
+        
+        recorder = self.recorder
+        if recorder is not None and not recorder.append(samples):
+            self._recording_ended(recorder)
+        ring = self.motion_ring
+        if ring is not None:
+            ring.write_samples(samples)
+        
+        if timed:
+            now = time.perf_counter_ns()
+            perf.record("history", now - start)
+            start = now
+        
+        # If cues are enabled or calibration needs data: every sample goes through the window
+        # and sway detectors in this Python loop; only the classification runs once per batch
+        window_stats = sway_stats = None
+        if analyze and (self.cues_enabled or self.calibrator.calibrating):
+            detector = self.motion_detector
+            sway = self.sway_analyzer
+            with self._analysis_lock:
+                for motion_data in samples:
+                    gyro = motion_data.get('gyro', {})
+                    magnitude = motion_data.get('magnitude', {})
+                    timestamp = motion_data.get('timestamp', 0)
+                    detector.add(timestamp, magnitude.get('gyro', 0.0), magnitude.get('accel', 0.0))
+                    sway.add(timestamp, gyro.get('pitch', 0.0), gyro.get('yaw', 0.0), gyro.get('roll', 0.0))
+                level = self._analyze_motion_for_sickness()
+                if level:
+                    rollups.add_level(level, len(samples))
+                window_stats = detector.stats()
+                sway_stats = sway.stats()
+            # Includes any cue triggered by this batch
+            if timed:
+                perf.record("analyze", time.perf_counter_ns() - start)
+        
+        # Publish the latest sample with the stats this batch changed
+        latest = MotionSample.from_dict(samples[-1])
+        with self._snapshot_lock:
+            snapshot = self.motion_snapshot
+            self.motion_snapshot = MotionSnapshot(
+                snapshot.sample_seq + len(samples), latest, snapshot.alert_seq, snapshot.alerts,
+                window_stats or snapshot.window, sway_stats or snapshot.sway,
+                orientation_stats or snapshot.orientation
+            )
+
+    def _publish_stats(self, window: Optional[Dict[str, Any]], sway: Optional[Dict[str, Any]],
+                       orientation: Optional[Dict[str, Any]]):
+        with self._snapshot_lock:
+            self.motion_snapshot = self.motion_snapshot._replace(window=window, sway=sway, orientation=orientation)
+
+    def _start_monitor(self):
+        """Start the receiver for the configured receive mode"""
+        self.motion_data_running = True
+        self._state_seq += 1
+        self.wire_format = None
+        self._last_register = None
+        self._stream_live = False
+        self.stream_health.reset()
+        self._register_count = 0
+        self.cue_dispatcher.start()
+        self._load_calibration()
+        if self.shared_stream_enabled and self.motion_ring is None:
+            self._open_motion_ring()
+        if self.receive_mode == "asyncio":
+            self.motion_data_task = asyncio.create_task(self._monitor_motion_data_async())
+        else:
+            target = self._monitor_motion_process if self.receive_mode == "process" else self._monitor_motion_data
+            self.motion_data_thread = threading.Thread(target=target, daemon=True)
+            self.motion_data_thread.start()
+
+    async def _stop_monitor(self, timeout: float = 3.0):
+        """Stop the receiver without blocking the event loop"""
+        self.motion_data_running = False
+        self._state_seq += 1
+        
+        if self.motion_data_task and not self.motion_data_task.done():
+            self.motion_data_task.cancel()
+            try:
+                await self.motion_data_task
+            except asyncio.CancelledError:
+                pass
+        self.motion_data_task = None
+        
+        if self.motion_data_thread and self.motion_data_thread.is_alive():
+            # The thread wakes up within REGISTER_INTERVAL; wait for it off the loop
+            await asyncio.get_running_loop().run_in_executor(None, self.motion_data_thread.join, timeout)
+        self.motion_data_thread = None
+
+    def _open_motion_ring(self):
+        """Create the shared-memory ring; monitoring goes on without it if that fails"""
+        ring = RingWriter(self._ring_path(RING_FILE_NAME))
+        try:
+            ring.open()
+        except OSError as e:
+            decky.logger.error(f"Shared motion stream unavailable: {str(e)}")
+            return
+        self.motion_ring = ring
+        decky.logger.info(f"Sharing motion stream at {ring.path}")
+
+    def _ring_path(self, name: str) -> str:
+        """Ring file location: tmpfs when available, otherwise the plugin runtime directory"""
+        if os.path.isdir(RING_SHM_DIR) and os.access(RING_SHM_DIR, os.W_OK):
+            return os.path.join(RING_SHM_DIR, RING_SHM_PREFIX + name)
+        return os.path.join(decky.DECKY_PLUGIN_RUNTIME_DIR, name)
+
+    def _close_motion_ring(self):
+        ring, self.motion_ring = self.motion_ring, None
+        if ring is not None:
+            ring.close()
+
+    def _monitoring_active(self) -> bool:
+        """Monitoring is on, whether the receiver is running or parked by duty cycling"""
+        return self.motion_data_running or self._duty_idle
+
+    def _demand(self) -> list:
+        """Consumers that currently need motion data"""
+        reasons = []
+        if self.cues_enabled:
+            reasons.append("cues")
+        if self.motion_subscribers:
+            reasons.append("subscribers")
+        if self.recorder is not None:
+            reasons.append("recorder")
+        if self.calibrator.calibrating:
+            reasons.append("calibration")
+        if time.monotonic() < self._poll_lease_until:
+            reasons.append("poll")
+        return reasons
+
+    def _notify_demand(self):
+        """Re-evaluate duty cycling after a consumer came or went"""
+        if self._demand_changed is not None:
+            self._demand_changed.set()
+
+    def _touch_poll_lease(self):
+        """Polling callables keep the receiver awake for POLL_LEASE_SECONDS"""
+        expired = time.monotonic() >= self._poll_lease_until
+        self._poll_lease_until = time.monotonic() + POLL_LEASE_SECONDS
+        if expired:
+            self._notify_demand()
+
+    def _ensure_duty_cycle(self):
+        if self.duty_cycling and self._monitoring_active() and (self._duty_task is None or self._duty_task.done()):
+            self._duty_task = asyncio.create_task(self._duty_cycle_loop())
+
+    async def _cancel_duty_cycle(self):
+        """Stop duty cycling, leaving the receiver as it is"""
+        if self._duty_task and not self._duty_task.done():
+            self._duty_task.cancel()
+            try:
+                await self._duty_task
+            except asyncio.CancelledError:
+                pass
+        self._duty_task = None
+        self._demand_lost_at = None
 
-    def _monitor_motion_data(self):
-        """Background thread to monitor motion data and detect motion sickness patterns"""
-        sock = None
+    async def _end_duty_cycle(self):
+        """Stop duty cycling and forget a parked receiver, for when monitoring stops altogether"""
+        await self._cancel_duty_cycle()
+        self._duty_idle = False
+        if self._idle_since is not None:
+            self.duty_stats["idle_seconds"] += time.monotonic() - self._idle_since
+            self._idle_since = None
+
+    async def _park_receiver(self):
+        """Close the receiver socket; sdmotion stops sending once it notices"""
+        self._unregister_on_stop = True
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.bind(('', 0))  # Bind to any available port
-            sock.settimeout(2.0)
-            
-            # Register with motion service
-            sock.sendto(b"register", ('127.0.0.1', 27760))
-            
-            decky.logger.info(f"Motion monitoring started on port {sock.getsockname()[1]}")
-            
-            while self.motion_data_running:
+            await self._stop_monitor()
+        finally:
+            self._unregister_on_stop = False
+        self._duty_idle = True
+        self._idle_since = time.monotonic()
+        self.duty_stats["idle_transitions"] += 1
+        decky.logger.info("No consumers of motion data; receiver idle")
+
+    def _resume_receiver(self, reasons: list):
+        self._duty_idle = False
+        if self._idle_since is not None:
+            self.duty_stats["idle_seconds"] += time.monotonic() - self._idle_since
+            self._idle_since = None
+        self.duty_stats["resumes"] += 1
+        self._start_monitor()
+        decky.logger.info(f"Motion data needed by {', '.join(reasons)}; receiver resumed")
+
+    async def _duty_cycle_loop(self):
+        """Park the receiver while nothing needs motion data and resume it on demand
+
+        Sleeps on an event between changes, so an idle plugin makes no periodic
+        wakeups of its own.
+        """
+        self._demand_changed = asyncio.Event()
+        try:
+            while self.duty_cycling and self._monitoring_active():
+                self._demand_changed.clear()
+                now = time.monotonic()
+                reasons = self._demand()
+                timeout = None
+                if reasons:
+                    self._demand_lost_at = None
+                    if self._duty_idle:
+                        self._resume_receiver(reasons)
+                    if reasons == ["poll"]:
+                        timeout = self._poll_lease_until - now
+                elif not self._duty_idle:
+                    if self._demand_lost_at is None:
+                        self._demand_lost_at = now
+                    timeout = self._demand_lost_at + DUTY_CYCLE_GRACE - now
+                    if timeout <= 0:
+                        await self._park_receiver()
+                        timeout = None
+
+                # A timer sets the same event rather than wait_for, which can swallow
+                # a cancel that lands together with the event
+                wake = None
+                if timeout is not None:
+                    wake = asyncio.get_running_loop().call_later(max(timeout, 0), self._demand_changed.set)
                 try:
-                    data, addr = sock.recvfrom(1024)
-                    motion_data = json.loads(data.decode('utf-8'))
-                    
-                    # Update latest data
-                    self.latest_motion_data = motion_data
-                    
-                    # Add to history (keep last 100 samples)
-                    self.motion_history.append(motion_data)
-                    if len(self.motion_history) > 100:
-                        self.motion_history.pop(0)
-                    
-                    # Analyze for motion sickness if cues are enabled
-                    if self.cues_enabled:
-                        self._analyze_motion_for_sickness(motion_data)
-                        
-                except socket.timeout:
-                    # Re-register periodically
-                    sock.sendto(b"register", ('127.0.0.1', 27760))
-                    continue
-                except json.JSONDecodeError:
-                    continue
-                except Exception as e:
-                    decky.logger.error(f"Motion data error: {str(e)}")
-                    break
-                    
+                    await self._demand_changed.wait()
+                finally:
+                    if wake:
+                        wake.cancel()
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
-            decky.logger.error(f"Motion monitoring error: {str(e)}")
+            decky.logger.error(f"Duty cycle error: {str(e)}")
         finally:
-            if sock:
-                sock.close()
-            decky.logger.info("Motion monitoring stopped")
+            self._demand_changed = None
+
+    def _thresholds(self, level: Optional[int] = None) -> Dict[str, float]:
+        """A sensitivity level's thresholds: calibrated ones when auto-calibration is on and has a result"""
+        if level is None:
+            level = self.sensitivity_level
+        if self.auto_calibration:
+            calibrated = self.calibrator.thresholds.get(level)
+            if calibrated:
+                return calibrated
+        return self.motion_thresholds[level]
+
+    def _observe_calibration(self, timestamp: float, gyro: float, accel: float, sway: Optional[float]):
+        """Feed one analysis window to the calibrator and apply new thresholds"""
+        calibrator = self.calibrator
+        if calibrator.phase == "uncalibrated":
+            return
+        calibrating = calibrator.calibrating
+        if not calibrator.observe(timestamp, gyro, accel, sway):
+            # Progress reaches the UI once per second of baseline
+            if calibrating and int(calibrator.elapsed) != self._calibration_pushed:
+                self._calibration_pushed = int(calibrator.elapsed)
+                self._push_motion_settings()
+            return
+        self._worker_config_seq += 1
+        thresholds = calibrator.thresholds[self.sensitivity_level]
+        decky.logger.info(
+            f"Motion calibration updated: gyro {thresholds['gyro']:.1f}, accel {thresholds['accel']:.3f}, "
+            f"sway {thresholds['sway']:.1f} ({calibrator.observations} observations)"
+        )
+        # Saved off the receive path
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.run_in_executor, None, self._save_calibration)
+        self._push_motion_settings()
 
-    def _analyze_motion_for_sickness(self, motion_data: Dict[str, Any]):
-        """Analyze motion data for patterns that may cause motion sickness"""
+    def _push_motion_settings(self):
+        """_emit_motion_settings from the receive or worker supervisor thread"""
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._emit_motion_settings(), self._loop)
+
+    def _analyze_motion_for_sickness(self) -> Optional[str]:
+        """Classify sustained motion over the sensitivity level's time window
+
+        Returns the motion level, or None while the window is still filling.
+        Cues are only triggered when enabled; calibration may run analysis alone.
+        """
         try:
-            threshold = self.motion_thresholds[self.sensitivity_level]
+            threshold = self._thresholds()
+            detector = self.motion_detector
             
-            # Extract motion values
-            gyro_magnitude = motion_data.get('magnitude', {}).get('gyro', 0)
-            accel_magnitude = motion_data.get('magnitude', {}).get('accel', 0)
-            timestamp = motion_data.get('timestamp', 0) / 1_000_000  # Convert to seconds
-            
-            # Check for sudden motion changes
-            motion_event = {
-                'timestamp': timestamp,
-                'gyro': gyro_magnitude,
-                'accel': accel_magnitude,
-                'level': 'none'
-            }
+            # Wait until the window covers half its length so one spike cannot decide alone
+            if detector.span_seconds < threshold['time_window'] / 2:
+                return None
             
-            # Determine motion intensity
-            if gyro_magnitude > threshold['gyro'] * 2 or accel_magnitude > threshold['accel'] * 1.5:
-                motion_event['level'] = 'severe'
-            elif gyro_magnitude > threshold['gyro'] or accel_magnitude > threshold['accel']:
-                motion_event['level'] = 'moderate'
-            elif gyro_magnitude > threshold['gyro'] * 0.5 or accel_magnitude > threshold['accel'] * 0.7:
-                motion_event['level'] = 'mild'
+            motion_event = classify_motion(detector.stats(), self.sway_analyzer, threshold)
+            motion_event['timestamp'] = self.motion_snapshot.latest.timestamp / 1_000_000  # Convert to seconds
+            self._observe_calibration(motion_event['timestamp'], motion_event['gyro'],
+                                      motion_event['accel'], motion_event.get('sway'))
             
             # Only process significant motion events
-            if motion_event['level'] != 'none':
-                self._trigger_motion_cue(motion_event)
+            if motion_event['level'] != 'none' and self.cues_enabled:
+                perf = self.perf_stats
+                if perf.enabled:
+                    start = time.perf_counter_ns()
+                    self._trigger_motion_cue(motion_event)
+                    perf.record("cue", time.perf_counter_ns() - start)
+                else:
+                    self._trigger_motion_cue(motion_event)
+            return motion_event['level']
                 
         except Exception as e:
-            decky.logger.error(f"Motion analysis error: {str(e)}")
+            decky.logger.error(f"Motion analysis error: {str(e)}", extra={"rate_key": "analysis"})
+            return None
 
     def _trigger_motion_cue(self, motion_event: Dict[str, Any]):
-        """Trigger motion cues based on detected motion patterns"""
-        try:
-            current_time = time.time()
-            
-            # Avoid spamming cues (minimum 1 second between cues)
-            if hasattr(self, '_last_cue_time') and current_time - self._last_cue_time < 1.0:
-                return
-            
-            self._last_cue_time = current_time
-            
-            # Create cue alert
-            alert = {
-                'timestamp': current_time,
-                'level': motion_event['level'],
-                'gyro': motion_event['gyro'],
-                'accel': motion_event['accel'],
-                'cue_types': self.cue_types.copy()
-            }
-            
-            # Add to alerts list (keep last 10)
-            self.motion_alerts.append(alert)
-            if len(self.motion_alerts) > 10:
-                self.motion_alerts.pop(0)
-            
-            decky.logger.info(f"Motion cue triggered: {motion_event['level']} intensity")
-            
-            # Trigger haptic feedback if enabled
-            if "haptic" in self.cue_types:
-                self._trigger_haptic_feedback(motion_event['level'])
-                
-        except Exception as e:
-            decky.logger.error(f"Motion cue error: {str(e)}")
+        """Queue a motion cue; delivery, rate limiting and logging happen on the dispatcher thread"""
+        self.cue_dispatcher.submit(motion_event, self.cue_types)
+
+    def _deliver_motion_cue(self, motion_event: Dict[str, Any], cue_types: list):
+        """Record the alert and fire the admitted cue types (dispatcher thread)"""
+        alert = MotionAlert(time.time(), motion_event['level'], motion_event['gyro'], motion_event['accel'], tuple(cue_types))
+        
+        # Publish with the last ALERT_HISTORY alerts
+        with self._snapshot_lock:
+            snapshot = self.motion_snapshot
+            self.motion_snapshot = snapshot._replace(
+                alert_seq=snapshot.alert_seq + 1, alerts=(snapshot.alerts + (alert,))[-ALERT_HISTORY:]
+            )
+        
+        perf = self.perf_stats
+        perf.cues += 1
+        if perf.enabled:
+            start = time.perf_counter_ns()
+            decky.logger.info(f"Motion cue triggered: {motion_event['level']} intensity ({', '.join(cue_types)})",
+                              extra={"rate_key": "cue"})
+            perf.record("log", time.perf_counter_ns() - start)
+        else:
+            decky.logger.info(f"Motion cue triggered: {motion_event['level']} intensity ({', '.join(cue_types)})",
+                              extra={"rate_key": "cue"})
+        if self.log_pipeline.debug:
+            decky.logger.debug(
+                f"Motion cue detail: gyro {motion_event['gyro']:.1f} (peak {motion_event['gyro_peak']:.1f}) deg/s, "
+                f"accel {motion_event['accel']:.3f} (peak {motion_event['accel_peak']:.3f}) g, "
+                f"sway {motion_event.get('sway', 0.0):.2f} deg/s at {motion_event.get('sway_frequency', 0.0):.2f} Hz",
+                extra={"rate_key": "cue_detail"}
+            )
+        
+        ring = self.motion_ring
+        if ring is not None:
+            ring.write_cue(motion_event, cue_types)
+        
+        # Trigger haptic feedback if enabled
+        if "haptic" in cue_types:
+            self._trigger_haptic_feedback(motion_event['level'])
 
     def _trigger_haptic_feedback(self, level: str):
         """Trigger Steam Deck haptic feedback"""
@@ -461,22 +3818,22 @@ class MotionServicePlugin:
             
             # Trigger haptic feedback via Steam API if available
             # This is a placeholder - actual implementation would use Steam API
-            decky.logger.info(f"Haptic feedback triggered with intensity {intensity}")
+            if self.log_pipeline.debug:
+                decky.logger.debug(f"Haptic feedback triggered with intensity {intensity}")
             
         except Exception as e:
-            decky.logger.error(f"Haptic feedback error: {str(e)}")
+            decky.logger.error(f"Haptic feedback error: {str(e)}", extra={"rate_key": "haptic"})
 
     async def start_motion_monitoring(self) -> Dict[str, Any]:
         """Start monitoring motion data for cues"""
         try:
-            if self.motion_data_running:
+            if self._monitoring_active():
                 return {"status": "success", "message": "Motion monitoring already running"}
             
-            self.motion_data_running = True
-            self.motion_data_thread = threading.Thread(target=self._monitor_motion_data, daemon=True)
-            self.motion_data_thread.start()
+            self._start_monitor()
+            self._ensure_duty_cycle()
             
-            decky.logger.info("Motion monitoring started")
+            decky.logger.info(f"Motion monitoring started ({self.receive_mode} receiver)")
             return {"status": "success", "message": "Motion monitoring started"}
             
         except Exception as e:
@@ -486,9 +3843,9 @@ class MotionServicePlugin:
     async def stop_motion_monitoring(self) -> Dict[str, Any]:
         """Stop monitoring motion data"""
         try:
-            self.motion_data_running = False
-            if self.motion_data_thread and self.motion_data_thread.is_alive():
-                self.motion_data_thread.join(timeout=3)
+            await self._end_duty_cycle()
+            await self._stop_monitor(timeout=3)
+            await self._stop_recording()
             
             decky.logger.info("Motion monitoring stopped")
             return {"status": "success", "message": "Motion monitoring stopped"}
@@ -497,25 +3854,439 @@ class MotionServicePlugin:
             decky.logger.error(f"Stop monitoring error: {str(e)}")
             return {"status": "error", "message": str(e)}
 
+    def _recording_path(self, name: str) -> str:
+        """Path of a recording by file name, confined to the recordings directory"""
+        if not name or os.path.basename(name) != name or not name.endswith(RECORDING_SUFFIX):
+            raise ValueError(f"Invalid recording name: {name}")
+        return os.path.join(decky.DECKY_PLUGIN_RUNTIME_DIR, RECORDING_DIR_NAME, name)
+
+    async def _stop_recording(self) -> Optional[Dict[str, Any]]:
+        """Finish the active recording, if any, without blocking the event loop"""
+        recorder = self.recorder
+        if recorder is None:
+            return None
+        self.recorder = None
+        self._notify_demand()
+        await asyncio.get_running_loop().run_in_executor(None, recorder.stop)
+        summary = recorder.as_dict()
+        self.last_recording = summary
+        decky.logger.info(f"Recording stopped: {summary['file']} ({summary['records']} samples, {summary['dropped']} dropped)")
+        return summary
+
+    def _recording_ended(self, recorder: MotionRecorder):
+        """Detach a recorder whose writer died or that reached a limit; called from the receive thread"""
+        if self.recorder is not recorder:
+            return
+        self.recorder = None
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._end_detached_recording(recorder), self._loop)
+
+    async def _end_detached_recording(self, recorder: MotionRecorder):
+        """Finish a detached recorder off the event loop; one at a limit still writes what is queued"""
+        await asyncio.get_running_loop().run_in_executor(None, recorder.stop)
+        summary = recorder.as_dict()
+        self.last_recording = summary
+        self._notify_demand()
+        if summary['limit']:
+            decky.logger.info(f"Recording stopped at its {summary['limit']} limit: {summary['file']} ({summary['records']} samples)")
+        else:
+            decky.logger.error(f"Recording stopped after write error: {summary['file']} ({summary['error']})")
+
+    async def start_recording(self) -> Dict[str, Any]:
+        """Record incoming motion samples to a session file, starting monitoring if needed"""
+        try:
+            if self.recorder is not None:
+                return {"status": "success", "recording": self.recorder.as_dict()}
+            
+            name = f"motion-{time.strftime('%Y%m%d-%H%M%S')}{RECORDING_SUFFIX}"
+            recorder = MotionRecorder(self._recording_path(name))
+            await asyncio.get_running_loop().run_in_executor(None, recorder.start)
+            self.recorder = recorder
+            
+            if not self._monitoring_active():
+                self._start_monitor()
+                self._ensure_duty_cycle()
+            self._notify_demand()
+            
+            decky.logger.info(f"Recording motion data to {recorder.path}")
+            return {"status": "success", "recording": recorder.as_dict()}
+        except Exception as e:
+            decky.logger.error(f"Start recording error: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+    async def stop_recording(self) -> Dict[str, Any]:
+        """Stop the active recording; monitoring keeps running"""
+        try:
+            summary = await self._stop_recording()
+            if summary is None:
+                return {"status": "error", "message": "Not recording"}
+            return {"status": "success", "recording": summary}
+        except Exception as e:
+            decky.logger.error(f"Stop recording error: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+    async def get_recording_status(self) -> Dict[str, Any]:
+        """Active recording progress, and how the last one ended"""
+        try:
+            return {
+                "status": "success",
+                "recording": self.recorder is not None,
+                "active": self.recorder.as_dict() if self.recorder else None,
+                "last": self.last_recording
+            }
+        except Exception as e:
+            decky.logger.error(f"Get recording status error: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+    async def list_recordings(self) -> Dict[str, Any]:
+        """List recorded sessions, newest first"""
+        try:
+            recordings_dir = os.path.join(decky.DECKY_PLUGIN_RUNTIME_DIR, RECORDING_DIR_NAME)
+            recordings = []
+            if os.path.isdir(recordings_dir):
+                for entry in os.scandir(recordings_dir):
+                    if entry.is_file() and entry.name.endswith(RECORDING_SUFFIX):
+                        stat = entry.stat()
+                        recordings.append({"name": entry.name, "bytes": stat.st_size, "modified": stat.st_mtime})
+            recordings.sort(key=lambda recording: recording["modified"], reverse=True)
+            return {
+                "status": "success",
+                "recordings": recordings,
+                "active": self.recorder.as_dict() if self.recorder else None
+            }
+        except Exception as e:
+            decky.logger.error(f"List recordings error: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+    async def delete_recording(self, name: str) -> Dict[str, Any]:
+        """Delete a recorded session"""
+        try:
+            path = self._recording_path(name)
+            if self.recorder and self.recorder.path == path:
+                return {"status": "error", "message": "Recording is in progress"}
+            os.remove(path)
+            return {"status": "success", "message": f"Deleted {name}"}
+        except Exception as e:
+            decky.logger.error(f"Delete recording error: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+    def _replay_recording(self, path: str, threshold: Dict[str, float], batch: int, speed: float) -> Dict[str, Any]:
+        """Run a recording through the windowed detector, sway analysis and classification
+
+        Uses fresh analyzers so live monitoring is unaffected. Classification runs
+        once per `batch` samples, as it does per receive batch. With speed 0 the
+        replay runs as fast as possible; otherwise it is paced to `speed` x real time.
+        """
+        detector = WindowedMotionDetector(threshold['time_window'])
+        sway = SwayAnalyzer()
+        sqrt = math.sqrt
+        level_counts = dict.fromkeys(MOTION_LEVELS, 0)
+        cue_counts = dict.fromkeys(MOTION_LEVELS[1:], 0)
+        cues = []
+        limiter = CueRateLimiter()
+        pending = None
+        next_dispatch = 0
+        samples = 0
+        first_ts = None
+        started = time.perf_counter()
+        
+        with MotionRecording(path) as recording:
+            for timestamp, frame_id, ax, ay, az, pitch, yaw, roll in recording.iter_records():
+                if first_ts is None:
+                    first_ts = timestamp
+                detector.add(timestamp, sqrt(pitch * pitch + yaw * yaw + roll * roll), sqrt(ax * ax + ay * ay + az * az))
+                sway.add(timestamp, pitch, yaw, roll)
+                samples += 1
+                if samples % batch:
+                    continue
+                
+                if speed:
+                    delay = (timestamp - first_ts) / 1_000_000 / speed - (time.perf_counter() - started)
+                    if delay > 0:
+                        time.sleep(delay)
+                
+                if detector.span_seconds < threshold['time_window'] / 2:
+                    continue
+                motion_event = classify_motion(detector.stats(), sway, threshold)
+                level = motion_event['level']
+                level_counts[level] += 1
+                # Same merging and rate limits as live cue dispatch, in sensor time
+                if level == 'none':
+                    continue
+                if pending is None or MOTION_LEVELS.index(level) >= MOTION_LEVELS.index(pending['level']):
+                    pending = motion_event
+                if timestamp < next_dispatch:
+                    continue
+                motion_event, pending = pending, None
+                next_dispatch = timestamp + CUE_DISPATCH_INTERVAL * 1_000_000
+                admitted = limiter.admit(motion_event['level'], self.cue_types, timestamp / 1_000_000)
+                if admitted:
+                    cue_counts[motion_event['level']] += 1
+                    if len(cues) < 500:
+                        cues.append({"offset_s": round((timestamp - first_ts) / 1_000_000, 3),
+                                     "cue_types": admitted, **motion_event})
+            duration = recording.duration
+        
+        elapsed = time.perf_counter() - started
+        return {
+            "samples": samples,
+            "duration_s": round(duration, 3),
+            "elapsed_s": round(elapsed, 3),
+            "speedup": round(duration / elapsed, 1) if elapsed > 0 else None,
+            "threshold": threshold,
+            "levels": level_counts,
+            "cue_counts": cue_counts,
+            "cues": cues
+        }
+
+    async def replay_recording(self, name: str, sensitivity: Optional[int] = None,
+                               thresholds: Optional[Dict[str, float]] = None,
+                               batch: int = 1, speed: float = 0) -> Dict[str, Any]:
+        """Replay a recording through the analysis pipeline and report the cues it would trigger"""
+        try:
+            level = sensitivity if sensitivity is not None else self.sensitivity_level
+            if level not in self.motion_thresholds:
+                return {"status": "error", "message": "Sensitivity must be 1, 2, or 3"}
+            # Overrides let thresholds be tuned offline without changing the live ones
+            threshold = {**self._thresholds(level), **(thresholds or {})}
+            path = self._recording_path(name)
+            
+            result = await asyncio.get_running_loop().run_in_executor(
+                None, self._replay_recording, path, threshold, max(1, int(batch)), max(0.0, float(speed))
+            )
+            decky.logger.info(f"Replayed {name}: {result['samples']} samples at {result['speedup']}x real time")
+            return {"status": "success", "name": name, "sensitivity": level, **result}
+        except Exception as e:
+            decky.logger.error(f"Replay recording error: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+    async def get_motion_history(self, since_seq: int = 0, max_points: int = HISTORY_CHART_POINTS,
+                                 axes: Optional[list] = None, downsample_axis: str = "gyro") -> Dict[str, Any]:
+        """Get samples recorded after a cursor as parallel arrays, downsampled for charts
+
+        Pass the returned seq as since_seq on the next call to receive only new
+        samples. Ranges longer than max_points (at most HISTORY_MAX_POINTS) are
+        reduced with LTTB on downsample_axis; all arrays share the picked indices.
+        """
+        try:
+            self._touch_poll_lease()
+            axes = list(axes) if axes else ["accel", "gyro"]
+            for axis in axes + [downsample_axis]:
+                if axis not in MotionHistory.AXES:
+                    return {"status": "error", "message": f"Unknown axis {axis}; expected one of {list(MotionHistory.AXES)}"}
+            max_points = min(max(3, int(max_points)), HISTORY_MAX_POINTS)
+            
+            # Copying and downsampling a full history takes up to ~100 ms; keep it off the event loop
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._history_points, since_seq, max_points, axes, downsample_axis
+            )
+        except Exception as e:
+            decky.logger.error(f"Get motion history error: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+    def _history_points(self, since_seq: int, max_points: int, axes: list, downsample_axis: str) -> Dict[str, Any]:
+        """get_motion_history's copy and downsampling (executor thread)"""
+        seq, first_seq, timestamps, columns = self.motion_history.copy_since(since_seq, set(axes) | {downsample_axis})
+        count = len(timestamps)
+        
+        indices = None
+        if count > max_points:
+            origin = timestamps[0]
+            indices = lttb_indices([t - origin for t in timestamps], columns[downsample_axis], max_points)
+            timestamps = [timestamps[i] for i in indices]
+        else:
+            timestamps = timestamps.tolist()
+        
+        result = {
+            "status": "success",
+            "seq": seq,
+            "first_seq": seq - count + 1,
+            "count": count,
+            "points": len(timestamps),
+            "downsampled": indices is not None,
+            # The cursor fell out of the ring buffer, so some samples were missed, or is
+            # ahead of a history that started over; either way the client should start again
+            "reset": since_seq < first_seq - 1 or since_seq > seq,
+            "timestamps": timestamps
+        }
+        for axis in axes:
+            values = columns[axis]
+            if indices is not None:
+                values = [values[i] for i in indices]
+            result[axis] = [round(value, 4) for value in values]
+        return result
+
+    async def get_motion_rollups(self, tier: str = "1m", since: float = 0, limit: Optional[int] = None,
+                                 reset: bool = False) -> Dict[str, Any]:
+        """Get session motion summaries at 1 s, 10 s or 1 min resolution"""
+        try:
+            if tier not in self.motion_rollups.tiers:
+                return {"status": "error", "message": f"Tier must be one of {list(self.motion_rollups.tiers)}"}
+            # The receive path adds to the rollups under the analysis lock; wait for it off the loop
+            result = await asyncio.get_running_loop().run_in_executor(
+                None, self._query_rollups, tier, int(since * 1_000_000), limit, reset
+            )
+            return {"status": "success", **result}
+        except Exception as e:
+            decky.logger.error(f"Get motion rollups error: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+    def _query_rollups(self, tier: str, since_us: int, limit: Optional[int], reset: bool) -> Dict[str, Any]:
+        rollups = self.motion_rollups
+        with self._analysis_lock:
+            result = {
+                "samples": rollups.samples,
+                "level_samples": dict(rollups.level_samples),
+                "clock_resets": rollups.clock_resets,
+                **rollups.query(tier, since_us, limit)
+            }
+            if reset:
+                rollups.reset()
+        return result
+
     async def get_motion_data(self) -> Dict[str, Any]:
         """Get latest motion data and alerts"""
         try:
+            self._touch_poll_lease()
+            snapshot = self.motion_snapshot
             return {
                 "status": "success",
-                "latest_data": self.latest_motion_data,
-                "monitoring": self.motion_data_running,
-                "alerts": self.motion_alerts[-5:],  # Last 5 alerts
-                "history_count": len(self.motion_history)
+                "latest_data": snapshot.latest.to_dict() if snapshot.latest else {},
+                "monitoring": self._monitoring_active(),
+                "idle": self._duty_idle,
+                "alerts": [alert.to_dict() for alert in snapshot.alerts[-5:]],  # Last 5 alerts
+                "history_count": len(self.motion_history),
+                "window": snapshot.window,
+                "sway": snapshot.sway,
+                "orientation": snapshot.orientation if self.orientation_enabled else None
             }
         except Exception as e:
             decky.logger.error(f"Get motion data error: {str(e)}")
             return {"status": "error", "message": str(e)}
 
+    async def subscribe_motion_updates(self, rate_hz: float = 5.0) -> Dict[str, Any]:
+        """Subscribe to pushed motion updates at up to the given rate (Hz)
+
+        Events are broadcast to every frontend, so the publisher runs at the fastest
+        live subscriber's rate; rate_hz is a shared maximum and slower subscribers
+        throttle on their side (see useMotionUpdates).
+        """
+        try:
+            rate = min(max(float(rate_hz), 0.2), 60.0)
+            subscription_id = self._new_subscription()
+            self.motion_subscribers[subscription_id] = rate
+            self._notify_demand()
+            
+            # New subscribers need the full state, not just the changes
+            self._publisher_resync = True
+            if self._publisher_task is None or self._publisher_task.done():
+                self._publisher_task = asyncio.create_task(self._publish_motion_updates())
+            
+            decky.logger.info(f"Motion update subscription {subscription_id} added at {rate} Hz")
+            return {"status": "success", "subscription_id": subscription_id, "rate_hz": rate}
+        except Exception as e:
+            decky.logger.error(f"Subscribe error: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+    async def unsubscribe_motion_updates(self, subscription_id: int) -> Dict[str, Any]:
+        """Remove a motion update subscription"""
+        try:
+            self.motion_subscribers.pop(subscription_id, None)
+            self._subscription_expiry.pop(subscription_id, None)
+            self._notify_demand()
+            decky.logger.info(f"Motion update subscription {subscription_id} removed")
+            return {"status": "success", "subscribers": len(self.motion_subscribers)}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    async def renew_subscription(self, subscription_id: int) -> Dict[str, Any]:
+        """Extend a motion or status subscription's lease; renewed is False once it has lapsed"""
+        try:
+            if subscription_id not in self._subscription_expiry:
+                return {"status": "success", "renewed": False}
+            self._subscription_expiry[subscription_id] = time.monotonic() + SUBSCRIPTION_LEASE_SECONDS
+            return {"status": "success", "renewed": True, "lease_seconds": SUBSCRIPTION_LEASE_SECONDS}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    def _new_subscription(self) -> int:
+        subscription_id = self._next_subscription_id
+        self._next_subscription_id += 1
+        self._subscription_expiry[subscription_id] = time.monotonic() + SUBSCRIPTION_LEASE_SECONDS
+        return subscription_id
+
+    def _expire_subscriptions(self):
+        """Drop subscriptions whose frontend stopped renewing them"""
+        now = time.monotonic()
+        expired = [subscription_id for subscription_id, until in self._subscription_expiry.items() if until <= now]
+        if not expired:
+            return
+        for subscription_id in expired:
+            del self._subscription_expiry[subscription_id]
+            self.status_subscribers.discard(subscription_id)
+            self.motion_subscribers.pop(subscription_id, None)
+        decky.logger.info(f"Expired {len(expired)} unrenewed subscription(s)")
+        self._notify_demand()
+
+    async def _publish_motion_updates(self):
+        """Push decimated motion samples and new alerts to subscribers via decky.emit"""
+        last_sample_seq = -1
+        last_alert_seq = self.motion_snapshot.alert_seq
+        last_state_seq = -1
+        next_health = 0.0
+        try:
+            # The publisher runs at the fastest subscriber's rate and exits with the last one
+            while self.motion_subscribers:
+                self._expire_subscriptions()
+                if not self.motion_subscribers:
+                    break
+                snapshot = self.motion_snapshot
+                sample_seq = snapshot.sample_seq
+                alert_seq = snapshot.alert_seq
+                state_seq = self._state_seq
+                resync = self._publisher_resync
+                
+                if resync or (sample_seq, alert_seq, state_seq) != (last_sample_seq, last_alert_seq, last_state_seq):
+                    self._publisher_resync = False
+                    recent_alerts = [alert.to_dict() for alert in snapshot.alerts]
+                    if resync:
+                        alerts = recent_alerts[-5:]
+                    else:
+                        new_alerts = min(alert_seq - last_alert_seq, len(recent_alerts))
+                        alerts = recent_alerts[-new_alerts:] if new_alerts > 0 else []
+                    
+                    await decky.emit("motion_update", {
+                        "seq": sample_seq,
+                        "latest_data": snapshot.latest.to_dict() if snapshot.latest else {},
+                        "monitoring": self._monitoring_active(),
+                        "alerts": alerts,
+                        "alerts_reset": resync,
+                        "history_count": len(self.motion_history),
+                        "orientation": snapshot.orientation if self.orientation_enabled else None
+                    })
+                    last_sample_seq = sample_seq
+                    last_alert_seq = alert_seq
+                    last_state_seq = state_seq
+                
+                now = time.monotonic()
+                if self._monitoring_active() and now >= next_health:
+                    next_health = now + STREAM_HEALTH_PUSH_INTERVAL
+                    await decky.emit("stream_health", self._stream_health(now))
+                
+                await asyncio.sleep(1.0 / max(self.motion_subscribers.values(), default=1.0))
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            decky.logger.error(f"Motion publisher error: {str(e)}")
+
     async def set_motion_cues_enabled(self, enabled: bool) -> Dict[str, Any]:
         """Enable or disable motion cues"""
         try:
             self.cues_enabled = enabled
+            self._worker_config_seq += 1
+            self._notify_demand()
             decky.logger.info(f"Motion cues {'enabled' if enabled else 'disabled'}")
+            await self._emit_motion_settings()
             return {"status": "success", "enabled": enabled}
         except Exception as e:
             return {"status": "error", "message": str(e)}
@@ -527,12 +4298,74 @@ class MotionServicePlugin:
                 return {"status": "error", "message": "Invalid sensitivity level"}
             
             self.sensitivity_level = level
+            # Existing window contents are kept; a shorter window just drops its oldest samples
+            with self._analysis_lock:
+                self.motion_detector.resize(self.motion_thresholds[level]["time_window"])
+            self._worker_config_seq += 1
             sensitivity_names = {1: "Low", 2: "Medium", 3: "High"}
             decky.logger.info(f"Motion sensitivity set to {sensitivity_names[level]}")
+            await self._emit_motion_settings()
             return {"status": "success", "level": level, "name": sensitivity_names[level]}
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
+    async def start_calibration(self, seconds: float = CALIBRATION_SECONDS) -> Dict[str, Any]:
+        """Learn thresholds from the next `seconds` of motion, starting monitoring if needed
+
+        Hold the Deck as during normal play meanwhile. Sensitivity levels then
+        map to percentiles of that baseline (see CALIBRATION_PERCENTILES).
+        """
+        try:
+            seconds = float(seconds)
+            if not 10 <= seconds <= 600:
+                return {"status": "error", "message": "Calibration must take 10 to 600 seconds"}
+            self._load_calibration()
+            self.calibrator.start(seconds)
+            self._calibration_pushed = -1
+            self._worker_config_seq += 1
+            
+            if not self._monitoring_active():
+                self._start_monitor()
+                self._ensure_duty_cycle()
+            self._notify_demand()
+            
+            decky.logger.info(f"Motion calibration started ({seconds:.0f}s)")
+            await self._emit_motion_settings()
+            return {"status": "success", "calibration": self.calibrator.as_dict()}
+        except Exception as e:
+            decky.logger.error(f"Start calibration error: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+    async def set_auto_calibration(self, enabled: bool) -> Dict[str, Any]:
+        """Use calibrated thresholds instead of the fixed table (once a calibration has finished)"""
+        try:
+            self._load_calibration()
+            self.auto_calibration = enabled
+            self._worker_config_seq += 1
+            await asyncio.get_running_loop().run_in_executor(None, self._save_calibration)
+            decky.logger.info(f"Auto-calibrated thresholds {'enabled' if enabled else 'disabled'}")
+            await self._emit_motion_settings()
+            return {"status": "success", "enabled": enabled, "thresholds": self._thresholds()}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    async def get_calibration(self) -> Dict[str, Any]:
+        """Calibration progress, the learned thresholds and the baseline quantiles behind them"""
+        try:
+            return self._calibration_status()
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    def _calibration_status(self) -> Dict[str, Any]:
+        self._load_calibration()
+        return {
+            "status": "success",
+            "auto_calibration": self.auto_calibration,
+            "percentiles": CALIBRATION_PERCENTILES,
+            "fixed_thresholds": self.motion_thresholds,
+            **self.calibrator.as_dict()
+        }
+
     async def set_cue_types(self, cue_types: list) -> Dict[str, Any]:
         """Set enabled cue types"""
         try:
@@ -541,30 +4374,258 @@ class MotionServicePlugin:
             
             self.cue_types = filtered_types
             decky.logger.info(f"Cue types set to: {filtered_types}")
+            await self._emit_motion_settings()
             return {"status": "success", "cue_types": filtered_types}
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
-    async def get_motion_settings(self) -> Dict[str, Any]:
-        """Get current motion cue settings"""
+    async def set_receive_mode(self, mode: str) -> Dict[str, Any]:
+        """Select the motion data receiver (thread, asyncio, or process for a separate worker process)"""
         try:
-            sensitivity_names = {1: "Low", 2: "Medium", 3: "High"}
+            if mode not in RECEIVE_MODES:
+                return {"status": "error", "message": "Invalid receive mode"}
+            
+            loop = asyncio.get_running_loop()
+            restart = self.motion_data_running and mode != self.receive_mode
+            if restart:
+                await self._stop_monitor()
+            self.receive_mode = mode
+            if mode != "process":
+                await loop.run_in_executor(None, self.worker_launcher.stop)
+            if restart:
+                self._start_monitor()
+            # Saved so the next load can fork the worker launcher early (see _main)
+            await loop.run_in_executor(None, self._save_settings, {"receive_mode": mode})
+            
+            decky.logger.info(f"Receive mode set to {mode}")
+            await self._emit_motion_settings()
+            return {"status": "success", "receive_mode": mode}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    async def set_history_capacity(self, capacity: int) -> Dict[str, Any]:
+        """Set how many samples the motion history ring buffer keeps"""
+        try:
+            capacity = int(capacity)
+            if not HISTORY_MIN_CAPACITY <= capacity <= HISTORY_MAX_CAPACITY:
+                return {
+                    "status": "error",
+                    "message": f"Capacity must be between {HISTORY_MIN_CAPACITY} and {HISTORY_MAX_CAPACITY}"
+                }
+            
+            self.motion_history.resize(capacity)
+            decky.logger.info(f"Motion history capacity set to {capacity} samples")
+            await self._emit_motion_settings()
+            return {"status": "success", "capacity": capacity}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    async def set_batch_drain(self, enabled: bool) -> Dict[str, Any]:
+        """Enable or disable batched draining of pending datagrams"""
+        try:
+            restart = self.motion_data_running and enabled != self.batch_drain
+            if restart:
+                await self._stop_monitor()
+            self.batch_drain = enabled
+            if restart:
+                self._start_monitor()
+            
+            decky.logger.info(f"Batch drain {'enabled' if enabled else 'disabled'}")
+            await self._emit_motion_settings()
+            return {"status": "success", "enabled": enabled}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    async def set_orientation_enabled(self, enabled: bool) -> Dict[str, Any]:
+        """Enable or disable the orientation (gravity/horizon) fusion stage"""
+        try:
+            if enabled and not self.orientation_enabled:
+                # Start again from the accelerometer rather than a stale quaternion
+                with self._analysis_lock:
+                    self.orientation.reset()
+            self.orientation_enabled = enabled
+            self._worker_config_seq += 1
+            decky.logger.info(f"Orientation fusion {'enabled' if enabled else 'disabled'}")
+            await self._emit_motion_settings()
+            return {"status": "success", "enabled": enabled}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    async def set_shared_stream_enabled(self, enabled: bool) -> Dict[str, Any]:
+        """Enable or disable republishing samples and cues to the shared-memory ring"""
+        try:
+            self.shared_stream_enabled = enabled
+            if not enabled:
+                self._close_motion_ring()
+            elif self.motion_ring is None and self.motion_data_running:
+                self._open_motion_ring()
+            await asyncio.get_running_loop().run_in_executor(None, self._save_settings, {"shared_stream": enabled})
+            decky.logger.info(f"Shared motion stream {'enabled' if enabled else 'disabled'}")
+            return {"status": "success", "enabled": enabled}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    async def get_shared_stream_info(self) -> Dict[str, Any]:
+        """Get the shared-memory ring path and layout for local readers"""
+        try:
+            return {
+                "status": "success",
+                "enabled": self.shared_stream_enabled,
+                "ring": self.motion_ring.as_dict() if self.motion_ring else None
+            }
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    async def set_duty_cycling(self, enabled: bool) -> Dict[str, Any]:
+        """Let the receiver go idle while nothing needs motion data (saves battery)"""
+        try:
+            self.duty_cycling = enabled
+            if enabled:
+                self._ensure_duty_cycle()
+            else:
+                await self._cancel_duty_cycle()
+                if self._duty_idle:
+                    self._resume_receiver(["duty cycling disabled"])
+            decky.logger.info(f"Duty cycling {'enabled' if enabled else 'disabled'}")
+            await self._emit_motion_settings()
+            return {"status": "success", "enabled": enabled}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    async def get_duty_cycle_status(self) -> Dict[str, Any]:
+        """Get whether the receiver is idle, who needs data and idle time so far"""
+        try:
+            stats = dict(self.duty_stats)
+            if self._idle_since is not None:
+                stats["idle_seconds"] += time.monotonic() - self._idle_since
+            stats["idle_seconds"] = round(stats["idle_seconds"], 1)
             return {
                 "status": "success",
-                "cues_enabled": self.cues_enabled,
-                "sensitivity_level": self.sensitivity_level,
-                "sensitivity_name": sensitivity_names[self.sensitivity_level],
-                "cue_types": self.cue_types,
-                "thresholds": self.motion_thresholds[self.sensitivity_level]
+                "enabled": self.duty_cycling,
+                "monitoring": self._monitoring_active(),
+                "idle": self._duty_idle,
+                "demand": self._demand(),
+                **stats
             }
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
+    async def get_stream_health(self) -> Dict[str, Any]:
+        """Get packet rate, jitter, loss and latency of the motion stream"""
+        try:
+            self._touch_poll_lease()
+            return self._stream_health(time.monotonic())
+        except Exception as e:
+            decky.logger.error(f"Stream health error: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+    def _stream_health(self, now: float) -> Dict[str, Any]:
+        """Stream health as returned by get_stream_health and pushed by the motion publisher"""
+        return {
+            "status": "success",
+            "monitoring": self._monitoring_active(),
+            "idle": self._duty_idle,
+            "receive_mode": self.receive_mode,
+            "wire_format": self.wire_format,
+            "stream_live": self._stream_live,
+            "registrations": self._register_count,
+            "since_register_s": round(now - self._last_register_time, 3) if self._last_register_time else None,
+            "worker": self.worker_stats if self.receive_mode == "process" else None,
+            **(self._worker_stream_health(now) if self.receive_mode == "process" else self.stream_health.as_dict(now))
+        }
+
+    def _worker_stream_health(self, now: float) -> Dict[str, Any]:
+        """The worker's socket-side health; empty (rates and jitter None) until its first report"""
+        if self._worker_health is None:
+            return StreamHealth().as_dict(now)
+        last_arrival = self._worker_last_arrival
+        return {**self._worker_health,
+                "last_packet_age_s": round(now - last_arrival, 3) if last_arrival is not None else None}
+
+    async def get_perf_stats(self, reset: bool = False) -> Dict[str, Any]:
+        """Get per-stage hot path timings, cue dispatch counters and the rest, optionally resetting them"""
+        try:
+            stats = self.perf_stats.as_dict()
+            stats["cue_dispatch"] = self.cue_dispatcher.as_dict()
+            stats["logging"] = self.log_pipeline.as_dict()
+            if reset:
+                self.perf_stats.reset()
+                self.cue_dispatcher.reset()
+            return {"status": "success", **stats}
+        except Exception as e:
+            decky.logger.error(f"Perf stats error: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+    async def set_perf_stats_enabled(self, enabled: bool) -> Dict[str, Any]:
+        """Enable or disable per-stage hot path timing"""
+        try:
+            self.perf_stats.enabled = bool(enabled)
+            decky.logger.info(f"Perf stats {'enabled' if enabled else 'disabled'}")
+            return {"status": "success", "enabled": self.perf_stats.enabled}
+        except Exception as e:
+            decky.logger.error(f"Perf stats toggle error: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+    async def set_debug_logging(self, enabled: bool) -> Dict[str, Any]:
+        """Switch debug-level log detail (cue values, haptics) on or off at runtime"""
+        try:
+            self.log_pipeline.set_debug(bool(enabled))
+            decky.logger.info(f"Debug logging {'enabled' if enabled else 'disabled'}")
+            await self._emit_motion_settings()
+            return {"status": "success", "enabled": self.log_pipeline.debug, "logging": self.log_pipeline.as_dict()}
+        except Exception as e:
+            decky.logger.error(f"Debug logging toggle error: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+    async def get_receive_stats(self, reset: bool = False) -> Dict[str, Any]:
+        """Get how many datagrams each receive batch coalesced"""
+        try:
+            stats = self.batch_stats.as_dict()
+            if reset:
+                self.batch_stats.reset()
+            return {"status": "success", "batch_drain": self.batch_drain, **stats}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    async def get_motion_settings(self) -> Dict[str, Any]:
+        """Get current motion cue settings"""
+        try:
+            return self._motion_settings()
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    def _motion_settings(self) -> Dict[str, Any]:
+        self._load_calibration()
+        sensitivity_names = {1: "Low", 2: "Medium", 3: "High"}
+        return {
+            "status": "success",
+            "cues_enabled": self.cues_enabled,
+            "sensitivity_level": self.sensitivity_level,
+            "sensitivity_name": sensitivity_names[self.sensitivity_level],
+            "cue_types": self.cue_types,
+            "receive_mode": self.receive_mode,
+            "wire_format": self.wire_format,
+            "batch_drain": self.batch_drain,
+            "history_capacity": self.motion_history.capacity,
+            "orientation_enabled": self.orientation_enabled,
+            "duty_cycling": self.duty_cycling,
+            "debug_logging": self.log_pipeline.debug,
+            "auto_calibration": self.auto_calibration,
+            "thresholds": self._thresholds()
+        }
+
+    async def _emit_motion_settings(self):
+        """Push settings and calibration state to the UI after either changed"""
+        try:
+            await decky.emit("motion_settings", {**self._motion_settings(), "calibration": self._calibration_status()})
+        except Exception as e:
+            decky.logger.error(f"Settings push error: {str(e)}")
+
     async def get_debug_info(self) -> Dict[str, Any]:
         """Get debug information about plugin directories and files"""
         try:
             plugin_dir = Path(decky.DECKY_PLUGIN_DIR)
-            bin_dir = self._get_bin_dir()
+            bin_dir, service_archive = self._resolve_bin()
             
             debug_info = {
                 "status": "success",
@@ -575,7 +4636,9 @@ class MotionServicePlugin:
                 "service_path": self.service_path,
                 "service_path_exists": os.path.exists(self.service_path),
                 "binary_path": self.binary_path,
-                "binary_path_exists": os.path.exists(self.binary_path)
+                "binary_path_exists": os.path.exists(self.binary_path),
+                "service_archive": service_archive.name if service_archive else None,
+                "load_ms": self.load_times
             }
             
             # List plugin directory contents
@@ -608,8 +4671,11 @@ class MotionServicePlugin:
         """Toggle motion cues on/off quickly"""
         try:
             self.cues_enabled = not self.cues_enabled
+            self._worker_config_seq += 1
+            self._notify_demand()
             status = "enabled" if self.cues_enabled else "disabled"
             decky.logger.info(f"Motion cues {status}")
+            await self._emit_motion_settings()
             return {
                 "status": "success", 
                 "enabled": self.cues_enabled,
@@ -621,14 +4687,16 @@ class MotionServicePlugin:
     async def clear_motion_alerts(self) -> Dict[str, Any]:
         """Clear motion alerts history"""
         try:
-            self.motion_alerts.clear()
+            with self._snapshot_lock:
+                self.motion_snapshot = self.motion_snapshot._replace(alerts=())
+            self._publisher_resync = True
             return {"status": "success", "message": "Motion alerts cleared"}
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
     async def log_error(self, error: str) -> None:
         """Log frontend errors"""
-        decky.logger.error(f"FRONTEND: {error}")
+        decky.logger.error(f"FRONTEND: {error}", extra={"rate_key": "frontend"})
 
 # Plugin instance
 Plugin = MotionServicePlugin()
\ No newline at end of file
@@ -0,0 +1,274 @@
+"""
+Shared-memory fan-out of the plugin's decoded motion stream.
+
+The plugin writes every decoded sample and every delivered cue once into a
+ring of fixed-size slots in a memory-mapped file (RING_FILE_NAME, in /dev/shm
+when the system has it, otherwise the plugin runtime directory; the plugin
+reports the path from get_shared_stream_info). Any number of local readers map the same file and poll it
+without syscalls, instead of each registering with sdmotion on its own.
+
+Layout: a 64-byte header followed by `capacity` slots (a power of two).
+
+    header  magic "SDMQ", version, header/slot sizes, flags, capacity,
+            write sequence (records published so far), created (us), writer pid
+    slot    stamp, kind, level, cue types, frameId, timestamp (us), six floats
+
+Record `seq` lives in slot `seq % capacity`. The writer sets the slot stamp to
+2*seq+1, writes the payload, then sets it to 2*seq+2, and publishes the new
+write sequence after each batch. A reader accepts a slot only if the stamp is
+2*seq+2 before and after copying it; anything else means the writer lapped it,
+and the record is counted as lost. Sample floats are accel x/y/z and gyro
+pitch/yaw/roll; cue floats are gyro/accel RMS, gyro/accel peak, sway RMS and
+sway frequency.
+
+This module has no dependencies beyond the standard library, so overlays and
+mods can copy it as is:
+
+    with RingReader("/path/to/motion.ring") as reader:
+        while True:
+            for record in reader.read():
+                handle(record.to_dict())
+            time.sleep(0.01)
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+from typing import Any, Dict, Optional
+
+RING_FILE_NAME = "motion.ring"
+RING_MAGIC = b"SDMQ"
+RING_VERSION = 1
+RING_CAPACITY = 16384  # Slots; about 16 s at 1 kHz
+RING_HEADER = struct.Struct("<4sHHHHIQQI28x")  # magic, version, header/slot sizes, flags, capacity, write seq, created (us), pid
+RING_WRITE_SEQ = struct.Struct("<Q")
+RING_WRITE_SEQ_OFFSET = 16
+RING_FLAGS = struct.Struct("<H")
+RING_FLAGS_OFFSET = 10
+RING_FLAG_LIVE = 1  # Cleared when the writer closes; readers should reopen later
+RING_STAMP = struct.Struct("<Q")
+RING_PAYLOAD = struct.Struct("<BBHIQ6f")  # kind, level, cue types, frameId, timestamp (us), values
+RING_SLOT_SIZE = RING_STAMP.size + RING_PAYLOAD.size
+
+KIND_SAMPLE = 0
+KIND_CUE = 1
+LEVELS = ("none", "mild", "moderate", "severe")
+CUE_TYPE_BITS = {"visual": 1, "haptic": 2, "audio": 4}
+
+
+class RingRecord(namedtuple("RingRecord", "seq kind level cue_types frame_id timestamp values")):
+    __slots__ = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plugin-style dict: a motion sample, or a cue event"""
+        if self.kind == KIND_SAMPLE:
+            ax, ay, az, pitch, yaw, roll = self.values
+            return {
+                "timestamp": self.timestamp,
+                "accel": {"x": ax, "y": ay, "z": az},
+                "gyro": {"pitch": pitch, "yaw": yaw, "roll": roll},
+                "frameId": self.frame_id
+            }
+        gyro, accel, gyro_peak, accel_peak, sway, sway_frequency = self.values
+        return {
+            "timestamp": self.timestamp,
+            "level": LEVELS[self.level] if self.level < len(LEVELS) else "none",
+            "cue_types": [name for name, bit in CUE_TYPE_BITS.items() if self.cue_types & bit],
+            "gyro": gyro,
+            "accel": accel,
+            "gyro_peak": gyro_peak,
+            "accel_peak": accel_peak,
+            "sway": sway,
+            "sway_frequency": sway_frequency
+        }
+
+
+class RingWriter:
+    """Single producer of a motion ring; calls from several threads are serialized"""
+
+    def __init__(self, path: str, capacity: int = RING_CAPACITY):
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError(f"Ring capacity must be a power of two, got {capacity}")
+        self.path = path
+        self.capacity = capacity
+        self.write_seq = 0
+        self._mask = capacity - 1
+        self._map = None
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return RING_HEADER.size + self.capacity * RING_SLOT_SIZE
+
+    def open(self):
+        """Create the ring file, replacing any left by an earlier writer"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.truncate(self.size)
+            f.write(RING_HEADER.pack(
+                RING_MAGIC, RING_VERSION, RING_HEADER.size, RING_SLOT_SIZE, RING_FLAG_LIVE,
+                self.capacity, 0, int(time.time() * 1_000_000), os.getpid()
+            ))
+        # Replace rather than truncate: readers still mapping the old file are not disturbed
+        os.replace(temp_path, self.path)
+        with open(self.path, "r+b") as f:
+            self._map = mmap.mmap(f.fileno(), self.size)
+        self.write_seq = 0
+
+    def close(self):
+        with self._lock:
+            if self._map is None:
+                return
+            RING_FLAGS.pack_into(self._map, RING_FLAGS_OFFSET, 0)
+            self._map.close()
+            self._map = None
+
+    def write_samples(self, samples: list):
+        """Publish decoded sample dicts"""
+        stamp_into = RING_STAMP.pack_into
+        payload_into = RING_PAYLOAD.pack_into
+        with self._lock:
+            ring = self._map
+            if ring is None:
+                return
+            seq = self.write_seq
+            mask = self._mask
+            for motion_data in samples:
+                accel = motion_data.get('accel', {})
+                gyro = motion_data.get('gyro', {})
+                offset = RING_HEADER.size + (seq & mask) * RING_SLOT_SIZE
+                stamp_into(ring, offset, 2 * seq + 1)
+                payload_into(
+                    ring, offset + 8, KIND_SAMPLE, 0, 0, motion_data.get('frameId', 0) & 0xFFFFFFFF,
+                    motion_data.get('timestamp', 0),
+                    accel.get('x', 0.0), accel.get('y', 0.0), accel.get('z', 0.0),
+                    gyro.get('pitch', 0.0), gyro.get('yaw', 0.0), gyro.get('roll', 0.0)
+                )
+                stamp_into(ring, offset, 2 * seq + 2)
+                seq += 1
+            self.write_seq = seq
+            RING_WRITE_SEQ.pack_into(ring, RING_WRITE_SEQ_OFFSET, seq)
+
+    def write_cue(self, motion_event: Dict[str, Any], cue_types: list):
+        """Publish a delivered cue"""
+        level = LEVELS.index(motion_event['level']) if motion_event['level'] in LEVELS else 0
+        bits = 0
+        for cue_type in cue_types:
+            bits |= CUE_TYPE_BITS.get(cue_type, 0)
+        with self._lock:
+            ring = self._map
+            if ring is None:
+                return
+            seq = self.write_seq
+            offset = RING_HEADER.size + (seq & self._mask) * RING_SLOT_SIZE
+            RING_STAMP.pack_into(ring, offset, 2 * seq + 1)
+            RING_PAYLOAD.pack_into(
+                ring, offset + 8, KIND_CUE, level, bits, 0,
+                int(motion_event.get('timestamp', 0) * 1_000_000),
+                motion_event.get('gyro', 0.0), motion_event.get('accel', 0.0),
+                motion_event.get('gyro_peak', 0.0), motion_event.get('accel_peak', 0.0),
+                motion_event.get('sway', 0.0), motion_event.get('sway_frequency', 0.0)
+            )
+            RING_STAMP.pack_into(ring, offset, 2 * seq + 2)
+            self.write_seq = seq + 1
+            RING_WRITE_SEQ.pack_into(ring, RING_WRITE_SEQ_OFFSET, seq + 1)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "open": self._map is not None,
+            "version": RING_VERSION,
+            "capacity": self.capacity,
+            "slot_size": RING_SLOT_SIZE,
+            "write_seq": self.write_seq
+        }
+
+
+class RingReader:
+    """Polls a motion ring; each reader keeps its own position and loss count
+
+    `start` is "latest" to see only new records, or "oldest" to begin with
+    everything still in the ring.
+    """
+
+    def __init__(self, path: str, start: str = "latest"):
+        self.path = path
+        self.lost = 0
+        with open(path, "rb") as f:
+            self._inode = os.fstat(f.fileno()).st_ino
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, header_size, slot_size, _flags, capacity,
+         write_seq, self.created, self.writer_pid) = RING_HEADER.unpack_from(self._map, 0)
+        if magic != RING_MAGIC or version != RING_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {RING_VERSION} motion ring")
+        if header_size != RING_HEADER.size or slot_size != RING_SLOT_SIZE:
+            self.close()
+            raise ValueError(f"{path} has an unexpected layout ({header_size}/{slot_size})")
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self.next_seq = write_seq if start == "latest" else max(0, write_seq - capacity)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self) -> "RingReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def live(self) -> bool:
+        """False once the writer closed the ring"""
+        return bool(RING_FLAGS.unpack_from(self._map, RING_FLAGS_OFFSET)[0] & RING_FLAG_LIVE)
+
+    def replaced(self) -> bool:
+        """A new writer created a ring at the same path (one stat call; check while idle)"""
+        try:
+            return os.stat(self.path).st_ino != self._inode
+        except FileNotFoundError:
+            return False
+
+    @property
+    def write_seq(self) -> int:
+        return RING_WRITE_SEQ.unpack_from(self._map, RING_WRITE_SEQ_OFFSET)[0]
+
+    @property
+    def backlog(self) -> int:
+        """Records published but not read yet"""
+        return self.write_seq - self.next_seq
+
+    def read(self, limit: Optional[int] = None) -> list:
+        """Records published since the last call, oldest first"""
+        ring = self._map
+        head = RING_WRITE_SEQ.unpack_from(ring, RING_WRITE_SEQ_OFFSET)[0]
+        seq = self.next_seq
+        if head - seq > self.capacity:
+            # Lapped by the writer: skip to the oldest record still in the ring
+            self.lost += head - self.capacity - seq
+            seq = head - self.capacity
+        end = head if limit is None else min(head, seq + limit)
+        stamp_from = RING_STAMP.unpack_from
+        payload_from = RING_PAYLOAD.unpack_from
+        mask = self._mask
+        records = []
+        while seq < end:
+            offset = RING_HEADER.size + (seq & mask) * RING_SLOT_SIZE
+            expected = 2 * seq + 2
+            if stamp_from(ring, offset)[0] == expected:
+                payload = payload_from(ring, offset + 8)
+                if stamp_from(ring, offset)[0] == expected:
+                    records.append(RingRecord(seq, *payload[:5], payload[5:]))
+                    seq += 1
+                    continue
+            self.lost += 1
+            seq += 1
+        self.next_seq = seq
+        return records
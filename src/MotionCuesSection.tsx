@@ -6,7 +6,9 @@ import {
   ToggleField,
   DropdownItem
 } from "@decky/ui";
-import { callable } from "@decky/api";
+import { callable, addEventListener, removeEventListener } from "@decky/api";
+import { useMotionUpdates } from "./useMotionUpdates";
+import { useServiceStatus } from "./useServiceStatus";
 
 // Define interfaces
 interface ServiceResult {
@@ -14,18 +16,13 @@ interface ServiceResult {
   message?: string;
 }
 
-interface ServiceStatus {
-  status: string;
-  installed: boolean;
-  running: boolean;
-}
-
 interface MotionSettings {
   status: string;
   cues_enabled: boolean;
   sensitivity_level: number;
   sensitivity_name: string;
   cue_types: string[];
+  auto_calibration: boolean;
   thresholds: {
     gyro: number;
     accel: number;
@@ -33,6 +30,18 @@ interface MotionSettings {
   };
 }
 
+interface CalibrationStatus {
+  status: string;
+  phase: string;
+  progress: number | null;
+  auto_calibration: boolean;
+}
+
+// Pushed by the backend whenever a setting or the calibration state changes
+interface MotionSettingsUpdate extends MotionSettings {
+  calibration: CalibrationStatus;
+}
+
 interface MotionAlert {
   timestamp: number;
   level: string;
@@ -60,21 +69,24 @@ interface CueTypeOption {
 }
 
 // Define callables
-const checkServiceStatus = callable<[], ServiceStatus>("check_service_status");
 const getMotionSettings = callable<[], MotionSettings>("get_motion_settings");
 const setMotionCuesEnabled = callable<[boolean], ServiceResult>("set_motion_cues_enabled");
 const setMotionSensitivity = callable<[number], ServiceResult>("set_motion_sensitivity");
 const setCueTypes = callable<[string[]], ServiceResult>("set_cue_types");
 const getMotionData = callable<[], MotionDataResponse>("get_motion_data");
 const clearMotionAlerts = callable<[], ServiceResult>("clear_motion_alerts");
+const getCalibration = callable<[], CalibrationStatus>("get_calibration");
+const startCalibration = callable<[number], ServiceResult>("start_calibration");
+const setAutoCalibration = callable<[boolean], ServiceResult>("set_auto_calibration");
 const logError = callable<[string], void>("log_error");
 
 const MotionCuesSection = () => {
-  const [serviceStatus, setServiceStatus] = useState<ServiceStatus | null>(null);
+  const [serviceStatus, , statusLoading] = useServiceStatus();
   const [motionSettings, setMotionSettingsState] = useState<MotionSettings | null>(null);
   const [motionData, setMotionData] = useState<MotionDataResponse | null>(null);
   const [result, setResult] = useState<string>('');
   const [loading, setLoading] = useState<boolean>(true);
+  const [calibration, setCalibration] = useState<CalibrationStatus | null>(null);
 
   const sensitivityOptions: SensitivityOption[] = [
     { 
@@ -112,18 +124,18 @@ const MotionCuesSection = () => {
     }
   ];
 
+  // Loaded once; changes, including calibration progress, are pushed by the backend
   useEffect(() => {
+    const listener = addEventListener<[MotionSettingsUpdate]>("motion_settings", ({ calibration, ...settings }) => {
+      setMotionSettingsState(settings);
+      setCalibration(calibration);
+    });
+
     const loadData = async () => {
       try {
-        const [status, settings, data] = await Promise.all([
-          checkServiceStatus(),
-          getMotionSettings(),
-          getMotionData()
-        ]);
-        
-        setServiceStatus(status);
+        const settings = await getMotionSettings();
         setMotionSettingsState(settings);
-        setMotionData(data);
+        setCalibration(await getCalibration());
       } catch (error) {
         await logError(`MotionCuesSection -> loadData: ${String(error)}`);
       } finally {
@@ -132,10 +144,18 @@ const MotionCuesSection = () => {
     };
 
     loadData();
-    const interval = setInterval(loadData, 3000);
-    return () => clearInterval(interval);
+    return () => removeEventListener("motion_settings", listener);
   }, []);
 
+  // Alerts arrive through pushed motion updates instead of polling get_motion_data
+  const motionUpdate = useMotionUpdates(1, !!serviceStatus?.running);
+
+  useEffect(() => {
+    if (motionUpdate) {
+      setMotionData({ status: "success", ...motionUpdate });
+    }
+  }, [motionUpdate]);
+
   const handleCuesToggle = async () => {
     if (!motionSettings) return;
 
@@ -146,10 +166,6 @@ const MotionCuesSection = () => {
       
       if (response.status === "success") {
         setResult(`✅ Motion cues ${!motionSettings.cues_enabled ? 'enabled' : 'disabled'}`);
-        
-        // Update settings
-        const newSettings = await getMotionSettings();
-        setMotionSettingsState(newSettings);
       } else {
         setResult(`❌ Failed: ${response.message}`);
       }
@@ -159,6 +175,36 @@ const MotionCuesSection = () => {
     }
   };
 
+  const handleStartCalibration = async () => {
+    try {
+      const response = await startCalibration(60);
+      if (response.status === "success") {
+        setResult('✅ Calibrating for 60 seconds - hold your Deck as you normally play');
+      } else {
+        setResult(`❌ Failed: ${response.message}`);
+      }
+    } catch (error) {
+      setResult(`❌ Error: ${String(error)}`);
+      await logError(`Start calibration error: ${String(error)}`);
+    }
+  };
+
+  const handleAutoCalibrationToggle = async () => {
+    if (!motionSettings) return;
+
+    try {
+      const response = await setAutoCalibration(!motionSettings.auto_calibration);
+      if (response.status === "success") {
+        setResult(`✅ Personal thresholds ${!motionSettings.auto_calibration ? 'enabled' : 'disabled'}`);
+      } else {
+        setResult(`❌ Failed: ${response.message}`);
+      }
+    } catch (error) {
+      setResult(`❌ Error: ${String(error)}`);
+      await logError(`Auto calibration toggle error: ${String(error)}`);
+    }
+  };
+
   const handleSensitivityChange = async (level: number) => {
     try {
       setResult('Updating sensitivity...');
@@ -167,10 +213,6 @@ const MotionCuesSection = () => {
       
       if (response.status === "success") {
         setResult(`✅ Sensitivity set to ${sensitivityOptions.find(o => o.value === level)?.label}`);
-        
-        // Update settings
-        const newSettings = await getMotionSettings();
-        setMotionSettingsState(newSettings);
       } else {
         setResult(`❌ Failed: ${response.message}`);
       }
@@ -195,10 +237,6 @@ const MotionCuesSection = () => {
       
       if (response.status === "success") {
         setResult(`✅ Cue types updated`);
-        
-        // Update settings
-        const newSettings = await getMotionSettings();
-        setMotionSettingsState(newSettings);
       } else {
         setResult(`❌ Failed: ${response.message}`);
       }
@@ -250,7 +288,7 @@ const MotionCuesSection = () => {
     }
   };
 
-  if (loading) {
+  if (loading || statusLoading) {
     return (
       <PanelSection title="Motion Cues">
         <PanelSectionRow>
@@ -332,6 +370,32 @@ const MotionCuesSection = () => {
             />
           </PanelSectionRow>
 
+          <PanelSectionRow>
+            <ToggleField
+              label="Personal Thresholds"
+              description={calibration?.phase === "uncalibrated" ?
+                "Calibrate first to learn thresholds from your own baseline motion" :
+                "Sensitivity levels become percentiles of your calibrated baseline"
+              }
+              checked={motionSettings.auto_calibration || false}
+              disabled={calibration?.phase === "uncalibrated"}
+              onChange={handleAutoCalibrationToggle}
+            />
+          </PanelSectionRow>
+
+          <PanelSectionRow>
+            <ButtonItem
+              layout="below"
+              onClick={handleStartCalibration}
+              disabled={calibration?.phase === "calibrating"}
+            >
+              {calibration?.phase === "calibrating" ?
+                `Calibrating... ${Math.round((calibration.progress || 0) * 100)}%` :
+                "Calibrate (60s)"
+              }
+            </ButtonItem>
+          </PanelSectionRow>
+
           <PanelSectionRow>
             <div style={{ marginBottom: '8px', fontWeight: 'bold', fontSize: '0.9em' }}>
               Cue Types:
@@ -6,6 +6,8 @@ import {
   ToggleField
 } from "@decky/ui";
 import { callable } from "@decky/api";
+import { useMotionUpdates, Orientation } from "./useMotionUpdates";
+import { useServiceStatus } from "./useServiceStatus";
 
 // Define interfaces
 interface MotionData {
@@ -33,64 +35,28 @@ interface MotionDataResponse {
   monitoring: boolean;
   alerts: any[];
   history_count: number;
+  orientation?: Orientation | null;
   message?: string;
 }
 
-interface ServiceStatus {
-  status: string;
-  installed: boolean;
-  running: boolean;
-}
-
 // Define callables
-const checkServiceStatus = callable<[], ServiceStatus>("check_service_status");
 const getMotionData = callable<[], MotionDataResponse>("get_motion_data");
 const startMotionMonitoring = callable<[], any>("start_motion_monitoring");
-const logError = callable<[string], void>("log_error");
 
 const MotionDataSection = () => {
-  const [serviceStatus, setServiceStatus] = useState<ServiceStatus | null>(null);
+  const [serviceStatus, , loading] = useServiceStatus();
   const [motionData, setMotionData] = useState<MotionDataResponse | null>(null);
   const [showRawData, setShowRawData] = useState<boolean>(false);
   const [autoRefresh, setAutoRefresh] = useState<boolean>(true);
-  const [loading, setLoading] = useState<boolean>(true);
 
-  useEffect(() => {
-    const checkStatus = async () => {
-      try {
-        const status = await checkServiceStatus();
-        setServiceStatus(status);
-      } catch (error) {
-        await logError(`MotionDataSection -> checkStatus: ${String(error)}`);
-      } finally {
-        setLoading(false);
-      }
-    };
-
-    checkStatus();
-    const interval = setInterval(checkStatus, 5000);
-    return () => clearInterval(interval);
-  }, []);
+  // Pushed updates replace polling; the backend emits only when data changed
+  const motionUpdate = useMotionUpdates(5, !!serviceStatus?.running && autoRefresh);
 
   useEffect(() => {
-    const updateMotionData = async () => {
-      try {
-        if (serviceStatus?.running && autoRefresh) {
-          const data = await getMotionData();
-          setMotionData(data);
-        }
-      } catch (error) {
-        await logError(`Motion data update error: ${String(error)}`);
-      }
-    };
-
-    if (serviceStatus?.running && autoRefresh) {
-      const interval = setInterval(updateMotionData, 200); // Update every 200ms for smooth display
-      return () => clearInterval(interval);
+    if (motionUpdate) {
+      setMotionData({ status: "success", ...motionUpdate });
     }
-    
-    return () => {}; // Always return a cleanup function
-  }, [serviceStatus?.running, autoRefresh]);
+  }, [motionUpdate]);
 
   const formatTimestamp = (timestamp: number): string => {
     const date = new Date(timestamp / 1000); // Convert microseconds to milliseconds
@@ -202,6 +168,20 @@ const MotionDataSection = () => {
           </div>
         </div>
 
+        {motionData.orientation?.ready && (
+          <div style={{ marginTop: '12px', fontSize: '0.8em' }}>
+            <div style={{ fontWeight: 'bold', marginBottom: '6px' }}>
+              🧭 Orientation
+            </div>
+            <div>
+              Horizon: {motionData.orientation.horizon.toFixed(1)}° · Tilt: {motionData.orientation.pitch.toFixed(1)}°
+            </div>
+            <div>
+              Turning: {motionData.orientation.vertical_rate.toFixed(1)}°/s · Tilting: {motionData.orientation.tilt_rate.toFixed(1)}°/s
+            </div>
+          </div>
+        )}
+
         <div style={{ 
           marginTop: '12px', 
           paddingTop: '8px', 
@@ -335,7 +315,7 @@ const MotionDataSection = () => {
               </div>
               <div>Total samples: {motionData.history_count}</div>
               <div>Recent alerts: {motionData.alerts.length}</div>
-              <div>Update rate: ~5 Hz (200ms intervals)</div>
+              <div>Update rate: up to 5 Hz (pushed on change)</div>
             </div>
           </PanelSectionRow>
         </>
@@ -4,7 +4,9 @@ import {
   PanelSectionRow,
   ToggleField
 } from "@decky/ui";
-import { callable } from "@decky/api";
+import { callable, addEventListener, removeEventListener } from "@decky/api";
+import { useMotionUpdates } from "./useMotionUpdates";
+import { useServiceStatus } from "./useServiceStatus";
 
 // Define interfaces
 interface ServiceResult {
@@ -13,14 +15,6 @@ interface ServiceResult {
   output?: string;
 }
 
-interface ServiceStatus {
-  status: string;
-  installed: boolean;
-  running: boolean;
-  udp_available?: boolean;
-  message?: string;
-}
-
 interface MotionDataResponse {
   status: string;
   latest_data?: any;
@@ -30,42 +24,95 @@ interface MotionDataResponse {
   message?: string;
 }
 
+interface StreamHealth {
+  status: string;
+  monitoring?: boolean;
+  stream_live?: boolean;
+  sample_rate_hz?: number | null;
+  packet_rate_hz?: number | null;
+  jitter_ms?: number | null;
+  dropped?: number;
+  gap_samples?: number;
+  lag_ms?: { p50: number | null; p99: number | null };
+  since_register_s?: number | null;
+  message?: string;
+}
+
+interface DutyCycleStatus {
+  status: string;
+  enabled: boolean;
+  idle: boolean;
+  demand: string[];
+  idle_seconds: number;
+  message?: string;
+}
+
 // Define callables
-const checkServiceStatus = callable<[], ServiceStatus>("check_service_status");
 const startMotionService = callable<[], ServiceResult>("start_motion_service");
 const stopMotionService = callable<[], ServiceResult>("stop_motion_service");
 const startMotionMonitoring = callable<[], ServiceResult>("start_motion_monitoring");
 const stopMotionMonitoring = callable<[], ServiceResult>("stop_motion_monitoring");
 const getMotionData = callable<[], MotionDataResponse>("get_motion_data");
+const getStreamHealth = callable<[], StreamHealth>("get_stream_health");
+const getDutyCycleStatus = callable<[], DutyCycleStatus>("get_duty_cycle_status");
+const setDutyCycling = callable<[boolean], ServiceResult>("set_duty_cycling");
 const logError = callable<[string], void>("log_error");
 
 const MotionServiceSection = () => {
-  const [serviceStatus, setServiceStatus] = useState<ServiceStatus | null>(null);
+  const [serviceStatus, , loading] = useServiceStatus();
   const [motionData, setMotionData] = useState<MotionDataResponse | null>(null);
   const [result, setResult] = useState<string>('');
-  const [loading, setLoading] = useState<boolean>(true);
+  const [streamHealth, setStreamHealth] = useState<StreamHealth | null>(null);
+  const [dutyCycle, setDutyCycle] = useState<DutyCycleStatus | null>(null);
+
+  // Monitoring state and sample counts are pushed by the backend
+  const motionUpdate = useMotionUpdates(1, !!serviceStatus?.running);
 
   useEffect(() => {
-    const checkStatus = async () => {
-      try {
-        const status = await checkServiceStatus();
-        setServiceStatus(status);
-        
-        if (status.running) {
-          const data = await getMotionData();
-          setMotionData(data);
-        }
-      } catch (error) {
-        await logError(`MotionServiceSection -> checkStatus: ${String(error)}`);
-      } finally {
-        setLoading(false);
+    if (motionUpdate) {
+      setMotionData({ status: "success", ...motionUpdate });
+    }
+  }, [motionUpdate]);
+
+  // Stream health is only meaningful while the receiver is running; the backend pushes
+  // it every 2s alongside motion updates
+  useEffect(() => {
+    if (!motionData?.monitoring) {
+      setStreamHealth(null);
+      return () => {};
+    }
+
+    const listener = addEventListener<[StreamHealth]>("stream_health", (health) => {
+      if (health.monitoring) {
+        setStreamHealth(health);
       }
-    };
+    });
+
+    getStreamHealth()
+      .then((health) => health.status === "success" && setStreamHealth(health))
+      .catch((error) => logError(`Stream health error: ${String(error)}`));
 
-    checkStatus();
-    const interval = setInterval(checkStatus, 2000);
-    return () => clearInterval(interval);
-  }, []);
+    return () => removeEventListener("stream_health", listener);
+  }, [motionData?.monitoring]);
+
+  useEffect(() => {
+    getDutyCycleStatus()
+      .then((status) => status.status === "success" && setDutyCycle(status))
+      .catch((error) => logError(`Duty cycle status error: ${String(error)}`));
+  }, [motionData?.monitoring]);
+
+  const handleDutyCycleToggle = async (enabled: boolean) => {
+    try {
+      const response = await setDutyCycling(enabled);
+      if (response.status === "success") {
+        setDutyCycle(await getDutyCycleStatus());
+      } else {
+        setResult(`❌ Failed: ${response.message}`);
+      }
+    } catch (error) {
+      await logError(`Duty cycle toggle error: ${String(error)}`);
+    }
+  };
 
   const handleServiceToggle = async () => {
     if (!serviceStatus) return;
@@ -79,12 +126,7 @@ const MotionServiceSection = () => {
       
       if (response.status === "success") {
         setResult(`✅ Service ${serviceStatus.running ? 'stopped' : 'started'} successfully`);
-        
-        // Update status after a brief delay
-        setTimeout(async () => {
-          const newStatus = await checkServiceStatus();
-          setServiceStatus(newStatus);
-        }, 1000);
+        // The new status is pushed by the backend once the change is observed
       } else {
         setResult(`❌ Failed: ${response.message}`);
       }
@@ -168,6 +210,15 @@ const MotionServiceSection = () => {
             />
           </PanelSectionRow>
 
+          <PanelSectionRow>
+            <ToggleField
+              label="Battery Saver"
+              description="Pause the motion stream while cues are off and nothing is reading it"
+              checked={dutyCycle?.enabled || false}
+              onChange={handleDutyCycleToggle}
+            />
+          </PanelSectionRow>
+
           {motionData?.monitoring && (
             <PanelSectionRow>
               <div style={{
@@ -213,6 +264,21 @@ const MotionServiceSection = () => {
                   "✅ Responding" : "⚠️ Not responding"
                 }
               </div>
+              {streamHealth && (
+                <div style={{ fontSize: '0.8em', opacity: 0.8, marginTop: '4px' }}>
+                  <div>
+                    Rate: {streamHealth.sample_rate_hz ?? '-'} Hz
+                    {streamHealth.jitter_ms != null && ` · Jitter: ${streamHealth.jitter_ms} ms`}
+                  </div>
+                  <div>
+                    Dropped: {(streamHealth.dropped ?? 0) + (streamHealth.gap_samples ?? 0)}
+                    {streamHealth.lag_ms?.p50 != null && ` · Latency: ${streamHealth.lag_ms.p50} ms`}
+                  </div>
+                  {!streamHealth.stream_live && streamHealth.since_register_s != null && (
+                    <div>Waiting for data, registered {streamHealth.since_register_s.toFixed(1)}s ago</div>
+                  )}
+                </div>
+              )}
               {!serviceStatus.udp_available && (
                 <div style={{ fontSize: '0.8em', opacity: 0.8, marginTop: '4px' }}>
                   Service may still be starting up
@@ -1,4 +1,4 @@
-import { useState, useEffect } from "react";
+import { useState } from "react";
 import {
   PanelSection,
   PanelSectionRow,
@@ -6,11 +6,12 @@ import {
   ConfirmModal,
   showModal
 } from "@decky/ui";
-import { definePlugin, callable } from "@decky/api";
+import { definePlugin, callable, addEventListener, removeEventListener } from "@decky/api";
 import { GiSoundWaves } from "react-icons/gi";
 import MotionServiceSection from "./MotionServiceSection";
 import MotionCuesSection from "./MotionCuesSection";
 import MotionDataSection from "./MotionDataSection";
+import { useServiceStatus, ServiceStatus } from "./useServiceStatus";
 
 interface ServiceResult {
   status: string;
@@ -19,12 +20,10 @@ interface ServiceResult {
   enabled?: boolean;
 }
 
-interface ServiceStatus {
-  status: string;
-  installed: boolean;
-  running: boolean;
-  udp_available?: boolean;
-  message?: string;
+// Emitted by the backend while install_motion_service runs
+interface InstallProgress {
+  stage: string;
+  message: string;
 }
 
 // Define callables
@@ -38,32 +37,14 @@ const getDebugInfo = callable<[], any>("get_debug_info");
 const logError = callable<[string], void>("log_error");
 
 function MotionServiceMainSection() {
-  const [serviceStatus, setServiceStatus] = useState<ServiceStatus | null>(null);
-  const [loading, setLoading] = useState<boolean>(true);
+  const [serviceStatus, setServiceStatus, loading] = useServiceStatus();
   const [result, setResult] = useState<string>('');
   const [installing, setInstalling] = useState<boolean>(false);
   const [showDebugInfo, setShowDebugInfo] = useState<boolean>(false);
   const [debugInfo, setDebugInfo] = useState<any>(null);
 
-  // Check service status periodically
-  useEffect(() => {
-    const checkStatus = async () => {
-      try {
-        const status = await checkServiceStatus();
-        setServiceStatus(status);
-      } catch (error) {
-        await logError(`Status check error: ${String(error)}`);
-      } finally {
-        setLoading(false);
-      }
-    };
-
-    checkStatus();
-    const interval = setInterval(checkStatus, 3000);
-    return () => clearInterval(interval);
-  }, []);
-
   const handleInstall = async () => {
+    let progressListener: ((progress: InstallProgress) => void) | null = null;
     try {
       setInstalling(true);
       setResult('🔄 Installing Motion Service dependencies...');
@@ -72,10 +53,17 @@ function MotionServiceMainSection() {
       const debug = await getDebugInfo();
       setDebugInfo(debug);
       
+      // Show install steps and script output as they happen
+      progressListener = addEventListener<[InstallProgress]>("install_progress", (progress) => {
+        if (progress.stage !== "done" && progress.stage !== "error" && progress.message) {
+          setResult(`🔄 ${progress.message}`);
+        }
+      });
+      
       const response = await installMotionService();
       
       if (response.status === "success") {
-        setResult('✅ Motion Service dependencies installed successfully!');
+        setResult(`✅ ${response.message ?? 'Motion Service dependencies installed successfully!'}`);
         // Refresh status
         const newStatus = await checkServiceStatus();
         setServiceStatus(newStatus);
@@ -88,6 +76,9 @@ function MotionServiceMainSection() {
       setShowDebugInfo(true);
       await logError(`Install error: ${String(error)}`);
     } finally {
+      if (progressListener) {
+        removeEventListener("install_progress", progressListener);
+      }
       setInstalling(false);
     }
   };
@@ -158,7 +149,7 @@ function MotionServiceMainSection() {
       }
       
       if (serviceStatus.running) {
-        if (serviceStatus.udp_available) {
+        if (serviceStatus.ready) {
           return "🟢 Motion Service Active & Ready";
         } else {
           return "🟡 Motion Service Running (Starting up...)";
@@ -0,0 +1,150 @@
+import { useState, useEffect } from "react";
+import { callable, addEventListener, removeEventListener } from "@decky/api";
+
+// Fused orientation from the backend; gravity is the "up" direction in sensor axes
+export interface Orientation {
+  ready: boolean;
+  quaternion: number[];
+  gravity: number[];
+  horizon: number;
+  roll: number;
+  pitch: number;
+  yaw: number;
+  vertical_rate: number;
+  tilt_rate: number;
+}
+
+// Pushed by the backend publisher; alerts only carry new entries unless alerts_reset is set
+export interface MotionUpdate {
+  seq: number;
+  latest_data?: any;
+  monitoring: boolean;
+  alerts: any[];
+  alerts_reset: boolean;
+  history_count: number;
+  orientation?: Orientation | null;
+}
+
+export interface MotionUpdateState {
+  latest_data?: any;
+  monitoring: boolean;
+  alerts: any[];
+  history_count: number;
+  orientation?: Orientation | null;
+}
+
+interface SubscriptionResult {
+  status: string;
+  subscription_id?: number;
+  message?: string;
+}
+
+interface RenewResult {
+  status: string;
+  renewed?: boolean;
+}
+
+// Define callables
+const subscribeMotionUpdates = callable<[number], SubscriptionResult>("subscribe_motion_updates");
+const unsubscribeMotionUpdates = callable<[number], any>("unsubscribe_motion_updates");
+const renewSubscription = callable<[number], RenewResult>("renew_subscription");
+const logError = callable<[string], void>("log_error");
+
+const MAX_ALERTS = 5;
+// The backend drops subscriptions not renewed within 30s
+const RENEW_INTERVAL_MS = 10000;
+
+/**
+ * Subscribe to backend motion updates at the given rate while enabled.
+ * Replaces interval polling of get_motion_data: the backend only emits when something changed.
+ * Updates are broadcast at the fastest subscriber's rate, so this hook renders at most rateHz
+ * times a second, keeping every alert that arrived in between.
+ */
+export function useMotionUpdates(rateHz: number, enabled: boolean = true): MotionUpdateState | null {
+  const [state, setState] = useState<MotionUpdateState | null>(null);
+
+  useEffect(() => {
+    if (!enabled) {
+      return () => {};
+    }
+
+    let cancelled = false;
+    let subscriptionId: number | null = null;
+    let current: MotionUpdateState | null = null;
+    let lastRender = 0;
+    let renderTimer: ReturnType<typeof setTimeout> | null = null;
+    const minInterval = 1000 / rateHz;
+
+    const render = () => {
+      renderTimer = null;
+      lastRender = Date.now();
+      setState(current);
+    };
+
+    const listener = addEventListener<[MotionUpdate]>("motion_update", (update) => {
+      current = {
+        latest_data: update.latest_data,
+        monitoring: update.monitoring,
+        history_count: update.history_count,
+        orientation: update.orientation,
+        alerts: update.alerts_reset
+          ? update.alerts
+          : [...(current?.alerts ?? []), ...update.alerts].slice(-MAX_ALERTS)
+      };
+      if (renderTimer === null) {
+        const wait = lastRender + minInterval - Date.now();
+        if (wait <= 0) {
+          render();
+        } else {
+          renderTimer = setTimeout(render, wait);
+        }
+      }
+    });
+
+    const subscribe = () => {
+      subscribeMotionUpdates(rateHz)
+        .then((response) => {
+          if (response.subscription_id === undefined) {
+            return;
+          }
+          if (cancelled) {
+            unsubscribeMotionUpdates(response.subscription_id);
+          } else {
+            subscriptionId = response.subscription_id;
+          }
+        })
+        .catch((error) => logError(`Motion update subscription error: ${String(error)}`));
+    };
+
+    // Keep the lease alive; subscribe again if it lapsed (e.g. the backend restarted)
+    const renewal = setInterval(() => {
+      if (subscriptionId === null) {
+        return;
+      }
+      renewSubscription(subscriptionId)
+        .then((response) => {
+          if (response.renewed === false && !cancelled) {
+            subscriptionId = null;
+            subscribe();
+          }
+        })
+        .catch((error) => logError(`Motion update renewal error: ${String(error)}`));
+    }, RENEW_INTERVAL_MS);
+
+    subscribe();
+
+    return () => {
+      cancelled = true;
+      clearInterval(renewal);
+      if (renderTimer !== null) {
+        clearTimeout(renderTimer);
+      }
+      removeEventListener("motion_update", listener);
+      if (subscriptionId !== null) {
+        unsubscribeMotionUpdates(subscriptionId);
+      }
+    };
+  }, [rateHz, enabled]);
+
+  return state;
+}
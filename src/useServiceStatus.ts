@@ -0,0 +1,85 @@
+import { useState, useEffect } from "react";
+import { callable, addEventListener, removeEventListener } from "@decky/api";
+
+export interface ServiceStatus {
+  status: string;
+  installed: boolean;
+  running: boolean;
+  ready?: boolean;
+  udp_available?: boolean;
+  message?: string;
+}
+
+interface StatusSubscription extends ServiceStatus {
+  subscription_id?: number;
+}
+
+// Define callables
+const subscribeServiceStatus = callable<[], StatusSubscription>("subscribe_service_status");
+const unsubscribeServiceStatus = callable<[number], any>("unsubscribe_service_status");
+const renewSubscription = callable<[number], { status: string; renewed?: boolean }>("renew_subscription");
+const logError = callable<[string], void>("log_error");
+
+// The backend drops subscriptions not renewed within 30s
+const RENEW_INTERVAL_MS = 10000;
+
+/**
+ * Current service status, pushed by the backend whenever it changes.
+ * Replaces interval polling of check_service_status.
+ */
+export function useServiceStatus(): [ServiceStatus | null, (status: ServiceStatus) => void, boolean] {
+  const [serviceStatus, setServiceStatus] = useState<ServiceStatus | null>(null);
+  const [loading, setLoading] = useState<boolean>(true);
+
+  useEffect(() => {
+    let cancelled = false;
+    let subscriptionId: number | null = null;
+
+    const listener = addEventListener<[ServiceStatus]>("service_status", (status) => {
+      setServiceStatus(status);
+    });
+
+    const subscribe = () =>
+      subscribeServiceStatus()
+        .then(({ subscription_id, ...status }) => {
+          if (subscription_id === undefined) {
+            return;
+          }
+          if (cancelled) {
+            unsubscribeServiceStatus(subscription_id);
+            return;
+          }
+          subscriptionId = subscription_id;
+          setServiceStatus(status);
+        })
+        .catch((error) => logError(`Service status subscription error: ${String(error)}`));
+
+    // Keep the lease alive; subscribe again if it lapsed (e.g. the backend restarted)
+    const renewal = setInterval(() => {
+      if (subscriptionId === null) {
+        return;
+      }
+      renewSubscription(subscriptionId)
+        .then((response) => {
+          if (response.renewed === false && !cancelled) {
+            subscriptionId = null;
+            subscribe();
+          }
+        })
+        .catch((error) => logError(`Service status renewal error: ${String(error)}`));
+    }, RENEW_INTERVAL_MS);
+
+    subscribe().finally(() => setLoading(false));
+
+    return () => {
+      cancelled = true;
+      clearInterval(renewal);
+      removeEventListener("service_status", listener);
+      if (subscriptionId !== null) {
+        unsubscribeServiceStatus(subscriptionId);
+      }
+    };
+  }, []);
+
+  return [serviceStatus, setServiceStatus, loading];
+}